@@ -2,6 +2,9 @@ import sys
 import os
 import time
 import re
+import queue
+import threading
+from collections import Counter
 from datetime import datetime, timedelta
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -12,24 +15,183 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.common.action_chains import ActionChains
 import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import urljoin, urlsplit
 from bs4 import BeautifulSoup
 
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
 # Add the backend directory to the path so we can import our models
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
-from app import app
-from models.job import Job
-from db import db
+from archive import archive_stale_jobs
+from classification import classify_job, parse_posting_date
+from crawl_state import CrawlState, card_fingerprint, content_hash
+from db import create_db_app, db
+from ingest import natural_key, write_job_batch
+from models.table_version import bump_table_version
+from models.tag import parse_tags
 
 class ActuaryListScraper:
-    def __init__(self, headless=True, max_jobs=50):
+    # CSS selector cascades, tried in order; shared by the WebDriver and snapshot extractors
+    TITLE_SELECTORS = [
+        'h1', 'h2', 'h3', 'h4',
+        '.job-title', '.title', '[class*="title"]',
+        '.job-name', '.position-title'
+    ]
+    COMPANY_SELECTORS = [
+        '.company', '.employer', '[class*="company"]',
+        '.organization', '.firm'
+    ]
+    LOCATION_SELECTORS = [
+        '.location', '.city', '[class*="location"]',
+        '.address', '.place'
+    ]
+    DATE_SELECTORS = [
+        '.date', '.posted', '[class*="date"]',
+        '.time', '.timestamp'
+    ]
+    TAG_SELECTORS = [
+        '.tag', '.keyword', '.category', '[class*="tag"]',
+        '.skill', '.technology'
+    ]
+    DESCRIPTION_SELECTORS = [
+        '.description', '.summary', '[class*="desc"]',
+        '.details', '.content'
+    ]
+    JOB_SELECTORS = [
+        '.job-listing', '.job-card', '.job-item',
+        '[class*="job"]', '.listing', '.card',
+        '.post', '.position', '.opportunity'
+    ]
+    # Links to further listing pages
+    PAGINATION_SELECTORS = [
+        'a[rel="next"]', '.pagination a[href]', '.pager a[href]',
+        'nav[aria-label*="agination"] a[href]', 'a.page-link[href]'
+    ]
+    PAGE_NUMBER_PATTERN = re.compile(r'([?&](?:page|p)=|/page/)(\d+)')
+    # URL patterns Chrome is told not to fetch when crawling
+    BLOCKED_RESOURCES = [
+        '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+        '*.woff', '*.woff2', '*.ttf', '*.otf', '*.css'
+    ]
+    USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    # Keywords that make a short text look like a job title
+    TITLE_KEYWORDS = ['actuary', 'analyst', 'manager', 'director', 'consultant', 'specialist']
+
+    def __init__(self, headless=True, max_jobs=50, extraction='snapshot',
+                 base_url="https://www.actuarylist.com", workers=4, max_pages=50,
+                 http_first=True, state_path=None, incremental=True):
         self.headless = headless
+        # None crawls every listing page (up to max_pages)
         self.max_jobs = max_jobs
+        self.base_url = base_url
+        # Browser instances crawling listing pages concurrently
+        self.workers = workers
+        self.max_pages = max_pages
+        # 'snapshot' parses page_source once with BeautifulSoup; 'webdriver' queries each element live
+        self.extraction = extraction
         self.driver = None
         self.jobs_scraped = 0
+        # Fetch pages with plain HTTP and only render them in Chrome when that finds no jobs
+        self.http_first = http_first
+        self.session = self.create_session()
+        # Pages fetched per path this run: http, http_not_modified, browser, failed
+        self.fetch_stats = Counter()
+        self.stats_lock = threading.Lock()
+        # Cards and postings written by earlier runs; None disables crawl state
+        self.crawl_state = CrawlState(state_path) if state_path else None
+        # Skip known cards and stop paging at known postings; False recrawls everything
+        self.incremental = incremental
+        # natural_key -> (fingerprint, natural_key, content_hash) to record once saved
+        self.pending_state = {}
+        # Cards seen this run: changed, unchanged_cards (skipped before extraction), unchanged_postings
+        self.card_stats = Counter()
+        # Database-only app, built on the first save so crawling never needs a database
+        self.app = None
+        # Save counts of the current run: created, updated, unchanged
+        self.save_counts = Counter()
+        # Why saving stopped early, if it did
+        self.save_error = None
+        # Called with the scraper after every crawled page and committed batch
+        self.on_progress = None
         
-    def setup_driver(self):
-        """Setup Chrome driver with appropriate options"""
+    def create_session(self):
+        """Create a keep-alive HTTP session with a connection pool sized for the workers"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(self.workers, 1), max_retries=2)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({
+            'User-Agent': self.USER_AGENT,
+            'Accept': 'text/html,application/xhtml+xml',
+            'Accept-Encoding': 'gzip, deflate',
+        })
+        return session
+    
+    def record_fetch(self, path):
+        with self.stats_lock:
+            self.fetch_stats[path] += 1
+    
+    def fetch_http(self, url):
+        """
+        GET a page through the pooled session. Pages fetched by an earlier run
+        are revalidated with If-None-Match/If-Modified-Since from the crawl
+        state, and a 304 reuses the HTML saved there. Returns (html, path), or
+        (None, None) if the request fails.
+        """
+        headers = {}
+        validators = None
+        if self.crawl_state is not None and self.incremental:
+            validators = self.crawl_state.page_validators(url)
+        etag, last_modified, cached_html = validators or (None, None, None)
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        try:
+            response = self.session.get(url, headers=headers, timeout=15)
+        except requests.RequestException as e:
+            print(f"HTTP fetch failed for {url}: {e}")
+            return None, None
+        
+        if response.status_code == 304 and cached_html is not None:
+            return cached_html, 'http_not_modified'
+        if response.status_code != 200 or 'html' not in response.headers.get('Content-Type', 'text/html'):
+            return None, None
+        if self.crawl_state is not None:
+            self.crawl_state.remember_page(
+                url, response.headers.get('ETag'), response.headers.get('Last-Modified'), response.text
+            )
+        return response.text, 'http'
+    
+    def fetch_listing_page(self, url, get_driver):
+        """
+        Fetch and parse one listing page, returning parse_page()'s result. Tries plain
+        HTTP first; if the HTML has no job cards (they are rendered by JavaScript),
+        loads the page in the browser returned by get_driver().
+        """
+        if self.http_first:
+            html, path = self.fetch_http(url)
+            if html is not None:
+                cards, pages, known = self.parse_page(html, url)
+                if cards or known:
+                    self.record_fetch(path)
+                    return cards, pages, known
+        
+        driver = get_driver()
+        if driver is None:
+            raise RuntimeError("no browser available to render the page")
+        result = self.parse_page(self.load_page(driver, url), url)
+        self.record_fetch('browser')
+        return result
+    
+    def create_driver(self, block_resources=False):
+        """Start a Chrome driver with appropriate options; returns None if it fails"""
         options = Options()
         
         if self.headless:
@@ -44,76 +206,44 @@ class ActuaryListScraper:
         options.add_argument("--window-size=1920,1080")
         
         # Set user agent
-        options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+        options.add_argument(f"--user-agent={self.USER_AGENT}")
+        
+        if block_resources:
+            # Only the DOM is needed, so skip downloading images, fonts and stylesheets
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
         
         try:
-            self.driver = webdriver.Chrome(options=options)
+            driver = webdriver.Chrome(options=options)
             # Execute script to remove webdriver property
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            return True
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            if block_resources:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.BLOCKED_RESOURCES})
+            return driver
         except Exception as e:
             print(f"Error setting up driver: {e}")
-            return False
+            return None
+    
+    def setup_driver(self):
+        """Setup Chrome driver with appropriate options"""
+        self.driver = self.create_driver()
+        return self.driver is not None
     
     def parse_date(self, date_text):
-        """Parse relative date text to datetime object"""
-        if not date_text:
-            return datetime.utcnow()
-        
-        date_text = date_text.lower().strip()
-        
-        # Handle "posted X days ago"
-        days_match = re.search(r'(\d+)\s*days?\s*ago', date_text)
-        if days_match:
-            days = int(days_match.group(1))
-            return datetime.utcnow() - timedelta(days=days)
-        
-        # Handle "posted X hours ago"
-        hours_match = re.search(r'(\d+)\s*hours?\s*ago', date_text)
-        if hours_match:
-            hours = int(hours_match.group(1))
-            return datetime.utcnow() - timedelta(hours=hours)
-        
-        # Handle "posted X weeks ago"
-        weeks_match = re.search(r'(\d+)\s*weeks?\s*ago', date_text)
-        if weeks_match:
-            weeks = int(weeks_match.group(1))
-            return datetime.utcnow() - timedelta(weeks=weeks)
-        
-        # Handle "posted X months ago"
-        months_match = re.search(r'(\d+)\s*months?\s*ago', date_text)
-        if months_match:
-            months = int(months_match.group(1))
-            return datetime.utcnow() - timedelta(days=months*30)
-        
-        # If we can't parse it, return current time
-        return datetime.utcnow()
+        """Parse relative or absolute date text to datetime object, defaulting to now"""
+        return parse_posting_date(date_text) or datetime.utcnow()
     
     def infer_job_type(self, title, description, tags):
         """Infer job type from title, description, and tags"""
-        text_to_check = f"{title} {description} {tags}".lower()
-        
-        if any(word in text_to_check for word in ['intern', 'internship']):
-            return 'Intern'
-        elif any(word in text_to_check for word in ['part-time', 'part time', 'contract']):
-            return 'Part-Time'
-        elif any(word in text_to_check for word in ['freelance', 'consultant']):
-            return 'Contract'
-        else:
-            return 'Full-Time'
+        return classify_job(title, description, [tags]).job_type
     
     def extract_job_data_from_element(self, job_element):
         """Extract job data from a job listing element"""
         try:
             # Try multiple selectors for job title
-            title_selectors = [
-                'h1', 'h2', 'h3', 'h4',
-                '.job-title', '.title', '[class*="title"]',
-                '.job-name', '.position-title'
-            ]
-            
             title = None
-            for selector in title_selectors:
+            for selector in self.TITLE_SELECTORS:
                 try:
                     title_element = job_element.find_element(By.CSS_SELECTOR, selector)
                     title = title_element.text.strip()
@@ -129,18 +259,13 @@ class ActuaryListScraper:
                     text = element.text.strip()
                     if text and len(text) > 5 and len(text) < 100:
                         # Check if it looks like a job title
-                        if any(word in text.lower() for word in ['actuary', 'analyst', 'manager', 'director', 'consultant', 'specialist']):
+                        if any(word in text.lower() for word in self.TITLE_KEYWORDS):
                             title = text
                             break
             
             # Try multiple selectors for company name
-            company_selectors = [
-                '.company', '.employer', '[class*="company"]',
-                '.organization', '.firm'
-            ]
-            
             company = None
-            for selector in company_selectors:
+            for selector in self.COMPANY_SELECTORS:
                 try:
                     company_element = job_element.find_element(By.CSS_SELECTOR, selector)
                     company = company_element.text.strip()
@@ -150,13 +275,8 @@ class ActuaryListScraper:
                     continue
             
             # Try multiple selectors for location
-            location_selectors = [
-                '.location', '.city', '[class*="location"]',
-                '.address', '.place'
-            ]
-            
             location = None
-            for selector in location_selectors:
+            for selector in self.LOCATION_SELECTORS:
                 try:
                     location_element = job_element.find_element(By.CSS_SELECTOR, selector)
                     location = location_element.text.strip()
@@ -166,13 +286,8 @@ class ActuaryListScraper:
                     continue
             
             # Try multiple selectors for posting date
-            date_selectors = [
-                '.date', '.posted', '[class*="date"]',
-                '.time', '.timestamp'
-            ]
-            
             posting_date = datetime.utcnow()
-            for selector in date_selectors:
+            for selector in self.DATE_SELECTORS:
                 try:
                     date_element = job_element.find_element(By.CSS_SELECTOR, selector)
                     posting_date = self.parse_date(date_element.text)
@@ -190,12 +305,7 @@ class ActuaryListScraper:
             
             # Extract tags/keywords
             tags = []
-            tag_selectors = [
-                '.tag', '.keyword', '.category', '[class*="tag"]',
-                '.skill', '.technology'
-            ]
-            
-            for selector in tag_selectors:
+            for selector in self.TAG_SELECTORS:
                 try:
                     tag_elements = job_element.find_elements(By.CSS_SELECTOR, selector)
                     for tag_element in tag_elements:
@@ -207,12 +317,7 @@ class ActuaryListScraper:
             
             # Extract description
             description = ""
-            desc_selectors = [
-                '.description', '.summary', '[class*="desc"]',
-                '.details', '.content'
-            ]
-            
-            for selector in desc_selectors:
+            for selector in self.DESCRIPTION_SELECTORS:
                 try:
                     desc_element = job_element.find_element(By.CSS_SELECTOR, selector)
                     description = desc_element.text.strip()
@@ -221,47 +326,393 @@ class ActuaryListScraper:
                 except NoSuchElementException:
                     continue
             
-            # If we still don't have a description, try to get it from the job card
-            if not description:
-                # Get all text from the job element and use it as description
-                all_text = job_element.text.strip()
-                # Remove title, company, location from the text
-                if title:
-                    all_text = all_text.replace(title, '')
-                if company:
-                    all_text = all_text.replace(company, '')
-                if location:
-                    all_text = all_text.replace(location, '')
-                description = all_text.strip()
+            return self.build_job_data(
+                title, company, location, posting_date, url, tags, description,
+                lambda: job_element.text.strip()
+            )
+            
+        except Exception as e:
+            print(f"Error extracting job data: {e}")
+            return None
+    
+    def build_job_data(self, title, company, location, posting_date, url, tags, description, card_text):
+        """Assemble a job dict, falling back to the card's text (a callable) for the description"""
+        # If we still don't have a description, try to get it from the job card
+        if not description:
+            # Get all text from the job element and use it as description
+            all_text = card_text()
+            # Remove title, company, location from the text
+            if title:
+                all_text = all_text.replace(title, '')
+            if company:
+                all_text = all_text.replace(company, '')
+            if location:
+                all_text = all_text.replace(location, '')
+            description = all_text.strip()
+        
+        # Job type, seniority and keyword tags in one pass over the text
+        classification = classify_job(title, description, tags)
+        inferred = [classification.seniority] if classification.seniority else []
+        tags = parse_tags(tags + inferred + classification.tags)
+        
+        return {
+            'title': title,
+            'company': company,
+            'location': location,
+            'posting_date': posting_date,
+            'job_type': classification.job_type,
+            'tags': ','.join(tags) if tags else None,
+            'description': description,
+            'url': url,
+            'salary': None
+        }
+    
+    def select_text(self, card, selectors):
+        """Text of the first element matching a selector cascade in a parsed card, or None"""
+        for selector in selectors:
+            element = card.select_one(selector)
+            if element is not None:
+                text = element.get_text(' ', strip=True)
+                if text:
+                    return text
+        return None
+    
+    def extract_job_data_from_soup(self, card, page_url):
+        """Extract job data from a parsed job card, using the same cascades as extract_job_data_from_element"""
+        try:
+            title = self.select_text(card, self.TITLE_SELECTORS)
+            if not title:
+                # Try to find any text that looks like a job title
+                for element in card.select('p, span, div'):
+                    text = element.get_text(' ', strip=True)
+                    if text and 5 < len(text) < 100 and any(word in text.lower() for word in self.TITLE_KEYWORDS):
+                        title = text
+                        break
+            
+            company = self.select_text(card, self.COMPANY_SELECTORS)
+            location = self.select_text(card, self.LOCATION_SELECTORS)
+            
+            posting_date = datetime.utcnow()
+            for selector in self.DATE_SELECTORS:
+                date_element = card.select_one(selector)
+                if date_element is not None:
+                    posting_date = self.parse_date(date_element.get_text(' ', strip=True))
+                    break
+            
+            # Resolve relative links the way the browser's href property does
+            url = None
+            link_element = card.select_one('a[href]')
+            if link_element is not None:
+                url = urljoin(page_url, link_element['href'])
+            
+            tags = []
+            for selector in self.TAG_SELECTORS:
+                for tag_element in card.select(selector):
+                    tag_text = tag_element.get_text(' ', strip=True)
+                    if tag_text and tag_text not in tags:
+                        tags.append(tag_text)
             
-            # Infer job type
-            job_type = self.infer_job_type(title or '', description, ' '.join(tags))
+            description = self.select_text(card, self.DESCRIPTION_SELECTORS) or ""
             
-            return {
-                'title': title,
-                'company': company,
-                'location': location,
-                'posting_date': posting_date,
-                'job_type': job_type,
-                'tags': ','.join(tags) if tags else None,
-                'description': description,
-                'url': url,
-                'salary': None
-            }
+            return self.build_job_data(
+                title, company, location, posting_date, url, tags, description,
+                lambda: card.get_text('\n', strip=True)
+            )
             
         except Exception as e:
             print(f"Error extracting job data: {e}")
             return None
     
+    def find_job_cards(self, soup):
+        """Find job cards in a parsed page with the same fallbacks scrape_jobs uses on the live DOM"""
+        # Method 1: Look for specific job-related selectors
+        for selector in self.JOB_SELECTORS:
+            cards = soup.select(selector)
+            if cards:
+                print(f"Found {len(cards)} job elements using selector: {selector}")
+                return cards
+        
+        # Method 2: Any div whose text mentions job-related keywords
+        keywords = ['actuary', 'analyst', 'job', 'position', 'opportunity', 'career']
+        cards = []
+        for div in soup.find_all('div'):
+            text = div.get_text(' ', strip=True)
+            if len(text) > 50 and any(keyword in text.lower() for keyword in keywords):
+                cards.append(div)
+        if cards:
+            print(f"Found {len(cards)} potential job elements using content analysis")
+            return cards
+        
+        # Method 3: Any element with substantial text, limited to the first 20
+        cards = [
+            element for element in soup.find_all(['div', 'article', 'section'])
+            if len(element.get_text(' ', strip=True)) > 100
+        ][:20]
+        print(f"Found {len(cards)} content elements")
+        return cards
+    
+    def discover_listing_pages(self, soup, page_url):
+        """Find further listing pages linked from a parsed page, filling gaps in numbered pagination"""
+        host = urlsplit(self.base_url).netloc
+        links = set()
+        for selector in self.PAGINATION_SELECTORS:
+            for link in soup.select(selector):
+                links.add(urljoin(page_url, link['href']))
+        for link in soup.select('a[href]'):
+            if self.PAGE_NUMBER_PATTERN.search(link['href']):
+                links.add(urljoin(page_url, link['href']))
+        
+        pages = set()
+        highest = {}
+        for link in links:
+            link = link.split('#')[0]
+            if urlsplit(link).netloc != host:
+                continue
+            match = self.PAGE_NUMBER_PATTERN.search(link)
+            if match and int(match.group(2)) == 1:
+                continue  # The first page is the base URL, already crawled
+            pages.add(link)
+            if match:
+                template = link[:match.start(2)] + '{}' + link[match.end(2):]
+                highest[template] = max(highest.get(template, 0), int(match.group(2)))
+        
+        # "1 2 3 ... 40" only links a few pages; add the ones in between
+        for template, last_page in highest.items():
+            for number in range(2, last_page + 1):
+                pages.add(template.format(number))
+        return pages
+    
+    def parse_page(self, html, page_url):
+        """
+        Parse one page snapshot without further WebDriver calls. Returns (cards, linked
+        listing pages, known), where cards are (fingerprint, job_data) pairs and known
+        counts cards skipped without extraction because the crawl state has them.
+        """
+        soup = BeautifulSoup(html, HTML_PARSER)
+        # Selenium's .text never includes script or style contents
+        for hidden in soup(['script', 'style', 'noscript', 'template']):
+            hidden.decompose()
+        
+        cards = []
+        known = 0
+        skip_known = self.crawl_state is not None and self.incremental
+        for card in self.find_job_cards(soup):
+            fingerprint = card_fingerprint(str(card))
+            if skip_known and self.crawl_state.is_known_card(fingerprint):
+                known += 1
+                continue
+            job_data = self.extract_job_data_from_soup(card, page_url)
+            if job_data and job_data['title'] and job_data['company']:
+                cards.append((fingerprint, job_data))
+        return cards, self.discover_listing_pages(soup, page_url), known
+    
+    def extract_jobs_from_html(self, html, page_url):
+        """Parse one page snapshot and extract every job card from it"""
+        return [job_data for _, job_data in self.parse_page(html, page_url)[0]]
+    
+    def page_number(self, url):
+        """Position of a listing page in numbered pagination; the base page is 1"""
+        match = self.PAGE_NUMBER_PATTERN.search(url)
+        return int(match.group(2)) if match else 1
+    
+    def load_page(self, driver, url):
+        """Load a page in a driver and return its rendered HTML"""
+        driver.get(url)
+        WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.TAG_NAME, "body"))
+        )
+        return driver.page_source
+    
+    def crawl_pages(self):
+        """
+        Crawl listing pages with a pool of workers, yielding (page_url, cards, known)
+        from parse_page() as each page finishes. Workers share one HTTP session; a worker starts a headless driver
+        only when a page needs JavaScript, and reuses it for its later pages. Pages
+        discovered on a page are queued for the pool. Closing the generator stops the
+        crawl and quits the drivers.
+        
+        In incremental mode, a page whose cards are all known ends the crawl at that
+        page: listings are newest first, so later pages hold only older postings.
+        """
+        pending = queue.Queue()
+        # Bounded, so workers wait instead of piling up pages the consumer hasn't taken
+        results = queue.Queue(maxsize=max(self.workers, 1) * 2)
+        stop = threading.Event()
+        done = object()
+        lock = threading.Lock()
+        seen = {self.base_url}
+        # Page number of the first page with only known cards
+        state = {'outstanding': 1, 'known_from': float('inf')}
+        pending.put(self.base_url)
+        
+        def put_result(item):
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.2)
+                    return
+                except queue.Full:
+                    continue
+        
+        def finish_one():
+            with lock:
+                state['outstanding'] -= 1
+                finished = state['outstanding'] == 0
+            if finished:
+                put_result(done)
+        
+        def worker(worker_id):
+            # Chrome is started on the first page plain HTTP can't handle, then reused
+            browser = {'driver': None, 'started': False}
+            
+            def get_driver():
+                if not browser['started']:
+                    browser['started'] = True
+                    browser['driver'] = self.create_driver(block_resources=True)
+                return browser['driver']
+            
+            try:
+                while not stop.is_set():
+                    try:
+                        url = pending.get(timeout=0.2)
+                    except queue.Empty:
+                        continue
+                    try:
+                        if self.page_number(url) > state['known_from']:
+                            continue
+                        start = time.perf_counter()
+                        cards, pages, known = self.fetch_listing_page(url, get_driver)
+                        print(f"[worker {worker_id}] {url}: {len(cards)} new or changed jobs, {known} known in {time.perf_counter() - start:.1f}s")
+                        with lock:
+                            if known and not cards:
+                                state['known_from'] = min(state['known_from'], self.page_number(url))
+                            for page in sorted(pages - seen):
+                                if len(seen) >= self.max_pages:
+                                    break
+                                seen.add(page)
+                                state['outstanding'] += 1
+                                pending.put(page)
+                        put_result((url, cards, known))
+                    except Exception as e:
+                        self.record_fetch('failed')
+                        print(f"[worker {worker_id}] Error crawling {url}: {e}")
+                    finally:
+                        finish_one()
+            finally:
+                if browser['driver'] is not None:
+                    browser['driver'].quit()
+        
+        threads = [
+            threading.Thread(target=worker, args=(worker_id,), daemon=True)
+            for worker_id in range(1, self.workers + 1)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                item = results.get()
+                if item is done:
+                    break
+                yield item
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+    
+    def report_progress(self):
+        """Pass the current counts to on_progress, if set"""
+        if self.on_progress is not None:
+            self.on_progress(self)
+    
+    def iter_jobs(self):
+        """
+        Stream unique jobs from the crawl as pages finish, up to max_jobs. With crawl
+        state, only postings that are new or whose content changed are yielded.
+        """
+        seen = set()
+        pages = self.crawl_pages()
+        try:
+            for page_url, cards, known in pages:
+                self.card_stats['unchanged_cards'] += known
+                unchanged = []
+                for fingerprint, job_data in cards:
+                    key = natural_key(job_data['url'], job_data['title'], job_data['company'])
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    if self.crawl_state is not None:
+                        entry = (fingerprint, key, content_hash(job_data))
+                        if self.incremental and self.crawl_state.is_unchanged(key, entry[2]):
+                            # Only the card markup changed; nothing to write
+                            unchanged.append(entry)
+                            self.card_stats['unchanged_postings'] += 1
+                            continue
+                        self.pending_state[key] = entry
+                    self.card_stats['changed'] += 1
+                    self.jobs_scraped += 1
+                    yield job_data
+                    if self.max_jobs and self.jobs_scraped >= self.max_jobs:
+                        return
+                if self.crawl_state is not None:
+                    self.crawl_state.remember(unchanged)
+                self.report_progress()
+        finally:
+            pages.close()
+    
+    def crawl_jobs(self):
+        """Crawl every listing page concurrently and return the jobs from iter_jobs() as a list"""
+        return list(self.iter_jobs())
+    
+    def print_crawl_stats(self):
+        print("Pages fetched: " + ", ".join(
+            f"{path}={self.fetch_stats[path]}" for path in ('http', 'http_not_modified', 'browser', 'failed')
+        ))
+        print("Cards: " + ", ".join(
+            f"{kind}={self.card_stats[kind]}" for kind in ('changed', 'unchanged_cards', 'unchanged_postings')
+        ))
+    
+    def run(self, batch_size=100, flush_interval=30, archive_after_days=None):
+        """
+        Crawl and save in one streaming pass: pages are fetched and extracted by the
+        workers while earlier jobs are written, in batches committed every batch_size
+        jobs or flush_interval seconds. Only the current batch is held in memory, and
+        batches committed before a failure are kept. Afterwards, jobs posted more than
+        archive_after_days days ago are archived. Returns the save counts.
+        """
+        print(f"Crawling Actuary List with {self.workers} workers...")
+        counts = self.save_jobs_to_database(self.iter_jobs(), batch_size, flush_interval)
+        print(f"Total jobs successfully scraped: {self.jobs_scraped}")
+        self.print_crawl_stats()
+        if archive_after_days and not self.save_error:
+            self.archive_stale(archive_after_days)
+        return counts
+    
+    def archive_stale(self, days):
+        """Move jobs posted more than days ago out of the active job table"""
+        with self.app.app_context():
+            try:
+                moved = archive_stale_jobs(days)
+                print(f"Archived {moved} jobs posted more than {days} days ago")
+            except Exception as e:
+                print(f"Error archiving stale jobs: {e}")
+                db.session.rollback()
+    
     def scrape_jobs(self):
         """Main method to scrape jobs from Actuary List"""
+        if self.extraction == 'snapshot':
+            print(f"Crawling Actuary List with {self.workers} workers...")
+            jobs_data = self.crawl_jobs()
+            print(f"Total jobs successfully scraped: {len(jobs_data)}")
+            self.print_crawl_stats()
+            return jobs_data
+        
+        # WebDriver extraction reads the live DOM of the first page only
         if not self.setup_driver():
             return False
         
         try:
             # Navigate to Actuary List
             print("Navigating to Actuary List...")
-            self.driver.get("https://www.actuarylist.com")
+            self.driver.get(self.base_url)
             
             # Wait for page to load
             WebDriverWait(self.driver, 10).until(
@@ -278,13 +729,7 @@ class ActuaryListScraper:
             job_elements = []
             
             # Method 1: Look for specific job-related selectors
-            job_selectors = [
-                '.job-listing', '.job-card', '.job-item',
-                '[class*="job"]', '.listing', '.card',
-                '.post', '.position', '.opportunity'
-            ]
-            
-            for selector in job_selectors:
+            for selector in self.JOB_SELECTORS:
                 try:
                     elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
                     if elements:
@@ -337,7 +782,7 @@ class ActuaryListScraper:
             # Extract job data
             jobs_data = []
             for i, element in enumerate(job_elements):
-                if self.jobs_scraped >= self.max_jobs:
+                if self.max_jobs and self.jobs_scraped >= self.max_jobs:
                     break
                 
                 print(f"Processing element {i+1}/{len(job_elements)}")
@@ -362,42 +807,70 @@ class ActuaryListScraper:
             if self.driver:
                 self.driver.quit()
     
-    def save_jobs_to_database(self, jobs_data):
-        """Save scraped jobs to the database"""
-        with app.app_context():
-            saved_count = 0
-            duplicate_count = 0
-            
-            for job_data in jobs_data:
-                try:
-                    # Check if job already exists (title + company combination)
-                    existing_job = Job.query.filter_by(
-                        title=job_data['title'],
-                        company=job_data['company']
-                    ).first()
-                    
-                    if existing_job:
-                        duplicate_count += 1
-                        print(f"Duplicate job found: {job_data['title']} at {job_data['company']}")
-                        continue
-                    
-                    # Create new job
-                    new_job = Job(**job_data)
-                    db.session.add(new_job)
-                    saved_count += 1
-                    print(f"Saved job: {job_data['title']} at {job_data['company']}")
-                    
-                except Exception as e:
-                    print(f"Error saving job {job_data.get('title', 'Unknown')}: {e}")
-            
-            # Commit all changes
+    def iter_batches(self, jobs, batch_size, flush_interval=None):
+        """Group a stream of jobs into lists of batch_size, or fewer once flush_interval seconds have passed"""
+        batch = []
+        started = time.monotonic()
+        for job_data in jobs:
+            if not batch:
+                started = time.monotonic()
+            batch.append(job_data)
+            if len(batch) >= batch_size or (flush_interval and time.monotonic() - started >= flush_interval):
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    def save_job_batch(self, jobs_data):
+        """Upsert and commit one batch of jobs, then record it in the crawl state; returns the statuses"""
+        batch = []
+        for job_data in jobs_data:
+            values = {field: value for field, value in job_data.items() if field != 'tags'}
+            values['natural_key'] = natural_key(job_data['url'], job_data['title'], job_data['company'])
+            batch.append((values, job_data['tags'] or []))
+        # One lookup query and one INSERT ... ON CONFLICT per batch. Scraped dates
+        # are relative ("3 days ago"), so they don't count as a change on their own.
+        # Reposts of a listed job under another URL are merged into it, not added
+        statuses = [status for _, status in write_job_batch(
+            batch, upsert=True, ignore_fields=('posting_date',), merge_near_duplicates=True
+        )]
+        if 'created' in statuses or 'updated' in statuses:
+            # Invalidates cached /jobs responses in the web workers
+            bump_table_version('job')
+        db.session.commit()
+        if self.crawl_state is not None:
+            self.crawl_state.remember(
+                self.pending_state.pop(values['natural_key'])
+                for values, _ in batch if values['natural_key'] in self.pending_state
+            )
+        return statuses
+    
+    def save_jobs_to_database(self, jobs_data, batch_size=500, flush_interval=None):
+        """
+        Upsert scraped jobs: existing postings (same natural key) are refreshed, not skipped.
+        jobs_data may be a list or a stream; each batch is committed as soon as it is full.
+        """
+        if self.app is None:
+            self.app = create_db_app()
+        with self.app.app_context():
+            counts = self.save_counts
             try:
-                db.session.commit()
-                print(f"Successfully saved {saved_count} new jobs to database")
-                print(f"Skipped {duplicate_count} duplicate jobs")
+                for batch in self.iter_batches(jobs_data, batch_size, flush_interval):
+                    for status in self.save_job_batch(batch):
+                        counts[status] += 1
+                    print(f"Committed {len(batch)} jobs ({counts['created']} new, {counts['updated']} updated so far)")
+                    self.report_progress()
+                print(f"Inserted {counts['created']} new jobs")
+                print(f"Updated {counts['updated']} existing jobs")
+                print(f"Merged {counts['merged']} near-duplicate jobs into listed ones")
+                print(f"Left {counts['unchanged']} unchanged jobs as they were")
+                return counts
             except Exception as e:
-                print(f"Error committing to database: {e}")
+                # Batches committed before the failure are kept
+                print(f"Error saving jobs to database: {e}")
+                self.save_error = str(e)
                 db.session.rollback()
+                return counts
 
 def main():
     """Main function to run the scraper"""
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Offline scraper benchmark and regression check.
+
+Serves the recorded listing pages in benchmarks/fixtures from a local HTTP
+server, crawls them with ActuaryListScraper and reports pages/s, jobs/s,
+extraction time per card and peak memory. The extracted jobs are compared
+with fixtures/expected.json, so a change that speeds up extraction but
+breaks it fails the run.
+
+    cd Scraper
+    python benchmarks/bench_scraper.py --repeat 5 --output after.json --baseline before.json
+
+Pass --update-expected after an intended extraction change, and
+--record https://www.actuarylist.com to refresh the fixtures from the live site.
+"""
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bs4 import BeautifulSoup
+from actuary_scraper_v2 import ActuaryListScraper, HTML_PARSER
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+EXPECTED_PATH = os.path.join(FIXTURES_DIR, 'expected.json')
+
+# posting_date is relative to the time of the run, so it isn't compared
+COMPARED_FIELDS = ('title', 'company', 'location', 'job_type', 'tags', 'description', 'url', 'salary')
+
+def fixture_name(path):
+    """Map a request path to a fixture file: / -> index.html, /?page=2 -> page-2.html"""
+    parts = urlsplit(path)
+    page = ActuaryListScraper.PAGE_NUMBER_PATTERN.search(path)
+    if page and int(page.group(2)) > 1:
+        return f'page-{page.group(2)}.html'
+    if parts.path in ('', '/'):
+        return 'index.html'
+    return parts.path.strip('/').replace('/', '_') + '.html'
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    """Serve fixture pages like the live site; anything unrecorded is a 404"""
+    def do_GET(self):
+        path = os.path.join(FIXTURES_DIR, fixture_name(self.path))
+        if not os.path.exists(path):
+            self.send_error(404)
+            return
+        with open(path, 'rb') as fixture:
+            body = fixture.read()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}/'
+
+def comparable(jobs, base_url):
+    """Strip the server's random port and the run-dependent date so runs can be compared"""
+    rows = []
+    for job in jobs:
+        row = {field: job.get(field) for field in COMPARED_FIELDS}
+        if row['url']:
+            row['url'] = row['url'].replace(base_url.rstrip('/'), '')
+        rows.append(row)
+    return sorted(rows, key=lambda row: (row['url'] or '', row['title'] or ''))
+
+def measure_extraction(scraper, base_url):
+    """Median time to extract one card, parsing every fixture page once"""
+    timings = []
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        if not name.endswith('.html'):
+            continue
+        with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as fixture:
+            soup = BeautifulSoup(fixture.read(), HTML_PARSER)
+        for card in scraper.find_job_cards(soup):
+            start = time.perf_counter()
+            scraper.extract_job_data_from_soup(card, base_url)
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings) if timings else 0.0
+
+def run_once(args, base_url, trace_memory=False):
+    """
+    Crawl the fixtures once. Tracing allocations slows Python down several
+    times, so memory is measured in a separate run from the timings.
+    """
+    scraper = ActuaryListScraper(
+        headless=True, max_jobs=None, extraction=args.extraction, base_url=base_url,
+        workers=args.workers, max_pages=args.max_pages, http_first=not args.browser
+    )
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    jobs = scraper.scrape_jobs() if args.extraction == 'webdriver' else scraper.crawl_jobs()
+    elapsed = time.perf_counter() - start
+    jobs = jobs or []
+    pages = sum(scraper.fetch_stats[path] for path in ('http', 'http_not_modified', 'browser')) or 1
+    result = {
+        'seconds': elapsed,
+        'pages': pages,
+        'jobs': len(jobs),
+        'pages_per_sec': pages / elapsed,
+        'jobs_per_sec': len(jobs) / elapsed,
+        'fetch_paths': dict(scraper.fetch_stats),
+    }
+    if trace_memory:
+        result['peak_traced_mb'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+    return result, scraper, jobs
+
+def record(url, max_pages):
+    """Save the live site's listing pages as fixtures"""
+    scraper = ActuaryListScraper(base_url=url, max_jobs=None, max_pages=max_pages, workers=1)
+    pending, seen = [url], {url}
+    while pending:
+        page_url = pending.pop(0)
+        html, _ = scraper.fetch_http(page_url)
+        if html is None:
+            print(f"Could not fetch {page_url}")
+            continue
+        split = urlsplit(page_url)
+        name = fixture_name(split.path + ('?' + split.query if split.query else ''))
+        with open(os.path.join(FIXTURES_DIR, name), 'w', encoding='utf-8') as fixture:
+            fixture.write(html)
+        print(f"Recorded {page_url} as {name}")
+        _, pages, _ = scraper.parse_page(html, page_url)
+        for page in sorted(pages - seen):
+            if len(seen) < max_pages:
+                seen.add(page)
+                pending.append(page)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=3, help="Crawls to run; the median is reported")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--max-pages', type=int, default=50)
+    parser.add_argument('--browser', action='store_true', help="Render every page in Chrome instead of fetching it over HTTP")
+    parser.add_argument('--extraction', choices=['snapshot', 'webdriver'], default='snapshot',
+                        help="webdriver runs the legacy per-element path on the first page (needs Chrome)")
+    parser.add_argument('--output', help="Write the results as JSON, for --baseline in a later run")
+    parser.add_argument('--baseline', help="Results JSON of an earlier run to compare against")
+    parser.add_argument('--update-expected', action='store_true', help="Save the extracted jobs as the new expected output")
+    parser.add_argument('--record', metavar='URL', help="Record fixtures from a live site instead of benchmarking")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record, args.max_pages)
+        return
+
+    server, base_url = start_server()
+    try:
+        runs = []
+        for _ in range(args.repeat):
+            result, scraper, jobs = run_once(args, base_url)
+            runs.append(result)
+        memory_run, _, _ = run_once(args, base_url, trace_memory=True)
+        per_card = measure_extraction(scraper, base_url)
+    finally:
+        server.shutdown()
+
+    results = {
+        metric: statistics.median(run[metric] for run in runs)
+        for metric in ('seconds', 'pages', 'jobs', 'pages_per_sec', 'jobs_per_sec')
+    }
+    results['peak_traced_mb'] = memory_run['peak_traced_mb']
+    results['extract_us_per_card'] = per_card * 1e6
+    results['max_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    results['fetch_paths'] = runs[-1]['fetch_paths']
+
+    extracted = comparable(jobs, base_url)
+    if args.update_expected:
+        with open(EXPECTED_PATH, 'w', encoding='utf-8') as expected_file:
+            json.dump(extracted, expected_file, indent=2, ensure_ascii=False)
+            expected_file.write('\n')
+        print(f"Saved {len(extracted)} expected jobs to {EXPECTED_PATH}")
+    elif os.path.exists(EXPECTED_PATH) and args.extraction == 'snapshot':
+        with open(EXPECTED_PATH, encoding='utf-8') as expected_file:
+            expected = json.load(expected_file)
+        results['regression'] = 'ok' if extracted == expected else 'changed'
+        if extracted != expected:
+            first = next((i for i, (old, new) in enumerate(zip(expected, extracted)) if old != new),
+                         min(len(expected), len(extracted)))
+            print(f"Extraction differs from expected output ({len(extracted)} jobs vs {len(expected)}), "
+                  f"first at job {first}")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+    for metric in ('pages_per_sec', 'jobs_per_sec', 'extract_us_per_card', 'peak_traced_mb', 'max_rss_mb'):
+        line = f"{metric:22} {results[metric]:10.2f}"
+        if baseline and baseline.get(metric):
+            line += f"  ({(results[metric] / baseline[metric] - 1) * 100:+.1f}% vs baseline)"
+        print(line)
+    print(f"{'pages / jobs':22} {results['pages']:10.0f} / {results['jobs']:.0f}  fetched via {results['fetch_paths']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(results, output_file, indent=2)
+    if results.get('regression') == 'changed':
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
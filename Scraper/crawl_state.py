@@ -0,0 +1,122 @@
+"""
+Crawl state kept between scraper runs
+
+A local SQLite file records a fingerprint of every job card already written
+to the database, and a hash of each posting's content by natural key, so a
+run can skip cards it has seen, stop paging once pages hold only known
+postings, and write only new or changed jobs. It also keeps the ETag,
+Last-Modified and HTML of each listing page fetched over HTTP, so the next
+run can revalidate the page and reuse the HTML when the site answers 304.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from datetime import datetime
+
+DEFAULT_STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'crawl_state.db')
+
+# Relative dates change every day without the posting changing
+RELATIVE_DATE_PATTERN = re.compile(
+    r'\b(\d+\+?\s*(minute|hour|day|week|month|year)s?\s+ago|today|yesterday|just posted)\b', re.I
+)
+
+# Fields whose change makes a posting worth rewriting; posting_date is relative on the site
+CONTENT_FIELDS = ('title', 'company', 'location', 'job_type', 'description', 'salary', 'url', 'tags')
+
+def card_fingerprint(card_html):
+    """Hash a job card's markup with relative dates removed"""
+    return hashlib.sha1(RELATIVE_DATE_PATTERN.sub('', card_html).encode()).hexdigest()
+
+def content_hash(job_data):
+    """Hash the fields of an extracted job that are written to the database"""
+    content = json.dumps([job_data.get(field) for field in CONTENT_FIELDS], ensure_ascii=False)
+    return hashlib.sha1(content.encode()).hexdigest()
+
+class CrawlState:
+    def __init__(self, path=DEFAULT_STATE_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        # Lookups come from crawler threads; writes are serialized by self.lock
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS card (
+                fingerprint TEXT PRIMARY KEY,
+                natural_key TEXT NOT NULL,
+                seen_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS posting (
+                natural_key TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                seen_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS page (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                html BLOB NOT NULL,
+                fetched_at TEXT NOT NULL
+            );
+        """)
+        # Loaded up front so lookups during the crawl never touch the file
+        self.known_cards = {row[0] for row in self.connection.execute("SELECT fingerprint FROM card")}
+        self.content_hashes = dict(self.connection.execute("SELECT natural_key, content_hash FROM posting"))
+
+    def is_known_card(self, fingerprint):
+        """Whether a card with this fingerprint was already written"""
+        return fingerprint in self.known_cards
+
+    def is_unchanged(self, key, digest):
+        """Whether the posting with this natural key was written with the same content"""
+        return self.content_hashes.get(key) == digest
+
+    def remember(self, entries):
+        """Record (fingerprint, natural_key, content_hash) entries once they are in the database"""
+        entries = list(entries)
+        if not entries:
+            return
+        now = datetime.utcnow().isoformat()
+        with self.lock:
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO card (fingerprint, natural_key, seen_at) VALUES (?, ?, ?)",
+                    [(fingerprint, key, now) for fingerprint, key, _ in entries]
+                )
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO posting (natural_key, content_hash, seen_at) VALUES (?, ?, ?)",
+                    [(key, digest, now) for _, key, digest in entries]
+                )
+            for fingerprint, key, digest in entries:
+                self.known_cards.add(fingerprint)
+                self.content_hashes[key] = digest
+
+    def page_validators(self, url):
+        """The (etag, last_modified, html) saved for a listing page, or None"""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT etag, last_modified, html FROM page WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, html = row
+        return etag, last_modified, zlib.decompress(html).decode()
+
+    def remember_page(self, url, etag, last_modified, html):
+        """Record a listing page fetched over HTTP, if the site sent validators for it"""
+        if not etag and not last_modified:
+            return
+        # Listing pages are mostly repeated markup, so they compress well
+        row = (url, etag, last_modified, zlib.compress(html.encode()), datetime.utcnow().isoformat())
+        with self.lock:
+            with self.connection:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO page (url, etag, last_modified, html, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                    row
+                )
+
+    def close(self):
+        self.connection.close()
@@ -5,12 +5,26 @@ Actuary List Scraper Runner
 This script runs the Actuary List scraper to populate the job board database.
 """
 
+import argparse
 import os
 import sys
 from actuary_scraper_v2 import ActuaryListScraper
+from crawl_state import DEFAULT_STATE_PATH
+from config import Config
 
 def main():
     """Main function to run the scraper"""
+    parser = argparse.ArgumentParser(description="Scrape Actuary List into the job board database")
+    parser.add_argument('--workers', type=int, default=4, help="Browser workers crawling pages concurrently")
+    parser.add_argument('--max-pages', type=int, default=50, help="Maximum listing pages to crawl")
+    parser.add_argument('--max-jobs', type=int, default=50, help="Stop after this many jobs (0 for no limit)")
+    parser.add_argument('--state', default=DEFAULT_STATE_PATH, help="Crawl state file recording jobs already saved")
+    parser.add_argument('--batch-size', type=int, default=100, help="Jobs written per database commit")
+    parser.add_argument('--full', action='store_true', help="Re-extract and rewrite every job instead of only new or changed ones")
+    parser.add_argument('--archive-after-days', type=int, default=Config.ARCHIVE_AFTER_DAYS,
+                        help="Afterwards, archive jobs posted more than this many days ago (0 to keep everything)")
+    args = parser.parse_args()
+    
     print("=" * 50)
     print("Actuary List Job Scraper")
     print("=" * 50)
@@ -27,18 +41,18 @@ def main():
     
     try:
         # Create scraper instance
-        scraper = ActuaryListScraper(headless=True, max_jobs=50)
+        scraper = ActuaryListScraper(
+            headless=True, max_jobs=args.max_jobs or None,
+            workers=args.workers, max_pages=args.max_pages,
+            state_path=args.state, incremental=not args.full
+        )
         
         print("Starting job scraping...")
-        jobs_data = scraper.scrape_jobs()
+        # Jobs are saved in batches while the crawl is still running
+        scraper.run(batch_size=args.batch_size, archive_after_days=args.archive_after_days)
         
-        if jobs_data:
-            print(f"\nSuccessfully scraped {len(jobs_data)} jobs!")
-            
-            # Save to database
-            print("Saving jobs to database...")
-            scraper.save_jobs_to_database(jobs_data)
-            
+        if sum(scraper.card_stats.values()):
+            print(f"\nSuccessfully scraped {scraper.jobs_scraped} new or changed jobs!")
             print("\nScraping completed successfully!")
         else:
             print("\nNo jobs were scraped. This might be due to:")
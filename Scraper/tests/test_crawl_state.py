@@ -0,0 +1,100 @@
+# Scraper/tests/test_crawl_state.py
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from actuary_scraper_v2 import ActuaryListScraper
+from crawl_state import CrawlState, card_fingerprint, content_hash
+
+PAGE_HTML = '<html><body><div class="job-card">Pricing Actuary</div></body></html>'
+PAGE_ETAG = '"page-v1"'
+
+@pytest.fixture
+def state_path(tmp_path):
+    return str(tmp_path / 'crawl_state.db')
+
+@pytest.fixture
+def listing_server():
+    """
+    A listing page served with an ETag, answering 304 when it is sent back.
+    Yields (url, list of the If-None-Match headers received).
+    """
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            received.append(self.headers.get('If-None-Match'))
+            if self.headers.get('If-None-Match') == PAGE_ETAG:
+                self.send_response(304)
+                self.send_header('ETag', PAGE_ETAG)
+                self.end_headers()
+                return
+            body = PAGE_HTML.encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('ETag', PAGE_ETAG)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}/jobs?page=1', received
+    server.shutdown()
+    server.server_close()
+
+def test_card_fingerprint_ignores_relative_dates():
+    assert card_fingerprint('<div>Pricing Actuary · 3 days ago</div>') == \
+        card_fingerprint('<div>Pricing Actuary · 4 days ago</div>')
+    assert card_fingerprint('<div>Pricing Actuary</div>') != card_fingerprint('<div>Reserving Actuary</div>')
+
+def test_remembered_postings_survive_a_restart(state_path):
+    job = {'title': 'Pricing Actuary', 'company': 'Acme', 'url': 'https://x/1', 'tags': ['Pricing']}
+    state = CrawlState(state_path)
+    assert not state.is_known_card('card-1')
+    state.remember([('card-1', 'https://x/1', content_hash(job))])
+    state.close()
+
+    state = CrawlState(state_path)
+    assert state.is_known_card('card-1')
+    assert state.is_unchanged('https://x/1', content_hash(job))
+    assert not state.is_unchanged('https://x/1', content_hash({**job, 'salary': '$100k'}))
+    assert not state.is_unchanged('https://x/2', content_hash(job))
+    state.close()
+
+def test_page_validators(state_path):
+    state = CrawlState(state_path)
+    state.remember_page('https://x/jobs', PAGE_ETAG, 'Mon, 05 Oct 2026 10:00:00 GMT', PAGE_HTML)
+    # Pages without validators can't be revalidated, so they aren't kept
+    state.remember_page('https://x/other', None, None, PAGE_HTML)
+    state.close()
+
+    state = CrawlState(state_path)
+    assert state.page_validators('https://x/jobs') == (PAGE_ETAG, 'Mon, 05 Oct 2026 10:00:00 GMT', PAGE_HTML)
+    assert state.page_validators('https://x/other') is None
+    state.close()
+
+def test_fetch_http_revalidates_saved_pages(state_path, listing_server):
+    url, received = listing_server
+    scraper = ActuaryListScraper(state_path=state_path)
+    assert scraper.fetch_http(url) == (PAGE_HTML, 'http')
+    scraper.crawl_state.close()
+
+    # A later run sends the saved ETag and reuses the saved HTML on 304
+    scraper = ActuaryListScraper(state_path=state_path)
+    assert scraper.fetch_http(url) == (PAGE_HTML, 'http_not_modified')
+    scraper.crawl_state.close()
+
+    # A full recrawl doesn't revalidate
+    scraper = ActuaryListScraper(state_path=state_path, incremental=False)
+    assert scraper.fetch_http(url) == (PAGE_HTML, 'http')
+    scraper.crawl_state.close()
+    assert received == [None, PAGE_ETAG, None]
@@ -1,15 +1,62 @@
 # backend/app.py
+import click
 from flask import Flask
 from flask_cors import CORS
-from db import init_db
+from config import Config
+from db import db, init_db, bootstrap_db
+from cache import response_cache
+from metrics import metrics
+from scrape_runs import scrape_runner
 from routes.job_routes import job_bp
+from routes.scrape_routes import scrape_bp
 
-app = Flask(__name__)
-CORS(app)
-init_db(app)
+def create_app(config=Config):
+    """
+    Build the web app. config is a class or object with the settings in
+    config.Config; tests and scripts can pass a subclass overriding some.
+    """
+    app = Flask(__name__)
+    app.config.from_object(config)
+    CORS(app, expose_headers=['ETag', 'Server-Timing'])
+    init_db(app)
+    response_cache.init_app(app)
+    metrics.init_app(app)
+    scrape_runner.init_app(app)
 
-# Register blueprints
-app.register_blueprint(job_bp)
+    # Register blueprints
+    app.register_blueprint(job_bp)
+    app.register_blueprint(scrape_bp)
+    register_commands(app)
+    return app
+
+def register_commands(app):
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Create the database, tables and search index, and run migrations."""
+        bootstrap_db(app)
+        print("Database is ready")
+
+    @app.cli.command('rebuild-facets')
+    def rebuild_facets_command():
+        """Recompute the job_facet counts from the job table."""
+        from facets import rebuild_facets
+        written = rebuild_facets()
+        db.session.commit()
+        print(f"Rebuilt {written} facet counts")
+
+    @app.cli.command('archive-jobs')
+    @click.option('--days', type=int, default=None, help="Archive jobs posted more than this many days ago")
+    @click.option('--batch-size', type=int, default=None, help="Jobs moved per transaction")
+    def archive_jobs_command(days, batch_size):
+        """Move stale jobs from job to job_archive."""
+        from archive import archive_stale_jobs
+        days = days if days is not None else app.config['ARCHIVE_AFTER_DAYS']
+        if days <= 0:
+            print("Archiving is disabled; pass --days or set ARCHIVE_AFTER_DAYS")
+            return
+        moved = archive_stale_jobs(days, batch_size or app.config['ARCHIVE_BATCH_SIZE'])
+        print(f"Archived {moved} jobs posted more than {days} days ago")
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    # Development server only; production runs wsgi:app under gunicorn
+    create_app().run(debug=True)
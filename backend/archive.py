@@ -0,0 +1,112 @@
+# backend/archive.py
+from datetime import datetime, timedelta
+from sqlalchemy import and_, cast, delete, exists, false, func, insert, literal, null, or_, select, true
+from db import db
+from dedupe import release_duplicates, unindex_jobs
+from facets import apply_facet_changes, facet_values
+from models.job import Job
+from models.job_archive import JobArchive
+from models.table_version import bump_table_version
+from models.tag import JobTag, parse_tags
+from serializers import load_tags
+
+# Job columns copied into job_archive; tags are added as a string
+ARCHIVED_COLUMNS = (
+    'id', 'title', 'company', 'location', 'posting_date', 'job_type', 'description',
+    'salary', 'url', 'natural_key', 'created_at', 'updated_at'
+)
+
+def archive_stale_jobs(days, batch_size=1000):
+    """
+    Move jobs posted more than days ago from job to job_archive, oldest
+    first, committing every batch_size jobs so no transaction holds many
+    locks. An archived copy of a posting that is archived again is replaced.
+    Jobs flagged as near-duplicates are deleted rather than archived, and
+    those of archived jobs are listed in their place. Returns the number of
+    jobs moved.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    moved = 0
+    while True:
+        rows = db.session.execute(
+            select(*[getattr(Job, column) for column in ARCHIVED_COLUMNS], Job.duplicate_of)
+            .where(Job.posting_date < cutoff)
+            .order_by(Job.posting_date, Job.id).limit(batch_size)
+        ).mappings().all()
+        if not rows:
+            return moved
+
+        job_ids = [row['id'] for row in rows]
+        archived = [row for row in rows if not row['duplicate_of']]
+        tags = load_tags(job_ids)
+        keys = [row['natural_key'] for row in archived if row['natural_key']]
+        if keys:
+            db.session.execute(delete(JobArchive).where(JobArchive.natural_key.in_(keys)))
+        now = datetime.utcnow()
+        if archived:
+            db.session.execute(insert(JobArchive), [
+                {**{column: row[column] for column in ARCHIVED_COLUMNS},
+                 'tags': ','.join(tags[row['id']]), 'archived_at': now}
+                for row in archived
+            ])
+        # Facet counts describe the active, listed jobs only
+        apply_facet_changes([
+            (facet_values(row['job_type'], row['location'], tags[row['id']]), []) for row in archived
+        ])
+        # Stale duplicates are dropped first, so only the active ones are
+        # released; the originals after, so the release can still find them
+        unindex_jobs(job_ids)
+        _delete_jobs([row['id'] for row in rows if row['duplicate_of']])
+        release_duplicates([row['id'] for row in archived])
+        _delete_jobs([row['id'] for row in archived])
+        bump_table_version('job')
+        db.session.commit()
+        moved += len(archived)
+
+def _delete_jobs(job_ids):
+    if job_ids:
+        db.session.execute(delete(JobTag).where(JobTag.job_id.in_(job_ids)))
+        db.session.execute(delete(Job).where(Job.id.in_(job_ids)))
+
+def archived_jobs_query(columns, args, with_score):
+    """
+    Select the columns of archived jobs matching the GET /jobs filters in args,
+    shaped to be UNIONed with the active listing query: columns, then score
+    (0, archived jobs aren't indexed for search) when with_score, then
+    archived_tags and archived. Archived copies of postings that are active
+    again are left out.
+    """
+    query = select(*[getattr(JobArchive, column) for column in columns])
+    if with_score:
+        query = query.add_columns(literal(0.0).label('score'))
+    query = query.add_columns(JobArchive.tags.label('archived_tags'), true().label('archived'))
+    query = query.where(~exists().where(Job.natural_key == JobArchive.natural_key))
+
+    if args.get('job_type'):
+        query = query.where(JobArchive.job_type == args['job_type'])
+    if args.get('location'):
+        query = query.where(JobArchive.location.ilike(f"%{args['location']}%"))
+
+    tags = parse_tags([name for value in args.getlist('tag') for name in value.split(',')])
+    if tags:
+        tag_list = func.lower(literal(',') + JobArchive.tags + literal(','))
+        matches = [tag_list.contains(f',{name.lower()},', autoescape=True) for name in tags]
+        query = query.where(or_(*matches) if args.get('tag_mode') == 'any' else and_(*matches))
+
+    # No full-text index here: every term must appear in the title, company or description
+    for term in args.get('q', '').split():
+        pattern = f'%{term}%'
+        query = query.where(or_(
+            JobArchive.title.ilike(pattern), JobArchive.company.ilike(pattern), JobArchive.description.ilike(pattern)
+        ))
+    return query
+
+def with_archived_jobs(query, columns, args, score):
+    """
+    UNION the active listing query with the matching archived jobs. Returns
+    the subquery to select from; its score column is present when score is.
+    """
+    if score is not None:
+        query = query.add_columns(score.label('score'))
+    query = query.add_columns(cast(null(), db.Text).label('archived_tags'), false().label('archived'))
+    return query.union_all(archived_jobs_query(columns, args, score is not None)).subquery()
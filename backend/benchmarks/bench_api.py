@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+API load test and latency benchmark.
+
+Seeds a local database with --rows jobs, serves the app from a threaded
+local server and drives each scenario (GET /jobs with every filter and sort,
+cursor pages, GET /jobs/<id>, facets and the write endpoints) with
+--concurrency clients. Reports requests/s and p50/p95/p99 latency per
+scenario as JSON, to compare across commits.
+
+    cd backend
+    python benchmarks/bench_api.py --rows 100000 --output before.json
+    # ...change the API...
+    python benchmarks/bench_api.py --rows 100000 --baseline before.json
+
+The SQLite database is kept in benchmarks/.data and reused while --rows is
+unchanged; pass --database-url postgresql://... to use a throwaway Postgres
+database instead. The response cache is off unless --cache is given, so
+repeated requests measure the queries rather than cache hits.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import requests
+from werkzeug.serving import WSGIRequestHandler, make_server
+from config import Config
+from db import bootstrap_db, db
+from ingest import write_job_batch
+from models.job import Job
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.data')
+DEFAULT_DATABASE = 'bench_api.db'
+
+JOB_TYPES = ['Full-Time', 'Part-Time', 'Contract', 'Intern']
+LOCATIONS = ['London', 'New York, NY', 'Chicago, IL', 'Hartford, CT', 'Toronto', 'Remote', 'Zurich', 'Singapore']
+TAGS = ['Life', 'Health', 'Pension', 'P&C', 'Pricing', 'Reserving', 'Valuation', 'Python', 'SQL', 'IFRS 17', 'FSA', 'ASA']
+TITLES = ['Pricing Actuary', 'Actuarial Analyst', 'Reserving Manager', 'Valuation Actuary',
+          'Senior Data Scientist', 'Chief Actuary', 'Actuarial Intern', 'Capital Modelling Lead']
+WORDS = ('pricing reserving valuation capital modelling reinsurance annuity pension medicare '
+         'solvency python sql experience study mortality lapse claims triangle').split()
+
+# GET /jobs query strings: every filter, alone and combined with each sort
+LIST_FILTERS = {
+    'all': {},
+    'job_type': {'job_type': 'Contract'},
+    'location': {'location': 'york'},
+    'tag': {'tag': 'Pricing'},
+    'tags_all': {'tag': 'Pricing,Python'},
+    'tags_any': {'tag': 'Pricing,Python', 'tag_mode': 'any'},
+    'search': {'q': 'reinsurance'},
+    'combined': {'job_type': 'Full-Time', 'tag': 'Life', 'q': 'valuation'},
+}
+LIST_SORTS = ['posting_date_desc', 'posting_date_asc']
+
+def seed(rows, batch_size=2000):
+    """Insert rows deterministic, varied jobs through the same path as bulk ingest"""
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    for start in range(0, rows, batch_size):
+        batch = []
+        for i in range(start, min(start + batch_size, rows)):
+            url = f'https://bench.example.com/jobs/{i}'
+            batch.append(({
+                'title': f'{rng.choice(TITLES)} {i}', 'company': f'Company {i % 997}',
+                'location': rng.choice(LOCATIONS), 'posting_date': now - timedelta(minutes=i),
+                'job_type': rng.choice(JOB_TYPES),
+                'description': ' '.join(rng.choices(WORDS, k=60)),
+                'salary': f'${rng.randrange(60, 250)},000', 'url': url, 'natural_key': url,
+            }, rng.sample(TAGS, rng.randrange(1, 4))))
+        write_job_batch(batch)
+        db.session.commit()
+        print(f"Seeded {min(start + batch_size, rows)}/{rows} jobs", end='\r', flush=True)
+    print()
+
+def prepare_database(app, rows):
+    """
+    Create the schema and seed it. A database already holding exactly rows
+    jobs is reused; one holding a different number is only replaced when it
+    is the default SQLite file.
+    """
+    bootstrap_db(app)
+    with app.app_context():
+        existing = db.session.query(Job).count()
+        if existing == rows:
+            print(f"Reusing database with {rows} jobs")
+        elif existing:
+            path = os.path.join(DATA_DIR, DEFAULT_DATABASE)
+            if app.config['DATABASE_URL'] != f'sqlite:///{path}':
+                sys.exit(f"The database already holds {existing} jobs; pass --rows {existing} or an empty database")
+            print(f"Database has {existing} jobs, reseeding")
+            # End the session first: dispose() leaves its checked-out connection open
+            db.session.remove()
+            db.engine.dispose()
+            os.remove(path)
+            bootstrap_db(app)
+            seed(rows)
+        else:
+            seed(rows)
+        return db.session.execute(db.select(Job.id)).scalars().all()
+
+class KeepAliveRequestHandler(WSGIRequestHandler):
+    """Keep client connections open between requests, as a production server would"""
+    protocol_version = 'HTTP/1.1'
+
+def start_server(app):
+    # Per-request access logging would dominate the timings
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=KeepAliveRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+def first_cursor(base_url, params, depth):
+    """Follow depth pages of a listing and return the cursor of the next one"""
+    cursor = None
+    for _ in range(depth):
+        body = requests.get(f'{base_url}/jobs', params={**params, **({'cursor': cursor} if cursor else {})}).json()
+        cursor = body.get('next_cursor')
+        if not cursor:
+            break
+    return cursor
+
+def build_scenarios(base_url, job_ids, args):
+    """
+    Return {name: request factory}; each factory takes a random.Random and
+    returns (method, path, params, json body)
+    """
+    scenarios = {}
+    for name, params in LIST_FILTERS.items():
+        sorts = LIST_SORTS + (['relevance'] if 'q' in params else [])
+        for sort in sorts:
+            query = {**params, 'sort': sort, 'limit': args.page_size}
+            scenarios[f'list:{name}:{sort}'] = lambda rng, query=query: ('GET', '/jobs', query, None)
+
+    deep = {'limit': args.page_size}
+    cursor = first_cursor(base_url, deep, args.cursor_depth)
+    if cursor:
+        scenarios[f'list:cursor_page_{args.cursor_depth + 1}'] = \
+            lambda rng: ('GET', '/jobs', {**deep, 'cursor': cursor}, None)
+    scenarios['list:fields_all'] = lambda rng: ('GET', '/jobs', {'fields': 'all', 'limit': args.page_size}, None)
+    scenarios['get_job'] = lambda rng: ('GET', f'/jobs/{rng.choice(job_ids)}', {}, None)
+    scenarios['facets'] = lambda rng: ('GET', '/jobs/facets', {}, None)
+    scenarios['facets:filtered'] = lambda rng: ('GET', '/jobs/facets', {'tag': 'Pricing'}, None)
+
+    if not args.read_only:
+        created = []
+        created_lock = threading.Lock()
+
+        def create(rng):
+            suffix = f'{os.getpid()}-{time.perf_counter_ns()}-{rng.random()}'
+            return ('POST', '/jobs', {}, {
+                'title': 'Benchmark Actuary', 'company': 'Bench Co', 'location': rng.choice(LOCATIONS),
+                'job_type': rng.choice(JOB_TYPES), 'tags': rng.sample(TAGS, 2),
+                'description': ' '.join(rng.choices(WORDS, k=40)),
+                'url': f'https://bench.example.com/created/{suffix}',
+            })
+
+        def update(rng):
+            return ('PATCH', f'/jobs/{rng.choice(job_ids)}', {}, {
+                'salary': f'${rng.randrange(60, 250)},000', 'tags': rng.sample(TAGS, 2)
+            })
+
+        def delete(rng):
+            with created_lock:
+                job_id = created.pop() if created else None
+            return ('DELETE', f'/jobs/{job_id or 0}', {}, None)
+
+        # Jobs created by write:create are what write:delete removes
+        create.created = (created, created_lock)
+        scenarios['write:create'] = create
+        scenarios['write:update'] = update
+        scenarios['write:delete'] = delete
+    return scenarios
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+def run_scenario(base_url, factory, args, seed_value):
+    """
+    Send args.requests requests from args.concurrency clients, after
+    args.warmup unmeasured ones. Returns the latency summary.
+    """
+    local = threading.local()
+    created = getattr(factory, 'created', None)
+
+    def send(rng, measure=True):
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+        method, path, params, body = factory(rng)
+        start = time.perf_counter()
+        response = session.request(method, base_url + path, params=params, json=body)
+        elapsed = time.perf_counter() - start
+        if created is not None and response.status_code == 201:
+            with created[1]:
+                created[0].append(response.json()['id'])
+        return elapsed, response.status_code < 400
+
+    def client(index, count):
+        rng = random.Random(seed_value * 1000 + index)
+        return [send(rng) for _ in range(count)]
+
+    warmup_rng = random.Random(seed_value)
+    for _ in range(args.warmup):
+        send(warmup_rng)
+
+    per_client = [args.requests // args.concurrency + (i < args.requests % args.concurrency)
+                  for i in range(args.concurrency)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = [sample for samples in pool.map(client, range(args.concurrency), per_client) for sample in samples]
+    wall = time.perf_counter() - start
+
+    latencies = sorted(elapsed for elapsed, ok in results)
+    return {
+        'requests': len(results),
+        'errors': sum(1 for _, ok in results if not ok),
+        'rps': len(results) / wall,
+        'mean_ms': statistics.fmean(latencies) * 1000,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'max_ms': latencies[-1] * 1000,
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=10000, help="Jobs to seed (10k-1M)")
+    parser.add_argument('--database-url', help="Database to seed and query (default: SQLite file in benchmarks/.data)")
+    parser.add_argument('--concurrency', type=int, default=8, help="Concurrent clients per scenario")
+    parser.add_argument('--requests', type=int, default=400, help="Measured requests per scenario")
+    parser.add_argument('--warmup', type=int, default=20, help="Unmeasured requests sent before each scenario")
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--cursor-depth', type=int, default=20, help="Pages followed to build the deep cursor scenario")
+    parser.add_argument('--scenario', action='append', help="Only run scenarios starting with this prefix (repeatable)")
+    parser.add_argument('--read-only', action='store_true', help="Skip the write scenarios")
+    parser.add_argument('--cache', action='store_true', help="Keep the response cache enabled")
+    parser.add_argument('--seed', type=int, default=1, help="Seed for the request mix")
+    parser.add_argument('--output', help="Write the results as JSON, for --baseline in a later run")
+    parser.add_argument('--baseline', help="Results JSON of an earlier run to compare against")
+    parser.add_argument('--max-p99-regression', type=float,
+                        help="Exit with an error if any scenario's p99 grows by more than this percentage")
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if not database_url:
+        os.makedirs(DATA_DIR, exist_ok=True)
+        database_url = f"sqlite:///{os.path.join(DATA_DIR, DEFAULT_DATABASE)}"
+
+    from app import create_app
+    settings = {
+        'DATABASE_URL': database_url,
+        'METRICS_ENABLED': False,
+        'CACHE_BACKEND': 'lru',
+        'CACHE_MAX_ENTRIES': Config.CACHE_MAX_ENTRIES if args.cache else 0,
+        # Every client thread may hold a connection
+        'DB_POOL_SIZE': max(Config.DB_POOL_SIZE, args.concurrency),
+    }
+    app = create_app(type('BenchConfig', (Config,), settings))
+    job_ids = prepare_database(app, args.rows)
+
+    server, base_url = start_server(app)
+    try:
+        scenarios = build_scenarios(base_url, job_ids, args)
+        if args.scenario:
+            scenarios = {name: factory for name, factory in scenarios.items()
+                         if any(name.startswith(prefix) for prefix in args.scenario)}
+        results = {}
+        for name, factory in scenarios.items():
+            results[name] = run_scenario(base_url, factory, args, args.seed)
+            print(f"{name:40} {results[name]['rps']:8.1f} req/s  p50 {results[name]['p50_ms']:7.2f}  "
+                  f"p95 {results[name]['p95_ms']:7.2f}  p99 {results[name]['p99_ms']:7.2f} ms"
+                  + (f"  {results[name]['errors']} errors" if results[name]['errors'] else ''))
+    finally:
+        server.shutdown()
+
+    report = {
+        'commit': git_commit(),
+        'created_at': datetime.utcnow().isoformat(),
+        'database': database_url.split(':', 1)[0],
+        'rows': args.rows,
+        'concurrency': args.concurrency,
+        'requests': args.requests,
+        'cache': args.cache,
+        'python': platform.python_version(),
+        'scenarios': results,
+    }
+
+    regressed = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+        print(f"\nCompared with {baseline.get('commit') or args.baseline}:")
+        for name, result in results.items():
+            before = baseline.get('scenarios', {}).get(name)
+            if not before:
+                continue
+            change = (result['p99_ms'] / before['p99_ms'] - 1) * 100
+            rps_change = (result['rps'] / before['rps'] - 1) * 100
+            print(f"{name:40} p99 {change:+7.1f}%  req/s {rps_change:+7.1f}%")
+            if args.max_p99_regression is not None and change > args.max_p99_regression:
+                regressed.append(name)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=2)
+            output_file.write('\n')
+    if regressed:
+        print(f"p99 regressed by more than {args.max_p99_regression}% in: {', '.join(regressed)}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
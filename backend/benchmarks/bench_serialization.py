@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for job listings.
+
+Compares the per-row cost of the old read path (hydrate Job ORM objects,
+to_dict(), jsonify) with the Core-row path used by GET /jobs (plain rows,
+row_to_dict(), serializers.dumps) on a seeded SQLite database, and checks
+that both decode to the same JSON. The bytes differ: jsonify escapes
+non-ASCII and sorts keys.
+
+    cd backend
+    python benchmarks/bench_serialization.py --rows 20000 --page 200
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from flask import Flask, jsonify
+from sqlalchemy import select
+from db import db
+from ingest import write_job_batch
+from models.job import Job
+from serializers import dumps, load_tags, orjson, row_to_dict
+
+def create_bench_app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+def seed(rows):
+    now = datetime.utcnow()
+    for start in range(0, rows, 1000):
+        batch = []
+        for i in range(start, min(start + 1000, rows)):
+            batch.append(({
+                'title': f'Pricing Actuary {i}', 'company': f'Company {i % 97}',
+                'location': 'London', 'posting_date': now - timedelta(minutes=i),
+                'job_type': 'Full-Time', 'description': 'Pricing and reserving for life insurance. ' * 20,
+                'salary': '£60,000', 'url': f'https://example.com/jobs/{i}', 'natural_key': f'https://example.com/jobs/{i}',
+            }, ['Pricing', 'Life', 'Python'][:1 + i % 3]))
+        write_job_batch(batch)
+    db.session.commit()
+
+def orm_page(limit, fields):
+    jobs = Job.query.order_by(Job.posting_date.desc(), Job.id.desc()).limit(limit).all()
+    body = jsonify({'jobs': [job.to_dict(fields) for job in jobs], 'next_cursor': None}).get_data()
+    db.session.expunge_all()
+    return body
+
+def core_page(limit, fields):
+    columns = ['id', 'posting_date'] + [field for field in fields if field not in ('id', 'posting_date', 'tags')]
+    rows = db.session.execute(
+        select(*[getattr(Job, field) for field in columns])
+        .order_by(Job.posting_date.desc(), Job.id.desc()).limit(limit)
+    ).mappings().all()
+    tags_by_job = load_tags([row['id'] for row in rows])
+    return dumps({'jobs': [row_to_dict(row, fields, tags_by_job) for row in rows], 'next_cursor': None})
+
+def measure(func, repeat, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=20000, help="Rows to seed")
+    parser.add_argument('--page', type=int, default=200, help="Rows serialized per request")
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    app = create_bench_app()
+    with app.app_context():
+        db.create_all()
+        seed(args.rows)
+
+        for shape, fields in [('summary', Job.SUMMARY_FIELDS), ('full', Job.FIELDS)]:
+            old = measure(orm_page, args.repeat, args.page, fields)
+            new = measure(core_page, args.repeat, args.page, fields)
+            # jsonify escapes non-ASCII, so compare the parsed output
+            assert json.loads(orm_page(args.page, fields)) == json.loads(core_page(args.page, fields))
+            encoder = 'orjson' if orjson else 'json'
+            print(f"{shape:8} {'ORM + to_dict + jsonify':28} {old / args.page * 1e6:8.1f} us/row")
+            print(f"{shape:8} {'Core rows + ' + encoder:28} {new / args.page * 1e6:8.1f} us/row ({old / new:.1f}x faster)")
+
+if __name__ == '__main__':
+    main()
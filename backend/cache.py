@@ -0,0 +1,143 @@
+# backend/cache.py
+import hashlib
+import threading
+from collections import OrderedDict
+from urllib.parse import urlencode
+from flask import Response, current_app, request
+from compression import compress, negotiate
+from models.table_version import get_table_version
+
+class LRUCacheBackend:
+    """
+    In-process cache holding the most recently used entries
+    """
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class RedisCacheBackend:
+    """
+    Cache shared by every worker process. Requires the redis package.
+    Entries expire after ttl seconds; stale versions are never read again,
+    so expiry only reclaims memory.
+    """
+    def __init__(self, url, ttl=3600, prefix='jobs-cache:'):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, value, ex=self.ttl)
+
+    def clear(self):
+        for key in self.client.scan_iter(self.prefix + '*'):
+            self.client.delete(key)
+
+class ResponseCache:
+    """
+    Cache of serialized JSON responses keyed by table version and normalized
+    query arguments. Entries are stored as bytes (etag line + body), so any
+    backend with get/set of bytes can be plugged in.
+    """
+    def __init__(self, backend=None):
+        self.backend = backend or LRUCacheBackend()
+
+    def init_app(self, app):
+        if app.config.get('CACHE_BACKEND') == 'redis':
+            self.backend = RedisCacheBackend(app.config['CACHE_REDIS_URL'])
+        else:
+            self.backend = LRUCacheBackend(app.config.get('CACHE_MAX_ENTRIES', 1024))
+
+    def key(self, namespace, table, args=()):
+        """
+        Build a cache key for the current version of table. Query arguments
+        are sorted so equivalent URLs share an entry.
+        """
+        version = get_table_version(table)
+        normalized = urlencode(sorted(args))
+        digest = hashlib.sha1(normalized.encode()).hexdigest()
+        return f'{namespace}:{table}:{version}:{digest}'
+
+    def get(self, key):
+        entry = self.backend.get(key)
+        if entry is None:
+            return None
+        etag, body = entry.split(b'\n', 1)
+        return etag.decode(), body
+
+    def set(self, key, body):
+        etag = make_etag(body)
+        self.backend.set(key, etag.encode() + b'\n' + body)
+        return etag, body
+
+    def get_encoded(self, key, encoding):
+        """
+        Return the body of key compressed with encoding, compressing and
+        storing it on first use so hot entries are compressed only once
+        """
+        encoded_key = f'{key}:{encoding}'
+        encoded = self.backend.get(encoded_key)
+        if encoded is None:
+            entry = self.get(key)
+            if entry is None:
+                return None
+            encoded = compress(entry[1], encoding)
+            self.backend.set(encoded_key, encoded)
+        return encoded
+
+response_cache = ResponseCache()
+
+def make_etag(body):
+    return hashlib.sha256(body).hexdigest()[:32]
+
+def json_response(etag, body, status=200, cache_key=None):
+    """
+    Return body with a strong ETag, or 304 if the client already has it.
+    Bodies of at least COMPRESSION_MIN_SIZE bytes are compressed with the
+    best encoding the client accepts, reusing the compressed bytes cached
+    under cache_key; each encoding gets its own ETag.
+    """
+    encoding = None
+    if current_app.config.get('COMPRESSION_ENABLED', True) and \
+            len(body) >= current_app.config.get('COMPRESSION_MIN_SIZE', 1024):
+        encoding = negotiate(request.accept_encodings)
+    if encoding:
+        etag = f'{etag}-{encoding}'
+
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        if encoding:
+            encoded = response_cache.get_encoded(cache_key, encoding) if cache_key else None
+            body = encoded if encoded is not None else compress(body, encoding)
+        response = Response(body, status=status, mimetype='application/json')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    # Clients may store the response but must revalidate it on every use
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
@@ -0,0 +1,234 @@
+# backend/classification.py
+import re
+from collections import deque, namedtuple
+from datetime import datetime, timedelta
+
+Classification = namedtuple('Classification', ['job_type', 'seniority', 'tags'])
+
+MONTHS = {name: number for number, name in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], start=1
+)}
+_MONTH = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?'
+
+# Every supported date phrase in one alternation, so a text is scanned once
+DATE_PATTERN = re.compile(rf"""
+    \b(?P<count>\d+|an?|one)\s*\+?\s*
+    (?P<unit>minutes?|mins?|hours?|hrs?|h|days?|d|weeks?|wks?|w|months?|mos?|years?|yrs?|y)\s+ago\b
+  | (?P<today>\btoday\b|\bjust\s+(?:now|posted)\b)
+  | (?P<yesterday>\byesterday\b)
+  | \b(?P<iso_year>\d{{4}})-(?P<iso_month>\d{{1,2}})-(?P<iso_day>\d{{1,2}})\b
+  | \b(?P<us_month>\d{{1,2}})/(?P<us_day>\d{{1,2}})/(?P<us_year>\d{{4}})\b
+  | \b(?P<mf_month>{_MONTH})\s+(?P<mf_day>\d{{1,2}})(?:st|nd|rd|th)?\b(?:,?\s+(?P<mf_year>\d{{4}}))?
+  | \b(?P<df_day>\d{{1,2}})(?:st|nd|rd|th)?\s+(?P<df_month>{_MONTH})(?:,?\s+(?P<df_year>\d{{4}}))?
+""", re.IGNORECASE | re.VERBOSE)
+
+# Months and years are approximated, as the scraper always has
+_UNITS = {
+    'mi': timedelta(minutes=1), 'h': timedelta(hours=1), 'd': timedelta(days=1),
+    'w': timedelta(weeks=1), 'mo': timedelta(days=30), 'y': timedelta(days=365),
+}
+
+def _unit_delta(unit):
+    unit = unit.lower()
+    return _UNITS[unit[:2]] if unit.startswith('m') else _UNITS[unit[0]]
+
+def _calendar_date(year, month, day, now):
+    """
+    Build a date, assuming the most recent past occurrence when the year is missing
+    """
+    if year:
+        return datetime(int(year), month, int(day))
+    date = datetime(now.year, month, int(day))
+    return date if date <= now else date.replace(year=now.year - 1)
+
+def parse_posting_date(text, now=None):
+    """
+    Parse a posting date phrase: relative ("3 days ago", "2h ago", "a week ago"),
+    "today"/"yesterday", or absolute ("2024-05-01", "05/01/2024", "May 1, 2024",
+    "1 May"). Returns None when the text holds no date.
+    """
+    if not text:
+        return None
+    now = now or datetime.utcnow()
+    for match in DATE_PATTERN.finditer(text):
+        groups = match.groupdict()
+        try:
+            if groups['unit']:
+                count = groups['count'].lower()
+                count = int(count) if count.isdigit() else 1
+                return now - count * _unit_delta(groups['unit'])
+            if groups['today']:
+                return now
+            if groups['yesterday']:
+                return now - timedelta(days=1)
+            if groups['iso_year']:
+                return datetime(int(groups['iso_year']), int(groups['iso_month']), int(groups['iso_day']))
+            if groups['us_year']:
+                return datetime(int(groups['us_year']), int(groups['us_month']), int(groups['us_day']))
+            if groups['mf_month']:
+                return _calendar_date(groups['mf_year'], MONTHS[groups['mf_month'][:3].lower()], groups['mf_day'], now)
+            return _calendar_date(groups['df_year'], MONTHS[groups['df_month'][:3].lower()], groups['df_day'], now)
+        except ValueError:
+            continue  # Not a real date, e.g. 02/30/2024
+    return None
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a {keyword: label} map. Finds every keyword in
+    a single pass over the text; matches must start and end on word boundaries.
+    Keywords are matched case-insensitively.
+    """
+    def __init__(self, keywords):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for keyword, label in keywords.items():
+            state = 0
+            for char in keyword.lower():
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state].append((len(keyword), label))
+
+        # Breadth-first, so each state's failure target is already complete
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, child in self._goto[state].items():
+                pending.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def matches(self, text):
+        """
+        Yield (start, end, label) for every keyword occurrence, in order of end position
+        """
+        text = text.lower()
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, label in output[state]:
+                start = index + 1 - length
+                if (start == 0 or not text[start - 1].isalnum()) and \
+                        (index + 1 == len(text) or not text[index + 1].isalnum()):
+                    yield start, index + 1, label
+
+# Checked in order; the first type with a match wins, otherwise Full-Time
+JOB_TYPE_KEYWORDS = {
+    'Intern': ['intern', 'interns', 'internship', 'internships'],
+    'Part-Time': ['part-time', 'part time', 'contract'],
+    'Contract': ['freelance', 'consultant'],
+}
+DEFAULT_JOB_TYPE = 'Full-Time'
+
+# Read from the title only; the most senior match wins
+SENIORITY_KEYWORDS = {
+    'Intern': ['intern', 'internship', 'summer analyst'],
+    'Entry Level': ['entry level', 'entry-level', 'junior', 'jr', 'graduate', 'trainee'],
+    'Senior': ['senior', 'sr', 'principal'],
+    'Manager': ['manager', 'mgr', 'head of', 'supervisor'],
+    'Director': ['director', 'avp', 'vp', 'vice president'],
+    'Executive': ['chief', 'cro', 'chief actuary', 'svp', 'evp'],
+}
+# Words that name a seniority only when they start the title:
+# "Lead Pricing Actuary", but not "Team Lead" or "Actuary, Partner Solutions"
+SENIORITY_TITLE_HEADS = {
+    'Senior': ['lead'],
+    'Executive': ['partner'],
+}
+
+# Read from the title and the source's own tags; descriptions are full of
+# benefits and office-policy boilerplate ("health insurance", "retirement
+# plan", "this is not a remote role") that would match these
+TAG_KEYWORDS = {
+    'Life': ['life insurance', 'life actuary', 'annuity', 'annuities'],
+    'Health': ['health', 'healthcare', 'medicare', 'medicaid'],
+    'Pension': ['pension', 'pensions', 'retirement'],
+    'P&C': ['p&c', 'property and casualty', 'property & casualty', 'general insurance'],
+    'Reinsurance': ['reinsurance'],
+    'Pricing': ['pricing', 'ratemaking'],
+    'Reserving': ['reserving', 'reserves'],
+    'Valuation': ['valuation'],
+    'Predictive Modeling': ['predictive modeling', 'predictive modelling', 'machine learning'],
+    'IFRS 17': ['ifrs 17', 'ifrs17'],
+    'Remote': ['remote'],
+    'Hybrid': ['hybrid'],
+    'Python': ['python'],
+    'SQL': ['sql'],
+    'FSA': ['fsa'],
+    'ASA': ['asa'],
+    'FCAS': ['fcas'],
+    'ACAS': ['acas'],
+}
+# Phrases specific enough to tag a job from its description too
+DESCRIPTION_TAG_PHRASES = {
+    'Life': ['life actuary', 'life insurance products', 'annuity products'],
+    'Health': ['health actuary', 'healthcare actuary', 'medicare advantage'],
+    'Pension': ['pension actuary', 'pension valuations', 'defined benefit plans'],
+    'P&C': ['p&c actuary', 'property and casualty actuary', 'property & casualty actuary'],
+    'Reinsurance': ['reinsurance actuary', 'reinsurance pricing'],
+    'Pricing': ['pricing actuary', 'ratemaking'],
+    'Reserving': ['reserving actuary', 'loss reserving'],
+    'Valuation': ['valuation actuary'],
+    'Predictive Modeling': ['predictive modeling', 'predictive modelling', 'machine learning'],
+    'IFRS 17': ['ifrs 17', 'ifrs17'],
+    'Remote': ['fully remote', '100% remote', 'remote-first'],
+    'Python': ['python'],
+    'SQL': ['sql'],
+}
+
+def _build_matcher():
+    keywords = {}
+    for category, table in (('tag', TAG_KEYWORDS), ('description_tag', DESCRIPTION_TAG_PHRASES),
+                            ('seniority', SENIORITY_KEYWORDS), ('title_head', SENIORITY_TITLE_HEADS),
+                            ('job_type', JOB_TYPE_KEYWORDS)):
+        for value, words in table.items():
+            for word in words:
+                # Words shared between categories, like 'intern', carry a label for each
+                keywords.setdefault(word, []).append((category, value))
+    return KeywordMatcher(keywords)
+
+_MATCHER = _build_matcher()
+_SENIORITY_ORDER = list(SENIORITY_KEYWORDS)
+
+def classify_job(title, description='', tags=()):
+    """
+    Classify a job in one pass over its title, description and tags. Returns
+    Classification(job_type, seniority or None, inferred tags in text order).
+    Seniority comes from the title; tags from the title and tags, and from
+    DESCRIPTION_TAG_PHRASES in the description.
+    """
+    title, description = title or '', description or ''
+    text = '\n'.join([title, description, ' '.join(tags or ())])
+    description_start, description_end = len(title) + 1, len(title) + 1 + len(description)
+    job_types, seniority, found_tags = set(), None, []
+    for start, end, labels in _MATCHER.matches(text):
+        in_description = description_start <= start < description_end
+        for category, value in labels:
+            if category == 'job_type':
+                job_types.add(value)
+            elif category in ('seniority', 'title_head'):
+                if end <= len(title) and (category == 'seniority' or start == 0) and \
+                        (seniority is None or _SENIORITY_ORDER.index(value) > _SENIORITY_ORDER.index(seniority)):
+                    seniority = value
+            elif (category == 'description_tag' or not in_description) and value not in found_tags:
+                found_tags.append(value)
+    job_type = next((value for value in JOB_TYPE_KEYWORDS if value in job_types), DEFAULT_JOB_TYPE)
+    return Classification(job_type, seniority, found_tags)
+
+def classify_jobs(jobs):
+    """
+    Classify many jobs given as (title, description, tags) triples; returns a list
+    of Classification in the same order
+    """
+    return [classify_job(title, description, tags) for title, description, tags in jobs]
@@ -0,0 +1,48 @@
+# backend/compression.py
+import gzip
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; without it br is never offered
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional; without it zstd is never offered
+    zstandard = None
+
+# Preferred first when the client accepts several with the same quality
+ENCODINGS = tuple(name for name, available in (
+    ('zstd', zstandard is not None),
+    ('br', brotli is not None),
+    ('gzip', True),
+) if available)
+
+# Levels favour ratio over speed: cached bodies are compressed once per table version
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 6
+ZSTD_LEVEL = 6
+
+def negotiate(accept_encodings):
+    """
+    Pick the content coding for a werkzeug Accept-Encoding header value:
+    the supported encoding with the highest quality, ties going to the order
+    of ENCODINGS. Returns None to send the body as is.
+    """
+    best, best_quality = None, 0
+    for encoding in ENCODINGS:
+        # quality() applies '*' and treats unlisted encodings as 0
+        quality = accept_encodings.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+def compress(body, encoding):
+    if encoding == 'gzip':
+        # mtime=0 keeps the output, and so the ETag, identical across processes
+        return gzip.compress(body, GZIP_LEVEL, mtime=0)
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    raise ValueError(f"Unsupported encoding: {encoding}")
@@ -10,7 +10,43 @@ class Config:
     DB_HOST = os.getenv("DB_HOST")
     DB_PORT = os.getenv("DB_PORT")
     DB_NAME = os.getenv("DB_NAME")
-    DATABASE_URL = os.getenv(
-        "DATABASE_URL",
+    DATABASE_URL = os.getenv("DATABASE_URL") or (
         f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+        if all([DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, DB_NAME]) else None
     )
+
+    # Connection pool, per worker process. Size it so that
+    # workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) stays below Postgres max_connections
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+
+    # Cache of serialized /jobs responses: "lru" (per process) or "redis" (shared)
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "lru")
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+    # Compression of cached JSON responses (gzip; br and zstd when the brotli
+    # and zstandard packages are installed) for bodies of at least this many bytes
+    COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+    # Retention: jobs posted more than ARCHIVE_AFTER_DAYS days ago are moved to
+    # job_archive after every scrape and by flask archive-jobs (0 disables it)
+    ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+    ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))
+
+    # Request/SQL instrumentation, served on /metrics and as Server-Timing headers
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+    # Background scrapes queued through POST /scrape-runs: pool processes per
+    # web worker, jobs per commit, the crawl state file (default
+    # Scraper/crawl_state.db), and how long an active run may go without
+    # reporting progress before it is failed and its source freed
+    SCRAPE_PROCESSES = int(os.getenv("SCRAPE_PROCESSES", "1"))
+    SCRAPE_BATCH_SIZE = int(os.getenv("SCRAPE_BATCH_SIZE", "100"))
+    SCRAPE_STATE_PATH = os.getenv("SCRAPE_STATE_PATH")
+    SCRAPE_RUN_STALE_SECONDS = int(os.getenv("SCRAPE_RUN_STALE_SECONDS", "900"))
@@ -1,42 +1,98 @@
 # backend/db.py
+from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-import psycopg2
-from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from sqlalchemy.engine import make_url
 from config import Config
 
 db = SQLAlchemy()
 
-def init_db(app):
-    DB_USER = Config.DB_USER
-    DB_PASSWORD = Config.DB_PASSWORD
-    DB_HOST = Config.DB_HOST
-    DB_PORT = Config.DB_PORT
-    DB_NAME = Config.DB_NAME
+def engine_options(database_url, settings):
+    """
+    Connection pool settings from a config mapping (app.config). SQLite
+    manages its own connections, so it only gets the defaults.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() == 'sqlite':
+        return {}
+
+    options = {
+        'pool_size': settings['DB_POOL_SIZE'],
+        'max_overflow': settings['DB_MAX_OVERFLOW'],
+        'pool_timeout': settings['DB_POOL_TIMEOUT'],
+        'pool_recycle': settings['DB_POOL_RECYCLE'],
+        'pool_pre_ping': settings['DB_POOL_PRE_PING'],
+    }
+    if url.get_backend_name() == 'postgresql' and settings['DB_STATEMENT_TIMEOUT_MS']:
+        options['connect_args'] = {'options': f"-c statement_timeout={settings['DB_STATEMENT_TIMEOUT_MS']}"}
+    return options
 
-    if not all([DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, DB_NAME]):
+def init_db(app):
+    """
+    Configure SQLAlchemy for app from its DATABASE_URL and DB_* settings.
+    This never touches the schema, so workers start without a round trip to
+    the database; run bootstrap_db once instead (flask --app app init-db).
+    """
+    database_url = app.config.get('DATABASE_URL')
+    if not database_url:
         raise ValueError("Missing database environment variable(s)")
 
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(database_url, app.config)
+    db.init_app(app)
+
+def create_db_app(config=Config):
+    """
+    Build a bare app with only the database configured, for scripts such as
+    the scraper and the export CLI that need an app context but none of the
+    web app's routes, CORS, caching or metrics
+    """
+    app = Flask('jobs')
+    app.config.from_object(config)
+    init_db(app)
+    return app
+
+def create_database(database_url):
+    """
+    Create the Postgres database named in database_url if it doesn't exist
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() != 'postgresql':
+        return
+
+    import psycopg2
+    from psycopg2 import sql
+    from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
     conn = psycopg2.connect(
-        user=DB_USER,
-        password=DB_PASSWORD,
-        host=DB_HOST,
-        port=DB_PORT
+        user=url.username,
+        password=url.password,
+        host=url.host,
+        port=url.port,
+        dbname='postgres'
     )
     conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
     cur = conn.cursor()
 
-    cur.execute("SELECT 1 FROM pg_catalog.pg_database WHERE datname = %s", (DB_NAME,))
+    cur.execute("SELECT 1 FROM pg_catalog.pg_database WHERE datname = %s", (url.database,))
     exists = cur.fetchone()
 
     if not exists:
-        cur.execute(f'CREATE DATABASE {DB_NAME}')
+        cur.execute(sql.SQL('CREATE DATABASE {}').format(sql.Identifier(url.database)))
 
     cur.close()
     conn.close()
 
-    app.config['SQLALCHEMY_DATABASE_URI'] = Config.DATABASE_URL
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-    db.init_app(app)
+def bootstrap_db(app):
+    """
+    One-off schema setup: create the database, tables, search index and run
+    data migrations. Safe to re-run after upgrades.
+    """
+    from migrations import run_migrations
+    from search import install_search
 
+    create_database(app.config['SQLALCHEMY_DATABASE_URI'])
     with app.app_context():
         db.create_all()
+        install_search(db.engine)
+        run_migrations()
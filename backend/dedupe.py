@@ -0,0 +1,188 @@
+# backend/dedupe.py
+import hashlib
+import random
+import re
+from sqlalchemy import case, delete, insert, null, select, update
+from db import db
+from facets import apply_facet_changes, facet_values
+from models.job import Job
+from models.job_lsh_band import JobLshBand
+from serializers import load_tags
+
+# MinHash signature of NUM_BANDS bands of ROWS_PER_BAND values. Postings
+# sharing any band are candidates; with 16 x 4, pairs with a Jaccard
+# similarity of 0.8 share a band 99.98% of the time, pairs at 0.3 12%.
+NUM_BANDS = 16
+ROWS_PER_BAND = 4
+NUM_PERMUTATIONS = NUM_BANDS * ROWS_PER_BAND
+
+# Candidates are confirmed on their shingles: text similarity at least
+# TEXT_THRESHOLD, title word similarity at least TITLE_THRESHOLD, and the
+# same normalized company and location
+TEXT_THRESHOLD = 0.8
+TITLE_THRESHOLD = 0.5
+
+SHINGLE_SIZE = 3
+# Long descriptions add little beyond their opening; capping keeps hashing cheap
+MAX_DESCRIPTION_WORDS = 300
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(1729)  # Fixed, so signatures are stable across processes and releases
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERMUTATIONS)]
+
+_WORD_PATTERN = re.compile(r'[a-z0-9]+')
+_COMPANY_SUFFIXES = {'inc', 'llc', 'ltd', 'limited', 'plc', 'corp', 'corporation', 'co', 'company', 'group', 'gmbh', 'sa', 'ag'}
+
+def words(text):
+    return _WORD_PATTERN.findall((text or '').lower())
+
+def _hash64(value):
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), 'little')
+
+class Posting:
+    """
+    The normalized content of a job used to find near-duplicates: word
+    shingles of its title, company, location and description, and the
+    MinHash band buckets derived from them
+    """
+    def __init__(self, title, company, location, description):
+        self.title_words = set(words(title))
+        self.company = ' '.join(word for word in words(company) if word not in _COMPANY_SUFFIXES)
+        self.location = ' '.join(words(location))
+        tokens = words(title) + self.company.split() + self.location.split() + words(description)[:MAX_DESCRIPTION_WORDS]
+        if len(tokens) < SHINGLE_SIZE:
+            self.shingles = {' '.join(tokens)} if tokens else set()
+        else:
+            self.shingles = {' '.join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+        self._buckets = None
+
+    @classmethod
+    def from_values(cls, values):
+        return cls(values.get('title'), values.get('company'), values.get('location'), values.get('description'))
+
+    @property
+    def buckets(self):
+        """
+        One signed 64-bit bucket per band: the hash of the band number and its
+        slice of the MinHash signature
+        """
+        if self._buckets is None and self.shingles:
+            hashes = [_hash64(shingle) for shingle in self.shingles]
+            signature = [min((a * value + b) % _PRIME for value in hashes) for a, b in _PERMUTATIONS]
+            self._buckets = []
+            for band in range(NUM_BANDS):
+                rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+                digest = _hash64(f'{band}:' + ','.join(map(str, rows)))
+                self._buckets.append(digest - (1 << 64) if digest >= 1 << 63 else digest)
+        return self._buckets or []
+
+    def matches(self, other):
+        """
+        Whether other is a near-duplicate of this posting, compared on the
+        exact shingle sets rather than the signatures
+        """
+        if self.company != other.company or self.location != other.location:
+            return False
+        return _jaccard(self.title_words, other.title_words) >= TITLE_THRESHOLD and \
+            _jaccard(self.shingles, other.shingles) >= TEXT_THRESHOLD
+
+    def similarity(self, other):
+        return _jaccard(self.shingles, other.shingles)
+
+def _jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+def find_near_duplicates(postings):
+    """
+    Find, for each Posting, an indexed job it duplicates: one query for the
+    band buckets of all postings, then a comparison with the candidates.
+    Postings later in the list are also matched against earlier ones that
+    matched no job. Returns a list of None, ('job', job_id) or
+    ('batch', index of the earlier posting).
+    """
+    buckets = {bucket for posting in postings for bucket in posting.buckets}
+    jobs_by_bucket = {}
+    if buckets:
+        for bucket, job_id in db.session.execute(
+            select(JobLshBand.bucket, JobLshBand.job_id).where(JobLshBand.bucket.in_(list(buckets)))
+        ):
+            jobs_by_bucket.setdefault(bucket, set()).add(job_id)
+
+    candidate_ids = {job_id for job_ids in jobs_by_bucket.values() for job_id in job_ids}
+    candidates = {}
+    if candidate_ids:
+        for row in db.session.execute(
+            select(Job.id, Job.title, Job.company, Job.location, Job.description)
+            .where(Job.id.in_(list(candidate_ids)), Job.duplicate_of.is_(None))
+        ):
+            candidates[row.id] = Posting(row.title, row.company, row.location, row.description)
+
+    matches = []
+    batch_buckets = {}
+    for index, posting in enumerate(postings):
+        job_ids = {job_id for bucket in posting.buckets for job_id in jobs_by_bucket.get(bucket, ())}
+        scored = [(posting.similarity(candidates[job_id]), job_id) for job_id in job_ids
+                  if job_id in candidates and posting.matches(candidates[job_id])]
+        if scored:
+            matches.append(('job', max(scored)[1]))
+            continue
+        earlier = {i for bucket in posting.buckets for i in batch_buckets.get(bucket, ())}
+        original = next((i for i in sorted(earlier) if postings[i].matches(posting)), None)
+        if original is not None:
+            matches.append(('batch', original))
+            continue
+        matches.append(None)
+        for bucket in posting.buckets:
+            batch_buckets.setdefault(bucket, []).append(index)
+    return matches
+
+def index_jobs(postings_by_job):
+    """
+    (Re)write the band buckets of jobs from a {job_id: Posting} map. Only
+    jobs that aren't flagged duplicates should be indexed. Does not commit.
+    """
+    if not postings_by_job:
+        return
+    unindex_jobs(list(postings_by_job))
+    rows = [
+        {'bucket': bucket, 'job_id': job_id}
+        for job_id, posting in postings_by_job.items()
+        for bucket in set(posting.buckets)
+    ]
+    if rows:
+        db.session.execute(insert(JobLshBand), rows)
+
+def unindex_jobs(job_ids):
+    db.session.execute(delete(JobLshBand).where(JobLshBand.job_id.in_(list(job_ids))))
+
+def release_duplicates(job_ids):
+    """
+    For each of job_ids, which are being deleted or archived, promote the
+    oldest job flagged as its duplicate: clear its duplicate_of, and index
+    and count it so it is listed in the original's place. The other copies
+    are flagged as duplicates of the promoted job. Returns the number of
+    jobs promoted. Does not commit.
+    """
+    rows = db.session.execute(
+        select(Job.id, Job.duplicate_of, Job.title, Job.company, Job.location, Job.description, Job.job_type)
+        .where(Job.duplicate_of.in_(list(job_ids))).order_by(Job.id)
+    ).all()
+    promoted = {}
+    for row in rows:
+        promoted.setdefault(row.duplicate_of, row)
+    if not promoted:
+        return 0
+    rows = list(promoted.values())
+    new_original = {original_id: row.id for original_id, row in promoted.items()}
+    db.session.execute(
+        update(Job).where(Job.duplicate_of.in_(list(promoted))).values(duplicate_of=case(
+            (Job.id.in_(list(new_original.values())), null()),
+            else_=case(new_original, value=Job.duplicate_of),
+        ))
+    )
+    index_jobs({row.id: Posting(row.title, row.company, row.location, row.description) for row in rows})
+    tags = load_tags([row.id for row in rows])
+    apply_facet_changes([([], facet_values(row.job_type, row.location, tags[row.id])) for row in rows])
+    return len(rows)
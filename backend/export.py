@@ -0,0 +1,70 @@
+# backend/export.py
+import csv
+import io
+from sqlalchemy import asc, desc, select
+from db import db
+from models.job import Job
+from serializers import dumps, load_tags, row_to_dict
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+# Rows fetched per round trip, and rows per chunk of output
+EXPORT_BATCH_SIZE = 1000
+
+def export_select():
+    """
+    Select the columns of full job records as plain rows; tags are loaded
+    per batch by iter_export. Filter it with apply_filters.
+    """
+    return select(*[getattr(Job, field) for field in Job.FIELDS if field != 'tags'])
+
+def export_query(query, sort='posting_date_desc'):
+    """
+    Order a filtered export_select() query for export
+    """
+    order = asc if sort == 'posting_date_asc' else desc
+    return query.order_by(order(Job.posting_date).nulls_last(), order(Job.id))
+
+def _batches(query):
+    """
+    Stream query from a server-side cursor in batches of EXPORT_BATCH_SIZE
+    rows, so memory use doesn't grow with the table. Yields lists of job
+    dicts, built like the GET /jobs listing's.
+    """
+    result = db.session.execute(query.execution_options(yield_per=EXPORT_BATCH_SIZE)).mappings()
+    for rows in result.partitions():
+        tags_by_job = load_tags([row['id'] for row in rows])
+        yield [row_to_dict(row, Job.FIELDS, tags_by_job) for row in rows]
+
+def iter_ndjson(query):
+    """
+    Yield chunks of newline-delimited JSON, one full job record per line
+    """
+    for jobs in _batches(query):
+        yield b''.join(dumps(job) + b'\n' for job in jobs)
+
+def iter_csv(query):
+    """
+    Yield chunks of CSV with a header row; tags are comma-joined in one column
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(Job.FIELDS)
+    for jobs in _batches(query):
+        for job in jobs:
+            job['tags'] = ','.join(job['tags'])
+            writer.writerow([job[field] for field in Job.FIELDS])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()  # Header only: nothing matched
+
+def iter_export(query, export_format):
+    """
+    Yield the rows of an export_query() as chunks of bytes in export_format
+    """
+    return iter_csv(query) if export_format == 'csv' else iter_ndjson(query)
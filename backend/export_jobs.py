@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Export the job board as NDJSON or CSV.
+
+Streams rows from the database in batches, so large tables export in
+constant memory. Accepts the same filters as GET /jobs, e.g.:
+
+    python export_jobs.py --format csv --tag Pricing --output jobs.csv
+"""
+
+import argparse
+import sys
+from werkzeug.datastructures import MultiDict
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Export jobs as NDJSON or CSV")
+    parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson')
+    parser.add_argument('--output', help="File to write (default: stdout)")
+    parser.add_argument('--job-type')
+    parser.add_argument('--location')
+    parser.add_argument('--tag', action='append', default=[], help="Repeat for several tags")
+    parser.add_argument('--tag-mode', choices=['all', 'any'], default='all')
+    parser.add_argument('--q', help="Full-text search query")
+    parser.add_argument('--sort', choices=['posting_date_desc', 'posting_date_asc'], default='posting_date_desc')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+
+    from db import create_db_app
+    from export import export_query, export_select, iter_export
+    from routes.job_routes import apply_filters
+
+    filters = MultiDict([
+        (name, value) for name, value in [
+            ('job_type', args.job_type), ('location', args.location),
+            ('tag_mode', args.tag_mode), ('q', args.q)
+        ] + [('tag', tag) for tag in args.tag]
+        if value
+    ])
+
+    # Chunks are UTF-8 bytes
+    output = open(args.output, 'wb') if args.output else sys.stdout.buffer
+    try:
+        with create_db_app().app_context():
+            query, _ = apply_filters(export_select(), filters)
+            for chunk in iter_export(export_query(query, args.sort), args.format):
+                output.write(chunk)
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+
+if __name__ == '__main__':
+    main()
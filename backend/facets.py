@@ -0,0 +1,115 @@
+# backend/facets.py
+from collections import Counter
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from db import db
+from models.job import Job
+from models.job_facet import JobFacet
+from models.tag import Tag, JobTag
+
+FACETS = ('job_type', 'location', 'tag')
+
+def facet_values(job_type, location, tags):
+    """
+    The (facet, value) pairs a job is counted under
+    """
+    pairs = [('tag', name) for name in tags]
+    if job_type:
+        pairs.append(('job_type', job_type))
+    if location:
+        pairs.append(('location', location))
+    return pairs
+
+def job_facet_values(job):
+    """
+    The (facet, value) pairs of a Job; near-duplicates aren't counted
+    """
+    if job.duplicate_of:
+        return []
+    return facet_values(job.job_type, job.location, job.tags)
+
+def apply_facet_changes(changes):
+    """
+    Update job_facet for many written jobs with one statement. changes holds
+    (before, after) lists of facet_values(); before is empty for a created job
+    and after for a deleted one. Call in the transaction of the write.
+    """
+    delta = Counter()
+    for before, after in changes:
+        delta.update(after)
+        delta.subtract(before)
+    rows = [{'facet': facet, 'value': value, 'count': count} for (facet, value), count in delta.items() if count]
+    if not rows:
+        return
+
+    dialect_insert = postgresql.insert if db.engine.dialect.name == 'postgresql' else sqlite.insert
+    statement = dialect_insert(JobFacet).values(rows)
+    # Adding to the stored count is atomic, so concurrent writers can't lose updates
+    db.session.execute(statement.on_conflict_do_update(
+        index_elements=[JobFacet.facet, JobFacet.value],
+        set_={'count': JobFacet.count + statement.excluded['count']}
+    ))
+    if any(row['count'] < 0 for row in rows):
+        db.session.execute(delete(JobFacet).where(JobFacet.count <= 0))
+
+def _rows_to_facets(rows, limit):
+    facets = {facet: [] for facet in FACETS}
+    for facet, value, count in rows:
+        if len(facets[facet]) < limit:
+            facets[facet].append({'value': value, 'count': count})
+    return facets
+
+def stored_facet_counts(limit):
+    """
+    Facet counts over all jobs, read from job_facet, most common values first
+    """
+    rows = db.session.execute(
+        select(JobFacet.facet, JobFacet.value, JobFacet.count)
+        .where(JobFacet.count > 0)
+        .order_by(JobFacet.facet, JobFacet.count.desc(), JobFacet.value)
+    ).all()
+    return _rows_to_facets(rows, limit)
+
+def grouped_facet_counts(job_ids, limit):
+    """
+    Facet counts over the jobs selected by job_ids (a subquery of ids), with
+    GROUP BY; used when filters are applied
+    """
+    count = func.count().label('count')
+    queries = {
+        'job_type': select(Job.job_type, count).where(Job.id.in_(job_ids), Job.job_type.isnot(None))
+                    .group_by(Job.job_type).order_by(count.desc(), Job.job_type),
+        'location': select(Job.location, count).where(Job.id.in_(job_ids))
+                    .group_by(Job.location).order_by(count.desc(), Job.location),
+        'tag': select(Tag.name, count).join(JobTag, JobTag.tag_id == Tag.id).where(JobTag.job_id.in_(job_ids))
+               .group_by(Tag.name).order_by(count.desc(), Tag.name),
+    }
+    rows = []
+    for facet, query in queries.items():
+        rows += [(facet, value, n) for value, n in db.session.execute(query.limit(limit))]
+    return _rows_to_facets(rows, limit)
+
+def rebuild_facets():
+    """
+    Recompute job_facet from scratch with GROUP BY. Used to backfill it and to
+    repair drift, e.g. after editing jobs directly in the database.
+    """
+    db.session.execute(delete(JobFacet))
+    listed = Job.duplicate_of.is_(None)
+    rows = [
+        ('job_type', value, n) for value, n in db.session.execute(
+            select(Job.job_type, func.count()).where(Job.job_type.isnot(None), listed).group_by(Job.job_type))
+    ] + [
+        ('location', value, n) for value, n in db.session.execute(
+            select(Job.location, func.count()).where(listed).group_by(Job.location))
+    ] + [
+        ('tag', value, n) for value, n in db.session.execute(
+            select(Tag.name, func.count()).join(JobTag, JobTag.tag_id == Tag.id)
+            .join(Job, Job.id == JobTag.job_id).where(listed).group_by(Tag.name))
+    ]
+    if rows:
+        db.session.execute(
+            JobFacet.__table__.insert(),
+            [{'facet': facet, 'value': value, 'count': n} for facet, value, n in rows]
+        )
+    return len(rows)
@@ -0,0 +1,37 @@
+# backend/gunicorn.conf.py
+"""
+Gunicorn settings, overridable from the environment:
+
+    WEB_CONCURRENCY   worker processes (default: 2 per CPU + 1)
+    GUNICORN_THREADS  threads per worker (default: 4)
+    GUNICORN_BIND     address to listen on (default: 0.0.0.0:5000)
+    GUNICORN_TIMEOUT  seconds before a silent worker is restarted (default: 30)
+
+Each worker holds its own connection pool, so keep
+workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) below Postgres max_connections,
+and DB_POOL_SIZE at least GUNICORN_THREADS.
+"""
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+worker_class = 'gthread' if threads > 1 else 'sync'
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+keepalive = 5
+# Import the app once in the master so workers fork with it already loaded
+preload_app = True
+accesslog = '-'
+
+def post_fork(server, worker):
+    """
+    Connections opened by the master (e.g. while preloading) must not be
+    shared with workers. Drop them from each worker's pool without closing
+    them, which would also close them for the master and sibling workers.
+    """
+    from db import db
+    from wsgi import app
+
+    with app.app_context():
+        db.engine.dispose(close=False)
@@ -0,0 +1,295 @@
+# backend/ingest.py
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from classification import classify_jobs
+from db import db
+from dedupe import Posting, find_near_duplicates, index_jobs
+from facets import apply_facet_changes, facet_values
+from models.job import Job
+from models.tag import Tag, JobTag, parse_tags
+
+# Query parameters that identify a click, not a posting
+TRACKING_PARAMS = {'gclid', 'fbclid', 'msclkid', 'ref', 'referrer', 'source', 'src', 'trk'}
+
+# Columns compared to decide whether an upserted job actually changed
+COMPARED_FIELDS = ('title', 'company', 'location', 'posting_date', 'job_type', 'description', 'salary', 'url')
+# Columns near-duplicate detection reads; the index is rebuilt when one changes
+DEDUPE_FIELDS = ('title', 'company', 'location', 'description')
+# Optional columns a listing page may leave out; an upsert without them keeps the stored value
+KEPT_WHEN_MISSING = ('posting_date', 'description', 'salary')
+
+def normalize_url(url):
+    """
+    Canonicalize a posting URL: lowercase scheme and host, drop default ports,
+    fragments, trailing slashes and tracking parameters, and sort the query
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    if parts.port and (parts.scheme, parts.port) not in (('http', 80), ('https', 443)):
+        host = f'{host}:{parts.port}'
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((parts.scheme.lower(), host, parts.path.rstrip('/'), urlencode(query), ''))
+
+def natural_key(url, title=None, company=None):
+    """
+    Build the unique dedupe key for a job: its normalized URL or, when there
+    is no URL and title/company are given, "title|company" lowercased
+    """
+    if url:
+        return normalize_url(url)[:500]
+    if title and company:
+        return f"{title.strip().lower()}|{company.strip().lower()}"[:500]
+    return None
+
+def job_values(data):
+    """
+    Build Job column values from validated request data (tags excluded).
+    posting_date is None when not given; writers date new jobs today.
+    """
+    def optional(field):
+        return data[field].strip() if data.get(field) else None
+
+    url = optional('url')
+    return {
+        'title': data['title'].strip(),
+        'company': data['company'].strip(),
+        'location': data['location'].strip(),
+        'posting_date': datetime.strptime(data['posting_date'], '%Y-%m-%d') if data.get('posting_date') else None,
+        'job_type': optional('job_type'),
+        'description': optional('description'),
+        'salary': optional('salary'),
+        'url': url,
+        'natural_key': natural_key(url),
+    }
+
+def classify_batch(batch):
+    """
+    Classify a batch of (values, tags) pairs in one pass per job: fills in
+    job_type where it is missing and adds the inferred seniority and keyword
+    tags. Jobs with nothing inferred keep tags as given (None stays None).
+    """
+    results = classify_jobs(
+        (values['title'], values['description'], parse_tags(tags)) for values, tags in batch
+    )
+    classified = []
+    for (values, tags), result in zip(batch, results):
+        if not values['job_type']:
+            values = {**values, 'job_type': result.job_type}
+        inferred = ([result.seniority] if result.seniority else []) + result.tags
+        if inferred:
+            tags = parse_tags(parse_tags(tags) + inferred)
+        classified.append((values, tags))
+    return classified
+
+def _replace_tags(tags_by_job):
+    """
+    Replace the tags of many jobs at once with two set-based statements.
+    Returns the {lowercased name: Tag} map of the tags used.
+    """
+    if not tags_by_job:
+        return {}
+    tags = Tag.get_or_create_many({name for names in tags_by_job.values() for name in names})
+    db.session.flush()
+
+    db.session.execute(delete(JobTag).where(JobTag.job_id.in_(list(tags_by_job))))
+    links = [
+        {'job_id': job_id, 'tag_id': tags[name.lower()].id, 'position': position}
+        for job_id, names in tags_by_job.items()
+        for position, name in enumerate(names)
+    ]
+    if links:
+        db.session.execute(insert(JobTag), links)
+    return tags
+
+def _load_existing(keys):
+    """
+    Fetch id, compared columns and tag names of the jobs with the given natural
+    keys, as {natural_key: row dict}
+    """
+    if not keys:
+        return {}
+    rows = db.session.execute(
+        select(Job.id, Job.natural_key, Job.duplicate_of, *[getattr(Job, field) for field in COMPARED_FIELDS])
+        .where(Job.natural_key.in_(keys))
+    ).mappings().all()
+    existing = {row['natural_key']: {**row, 'tags': []} for row in rows}
+
+    by_id = {row['id']: row['natural_key'] for row in rows}
+    if by_id:
+        tag_rows = db.session.execute(
+            select(JobTag.job_id, Tag.name).join(Tag, Tag.id == JobTag.tag_id)
+            .where(JobTag.job_id.in_(list(by_id))).order_by(JobTag.job_id, JobTag.position)
+        ).all()
+        for job_id, name in tag_rows:
+            existing[by_id[job_id]]['tags'].append(name)
+    return existing
+
+def _upsert_statement(values, update=True):
+    """
+    Multi-row INSERT ... ON CONFLICT (natural_key) DO UPDATE for the current
+    dialect, or DO NOTHING without update: rows that lose the race to a
+    concurrent writer then return nothing.
+    """
+    dialect_insert = postgresql.insert if db.engine.dialect.name == 'postgresql' else sqlite.insert
+    statement = dialect_insert(Job).values(values)
+    if not update:
+        statement = statement.on_conflict_do_nothing(index_elements=[Job.natural_key])
+    else:
+        updated = {field: statement.excluded[field] for field in COMPARED_FIELDS}
+        updated['updated_at'] = datetime.utcnow()
+        statement = statement.on_conflict_do_update(index_elements=[Job.natural_key], set_=updated)
+    return statement.returning(Job.id, Job.natural_key)
+
+def _keep_missing(values, current):
+    """
+    values with the KEPT_WHEN_MISSING columns it leaves empty filled in from
+    current, the existing job's row (or None)
+    """
+    missing = [field for field in KEPT_WHEN_MISSING if values[field] is None]
+    if not current or not missing:
+        return values
+    return {**values, **{field: current[field] for field in missing}}
+
+def write_job_batch(batch, upsert=False, ignore_fields=(), merge_near_duplicates=False):
+    """
+    Write a batch of (values, tags) pairs, where values come from job_values().
+    Tags may be None to leave an existing job's tags untouched.
+
+    Existing jobs are found with one query on natural_key. Without upsert,
+    they are reported as 'duplicate' and skipped; new jobs are written with
+    INSERT ... ON CONFLICT DO NOTHING, so one inserted concurrently is also
+    reported as 'duplicate'. With upsert, they are
+    written with INSERT ... ON CONFLICT DO UPDATE, or skipped as 'unchanged'
+    when no compared field (minus ignore_fields) or tag differs. When a key
+    repeats within the batch, the first item wins without upsert and the
+    last item wins with it. Upserts never clear KEPT_WHEN_MISSING columns:
+    a None there keeps the existing job's value. New jobs without a
+    posting_date are dated now. With merge_near_duplicates, new jobs that are
+    near-duplicates of a listed job or of an earlier new job in the batch
+    (see dedupe.py) are not written and report that job's id.
+
+    Returns a list of (job_id, status) in batch order, status being one of
+    'created', 'updated', 'unchanged', 'duplicate' or 'merged'. Facet counts
+    and the near-duplicate index are updated for created and updated jobs.
+    Does not commit.
+    """
+    now = datetime.utcnow()
+    existing = _load_existing({values['natural_key'] for values, _ in batch if values['natural_key']})
+    if upsert:
+        batch = [(_keep_missing(values, existing.get(values['natural_key'])), tags) for values, tags in batch]
+    last_index = {values['natural_key']: index for index, (values, _) in enumerate(batch) if values['natural_key']}
+
+    statuses = []
+    seen = set()
+    for index, (values, tags) in enumerate(batch):
+        key = values['natural_key']
+        current = existing.get(key)
+        if key and not upsert and (current or key in seen):
+            status = 'duplicate'
+        elif key and upsert and last_index[key] != index:
+            status = None  # Superseded by a later item with the same key
+        elif current is None:
+            status = 'created'
+        elif any(values[field] != current[field] for field in COMPARED_FIELDS if field not in ignore_fields) \
+                or (tags is not None and parse_tags(tags) != current['tags']):
+            status = 'updated'
+        else:
+            status = 'unchanged'
+        seen.add(key)
+        statuses.append(status)
+
+    def needs_index(values, status):
+        if status == 'created':
+            return True
+        current = existing.get(values['natural_key'])
+        return status == 'updated' and not current['duplicate_of'] and \
+            any(values[field] != current[field] for field in DEDUPE_FIELDS)
+
+    postings = {
+        index: Posting.from_values(values)
+        for index, ((values, _), status) in enumerate(zip(batch, statuses)) if needs_index(values, status)
+    }
+    merged_into = {}
+    if merge_near_duplicates:
+        created = [index for index, status in enumerate(statuses) if status == 'created']
+        for index, match in zip(created, find_near_duplicates([postings[index] for index in created])):
+            if match:
+                kind, target = match
+                merged_into[index] = target if kind == 'job' else None, created[target] if kind == 'batch' else None
+                statuses[index] = 'merged'
+                del postings[index]
+
+    to_insert, to_upsert = [], []
+    for (values, tags), status in zip(batch, statuses):
+        key = values['natural_key']
+        row = {**values, 'created_at': now, 'updated_at': now}
+        if status == 'created' and row['posting_date'] is None:
+            row['posting_date'] = now
+        if status == 'created' and not key:
+            to_insert.append(row)
+        elif status in ('created', 'updated'):
+            to_upsert.append(row)
+
+    ids_by_key = {key: row['id'] for key, row in existing.items()}
+    new_ids = []
+    if to_insert:
+        new_ids = db.session.execute(
+            insert(Job).returning(Job.id, sort_by_parameter_order=True), to_insert
+        ).scalars().all()
+    if to_upsert:
+        written = set()
+        for job_id, key in db.session.execute(_upsert_statement(to_upsert, update=upsert)).all():
+            ids_by_key[key] = job_id
+            written.add(key)
+        # Without upsert, a job inserted by another writer since _load_existing is a duplicate
+        lost = {row['natural_key'] for row in to_upsert} - written
+        if lost:
+            ids_by_key.update(db.session.execute(
+                select(Job.natural_key, Job.id).where(Job.natural_key.in_(list(lost)))
+            ).all())
+            for index, (values, _) in enumerate(batch):
+                if statuses[index] == 'created' and values['natural_key'] in lost:
+                    statuses[index] = 'duplicate'
+                    postings.pop(index, None)
+
+    results = []
+    tags_by_job = {}
+    new_ids = iter(new_ids)
+    for index, ((values, tags), status) in enumerate(zip(batch, statuses)):
+        key = values['natural_key']
+        if status == 'merged':
+            target_id, target_index = merged_into[index]
+            job_id = target_id if target_id else results[target_index][0]
+        else:
+            job_id = ids_by_key.get(key) if key else next(new_ids)
+        if status in ('created', 'updated') and tags is not None:
+            tags_by_job[job_id] = parse_tags(tags)
+        results.append((job_id, status))
+    tags = _replace_tags(tags_by_job)
+    index_jobs({results[index][0]: posting for index, posting in postings.items()})
+
+    facet_changes = []
+    for (values, _), (job_id, status) in zip(batch, results):
+        if status not in ('created', 'updated'):
+            continue
+        current = existing.get(values['natural_key']) if status == 'updated' else None
+        if current and current['duplicate_of']:
+            continue  # Near-duplicates aren't counted
+        if job_id in tags_by_job:
+            names = [tags[name.lower()].name for name in tags_by_job[job_id]]
+        else:
+            names = current['tags'] if current else []
+        before = facet_values(current['job_type'], current['location'], current['tags']) if current else []
+        facet_changes.append((before, facet_values(values['job_type'], values['location'], names)))
+    apply_facet_changes(facet_changes)
+
+    # Superseded items report the outcome of the item that replaced them
+    return [
+        result if result[1] else results[last_index[values['natural_key']]]
+        for (values, _), result in zip(batch, results)
+    ]
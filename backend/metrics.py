@@ -0,0 +1,172 @@
+# backend/metrics.py
+import os
+import threading
+import time
+from bisect import bisect_left
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from db import db
+
+# Upper bounds of the histogram buckets; +Inf is implied
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+def _labels(names, values):
+    # Read at render time: gunicorn forks workers after the app is loaded
+    worker = f'worker="{os.getpid()}"'
+    return ','.join([worker] + [f'{name}="{value}"' for name, value in zip(names, values)])
+
+class Histogram:
+    """
+    Cumulative histogram per label set, rendered in the Prometheus text format
+    """
+    def __init__(self, name, help, label_names, buckets):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self._series.items()):
+                label_text = _labels(self.label_names, labels)
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + ('+Inf',), counts):
+                    cumulative += bucket_count
+                    lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+                lines.append(f'{self.name}_sum{{{label_text}}} {total}')
+                lines.append(f'{self.name}_count{{{label_text}}} {count}')
+        return lines
+
+class Counter:
+    def __init__(self, name, help, label_names):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{{{_labels(self.label_names, labels)}}} {value}')
+        return lines
+
+class Metrics:
+    """
+    Per-process request instrumentation. Records latency, status, response
+    size and SQL query count/time for every request, adds a Server-Timing
+    header, and serves everything on /metrics in the Prometheus text format.
+    Numbers are not shared between worker processes: /metrics reports only
+    the worker that answers it, labelled with its pid as worker="...", so
+    samples from different workers land in separate series instead of
+    looking like counter resets. Totals across workers are only complete
+    when every worker is scraped.
+    """
+    def __init__(self):
+        self.request_latency = Histogram(
+            'http_request_duration_seconds', 'Time spent handling requests',
+            ('method', 'endpoint'), LATENCY_BUCKETS)
+        self.requests = Counter(
+            'http_requests_total', 'Requests handled', ('method', 'endpoint', 'status'))
+        self.response_size = Histogram(
+            'http_response_size_bytes', 'Size of response bodies (streamed responses excluded)',
+            ('method', 'endpoint'), SIZE_BUCKETS)
+        self.request_queries = Histogram(
+            'http_request_db_queries', 'SQL statements executed per request',
+            ('method', 'endpoint'), QUERY_COUNT_BUCKETS)
+        self.request_db_time = Histogram(
+            'http_request_db_duration_seconds', 'Time spent in SQL statements per request',
+            ('method', 'endpoint'), LATENCY_BUCKETS)
+        self._listening = False
+
+    def init_app(self, app):
+        if not app.config.get('METRICS_ENABLED', True):
+            return
+        if not self._listening:
+            # Engine-level listeners cover every engine, including ones created after this
+            event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+            self._listening = True
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if has_request_context():
+            conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if has_request_context() and conn.info.get('query_start'):
+            elapsed = time.perf_counter() - conn.info['query_start'].pop()
+            g.db_queries = g.get('db_queries', 0) + 1
+            g.db_time = g.get('db_time', 0.0) + elapsed
+
+    def _before_request(self):
+        g.request_start = time.perf_counter()
+
+    def _after_request(self, response):
+        elapsed = time.perf_counter() - g.pop('request_start', time.perf_counter())
+        queries = g.get('db_queries', 0)
+        db_time = g.get('db_time', 0.0)
+        labels = (request.method, request.url_rule.rule if request.url_rule else 'unmatched')
+
+        self.request_latency.observe(labels, elapsed)
+        self.requests.inc(labels + (str(response.status_code),))
+        self.request_queries.observe(labels, queries)
+        self.request_db_time.observe(labels, db_time)
+        if not response.is_streamed:
+            self.response_size.observe(labels, response.calculate_content_length() or 0)
+
+        response.headers.add(
+            'Server-Timing', f'db;dur={db_time * 1000:.1f};desc="{queries} queries", app;dur={elapsed * 1000:.1f}'
+        )
+        return response
+
+    def pool_lines(self):
+        """
+        Gauges for the connection pool of the current app's engine. Pools
+        without these counters (SQLite's in-memory pool) are skipped.
+        """
+        pool = db.engine.pool
+        gauges = [
+            ('db_pool_size', 'Connections the pool keeps open', 'size'),
+            ('db_pool_checked_out', 'Connections currently in use', 'checkedout'),
+            ('db_pool_checked_in', 'Idle connections in the pool', 'checkedin'),
+            ('db_pool_overflow', 'Connections open beyond the pool size (negative until the pool is full)', 'overflow'),
+        ]
+        lines = []
+        for name, help, method in gauges:
+            if hasattr(pool, method):
+                lines += [f'# HELP {name} {help}', f'# TYPE {name} gauge',
+                          f'{name}{{{_labels((), ())}}} {getattr(pool, method)()}']
+        return lines
+
+    def metrics_view(self):
+        lines = []
+        for metric in (self.request_latency, self.requests, self.response_size,
+                       self.request_queries, self.request_db_time):
+            lines += metric.render()
+        lines += self.pool_lines()
+        return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
+
+metrics = Metrics()
@@ -0,0 +1,159 @@
+# backend/migrations.py
+from sqlalchemy import inspect, text
+from db import db
+from models.job import Job
+from models.tag import Tag, JobTag, parse_tags
+
+def migrate_legacy_tags(batch_size=500):
+    """
+    Move tags from the old comma-separated job.tags column into the job_tag
+    join table. Migrated rows have the legacy column cleared, so this is safe
+    to run repeatedly. Returns the number of jobs migrated.
+    """
+    columns = {column['name'] for column in inspect(db.engine).get_columns('job')}
+    if 'tags' not in columns:
+        return 0
+
+    rows = db.session.execute(text(
+        "SELECT id, tags FROM job WHERE tags IS NOT NULL AND tags <> '' ORDER BY id"
+    )).all()
+
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        names_by_job = {job_id: parse_tags(tags) for job_id, tags in batch}
+        tags = Tag.get_or_create_many({name for names in names_by_job.values() for name in names})
+        db.session.flush()
+
+        for job_id, names in names_by_job.items():
+            db.session.add_all([
+                JobTag(job_id=job_id, tag_id=tags[name.lower()].id, position=position)
+                for position, name in enumerate(names)
+            ])
+        db.session.execute(
+            text("UPDATE job SET tags = NULL WHERE id IN :ids").bindparams(
+                db.bindparam('ids', expanding=True)
+            ),
+            {'ids': list(names_by_job)}
+        )
+        db.session.commit()
+
+    return len(rows)
+
+def add_natural_key(batch_size=500):
+    """
+    Add and backfill job.natural_key on databases created before it existed.
+    Rows whose URL duplicates an earlier job keep a NULL key. Returns the
+    number of rows backfilled.
+    """
+    from ingest import natural_key
+
+    columns = {column['name'] for column in inspect(db.engine).get_columns('job')}
+    if 'natural_key' not in columns:
+        db.session.execute(text("ALTER TABLE job ADD COLUMN natural_key VARCHAR(500)"))
+        db.session.commit()
+
+    taken = set(db.session.execute(
+        text("SELECT natural_key FROM job WHERE natural_key IS NOT NULL")
+    ).scalars())
+    rows = db.session.execute(text(
+        "SELECT id, url FROM job WHERE natural_key IS NULL AND url IS NOT NULL AND url <> '' ORDER BY id"
+    )).all()
+
+    updates = []
+    for job_id, url in rows:
+        key = natural_key(url)
+        if key not in taken:
+            taken.add(key)
+            updates.append({'id': job_id, 'key': key})
+
+    for start in range(0, len(updates), batch_size):
+        db.session.execute(
+            text("UPDATE job SET natural_key = :key WHERE id = :id"),
+            updates[start:start + batch_size]
+        )
+        db.session.commit()
+    return len(updates)
+
+def add_duplicate_of():
+    """
+    Add job.duplicate_of on databases created before near-duplicate detection
+    """
+    columns = {column['name'] for column in inspect(db.engine).get_columns('job')}
+    if 'duplicate_of' not in columns:
+        db.session.execute(text("ALTER TABLE job ADD COLUMN duplicate_of INTEGER REFERENCES job (id) ON DELETE SET NULL"))
+        db.session.commit()
+
+def backfill_lsh_index(batch_size=1000):
+    """
+    Fill job_lsh_band for jobs written before it existed. Existing jobs are
+    indexed as they are, not checked against each other. Returns the number
+    of jobs indexed.
+    """
+    from dedupe import Posting, index_jobs
+    from models.job_lsh_band import JobLshBand
+    if db.session.query(JobLshBand.job_id).first():
+        return 0
+
+    indexed, last_id = 0, 0
+    while True:
+        rows = db.session.execute(
+            db.select(Job.id, Job.title, Job.company, Job.location, Job.description)
+            .where(Job.id > last_id, Job.duplicate_of.is_(None)).order_by(Job.id).limit(batch_size)
+        ).all()
+        if not rows:
+            return indexed
+        index_jobs({row.id: Posting(row.title, row.company, row.location, row.description) for row in rows})
+        db.session.commit()
+        indexed += len(rows)
+        last_id = rows[-1].id
+
+def ensure_indexes():
+    """
+    Create indexes declared on models after their tables already existed
+    """
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+
+def seed_table_versions():
+    """
+    Create the table_version rows up front so concurrent first writes only
+    ever UPDATE them
+    """
+    from models.table_version import TableVersion
+    if not db.session.get(TableVersion, 'job'):
+        db.session.add(TableVersion(name='job', version=0))
+        db.session.commit()
+
+def backfill_facets():
+    """
+    Fill job_facet on databases created before it existed. Returns the
+    number of facet rows written.
+    """
+    from facets import rebuild_facets
+    from models.job_facet import JobFacet
+    if db.session.query(JobFacet.facet).first() or not db.session.query(Job.id).first():
+        return 0
+    written = rebuild_facets()
+    db.session.commit()
+    return written
+
+def run_migrations():
+    """
+    Apply data migrations for schema changes that create_all() cannot handle
+    """
+    migrated = migrate_legacy_tags()
+    if migrated:
+        print(f"Migrated tags for {migrated} jobs into job_tag")
+    backfilled = add_natural_key()
+    if backfilled:
+        print(f"Backfilled natural_key for {backfilled} jobs")
+    add_duplicate_of()
+    ensure_indexes()
+    seed_table_versions()
+    facets = backfill_facets()
+    if facets:
+        print(f"Backfilled {facets} facet counts")
+    indexed = backfill_lsh_index()
+    if indexed:
+        print(f"Indexed {indexed} jobs for near-duplicate detection")
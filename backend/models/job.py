@@ -1,32 +1,79 @@
 from db import db
 from datetime import datetime
+from models.tag import Tag, JobTag, parse_tags
+from serializers import serialize_value
 
 class Job(db.Model):
+    __table_args__ = (
+        # Backs keyset pagination on GET /jobs, which orders by (posting_date, id)
+        db.Index('ix_job_posting_date_id', 'posting_date', 'id'),
+        # Undated jobs sort last both ways. SQLite puts NULLs first in ascending
+        # indexes, so the index above serves the newest-first order backwards;
+        # Postgres puts them last, and needs a descending index for it
+        db.Index(
+            'ix_job_posting_date_desc_id', db.desc('posting_date').nulls_last(), db.desc('id')
+        ).ddl_if(dialect='postgresql'),
+        # Never reuse the id of a deleted or archived job; Postgres sequences never do
+        {'sqlite_autoincrement': True},
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     company = db.Column(db.String(200), nullable=False)
     location = db.Column(db.String(200), nullable=False)
     posting_date = db.Column(db.DateTime, default=datetime.utcnow)
     job_type = db.Column(db.String(100), nullable=True)  # Full-time, Part-time, etc.
-    tags = db.Column(db.String(500))  # Comma-separated string: "Life,Health,Pricing"
     description = db.Column(db.Text)
     salary = db.Column(db.String(100))
     url = db.Column(db.String(500))
+    # Dedupe key: the normalized url, or title+company for scraped jobs without one
+    natural_key = db.Column(db.String(500), unique=True, index=True)
+    # Set on a job found to be a near-duplicate of another (see dedupe.py); such jobs are not listed
+    duplicate_of = db.Column(db.Integer, db.ForeignKey('job.id', ondelete='SET NULL'), index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'company': self.company,
-            'location': self.location,
-            'posting_date': self.posting_date.isoformat() if self.posting_date else None,
-            'job_type': self.job_type,
-            'tags': self.tags.split(',') if self.tags else [],
-            'description': self.description,
-            'salary': self.salary,
-            'url': self.url,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
-        }
+    # Tags live in the indexed job_tag join table; use the tags property to read/write names
+    tag_links = db.relationship(
+        'JobTag', order_by='JobTag.position', lazy='selectin', cascade='all, delete-orphan'
+    )
+
+    @property
+    def tags(self):
+        return [link.tag.name for link in self.tag_links]
+
+    @tags.setter
+    def tags(self, value):
+        """
+        Accepts a list of names or a comma-separated string ("Life,Health,Pricing")
+        """
+        names = parse_tags(value)
+        tags = Tag.get_or_create_many(names)
+        # Reuse existing links so unchanged tags are not deleted and re-inserted
+        existing = {link.tag.name.lower(): link for link in self.tag_links}
+        links = []
+        for position, name in enumerate(names):
+            link = existing.get(name.lower()) or JobTag(tag=tags[name.lower()])
+            link.position = position
+            links.append(link)
+        self.tag_links = links
+
+    # Fields returned by to_dict(), in response order
+    FIELDS = (
+        'id', 'title', 'company', 'location', 'posting_date', 'job_type', 'tags',
+        'description', 'salary', 'url', 'created_at', 'updated_at'
+    )
+    # Lightweight shape used for list pages: everything a job card needs,
+    # without the potentially large description
+    SUMMARY_FIELDS = (
+        'id', 'title', 'company', 'location', 'posting_date', 'job_type', 'tags',
+        'salary', 'url'
+    )
+
+    def to_dict(self, fields=None):
+        """
+        Serialize the job. Only the requested fields are read, so columns
+        deferred by the query are never lazy-loaded. serializers.row_to_dict
+        builds the same dict from Core rows.
+        """
+        return {field: serialize_value(getattr(self, field)) for field in fields or self.FIELDS}
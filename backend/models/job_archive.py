@@ -0,0 +1,42 @@
+from db import db
+from datetime import datetime
+from models.tag import parse_tags
+from serializers import serialize_value
+
+class JobArchive(db.Model):
+    """
+    Jobs moved out of the job table by the retention policy (see
+    archive.archive_stale_jobs), so listings, filters and search only scan
+    recent postings. Rows keep their job id; tags are stored inline as a
+    comma-separated string, since archived jobs are only read.
+    """
+    __tablename__ = 'job_archive'
+    __table_args__ = (
+        db.Index('ix_job_archive_posting_date_id', 'posting_date', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(200), nullable=False)
+    company = db.Column(db.String(200), nullable=False)
+    location = db.Column(db.String(200), nullable=False)
+    posting_date = db.Column(db.DateTime)
+    job_type = db.Column(db.String(100), nullable=True)
+    description = db.Column(db.Text)
+    salary = db.Column(db.String(100))
+    url = db.Column(db.String(500))
+    natural_key = db.Column(db.String(500), index=True)
+    tags = db.Column(db.Text)
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self, fields):
+        """
+        Serialize like Job.to_dict, with archived set
+        """
+        data = {
+            field: parse_tags(self.tags) if field == 'tags' else serialize_value(getattr(self, field))
+            for field in fields
+        }
+        data['archived'] = True
+        return data
@@ -0,0 +1,13 @@
+from db import db
+
+class JobFacet(db.Model):
+    """
+    Number of jobs per job_type, location and tag. Kept up to date by every
+    write to job (see facets.apply_facet_changes), so facet counts are read
+    without scanning the job table.
+    """
+    __tablename__ = 'job_facet'
+
+    facet = db.Column(db.String(20), primary_key=True)  # 'job_type', 'location' or 'tag'
+    value = db.Column(db.String(200), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
@@ -0,0 +1,12 @@
+from db import db
+
+class JobLshBand(db.Model):
+    """
+    Locality-sensitive hashing index for near-duplicate detection: one row
+    per MinHash band of every listed job (see dedupe.py). Jobs sharing a
+    bucket are candidate duplicates, found with one indexed lookup.
+    """
+    __tablename__ = 'job_lsh_band'
+
+    bucket = db.Column(db.BigInteger, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id', ondelete='CASCADE'), primary_key=True, index=True)
@@ -0,0 +1,53 @@
+from db import db
+from datetime import datetime
+from serializers import serialize_value
+
+class ScrapeRun(db.Model):
+    """
+    A background scrape of one source, queued through POST /scrape-runs and
+    updated by the worker process as it goes. active_source holds the source
+    while the run is queued or running and is cleared when it finishes; being
+    unique, it allows one active run per source across every web worker.
+    """
+    __tablename__ = 'scrape_run'
+
+    id = db.Column(db.Integer, primary_key=True)
+    source = db.Column(db.String(50), nullable=False, index=True)
+    active_source = db.Column(db.String(50), unique=True)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, succeeded, failed
+    max_pages = db.Column(db.Integer, nullable=False)
+    max_jobs = db.Column(db.Integer)  # NULL for no limit
+    full = db.Column(db.Boolean, nullable=False, default=False)
+
+    # Progress, written by the worker at least every few seconds while running
+    pages_fetched = db.Column(db.Integer, nullable=False, default=0)
+    pages_failed = db.Column(db.Integer, nullable=False, default=0)
+    cards_seen = db.Column(db.Integer, nullable=False, default=0)
+    jobs_created = db.Column(db.Integer, nullable=False, default=0)
+    jobs_updated = db.Column(db.Integer, nullable=False, default=0)
+    jobs_unchanged = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    FIELDS = (
+        'id', 'source', 'status', 'max_pages', 'max_jobs', 'full',
+        'pages_fetched', 'pages_failed', 'cards_seen', 'jobs_created', 'jobs_updated', 'jobs_unchanged',
+        'error', 'created_at', 'started_at', 'heartbeat_at', 'finished_at'
+    )
+
+    def to_dict(self):
+        """
+        Serialize the run, with its elapsed time and throughput so far
+        """
+        data = {field: serialize_value(getattr(self, field)) for field in self.FIELDS}
+        elapsed = None
+        if self.started_at:
+            elapsed = ((self.finished_at or datetime.utcnow()) - self.started_at).total_seconds()
+        data['elapsed_seconds'] = elapsed
+        data['pages_per_sec'] = self.pages_fetched / elapsed if elapsed else None
+        data['jobs_per_sec'] = (self.jobs_created + self.jobs_updated) / elapsed if elapsed else None
+        return data
@@ -0,0 +1,27 @@
+from db import db
+from sqlalchemy import insert, select, update
+
+class TableVersion(db.Model):
+    """
+    A counter per table, bumped in the same transaction as every write to it.
+    Cached responses are keyed by it, so a bump invalidates them in every
+    process, including writes made by the scraper.
+    """
+    __tablename__ = 'table_version'
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+def get_table_version(name):
+    version = db.session.execute(select(TableVersion.version).where(TableVersion.name == name)).scalar()
+    return version or 0
+
+def bump_table_version(name):
+    """
+    Increment the version of a table. Call before committing a write to it.
+    """
+    result = db.session.execute(
+        update(TableVersion).where(TableVersion.name == name).values(version=TableVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        db.session.execute(insert(TableVersion).values(name=name, version=1))
@@ -0,0 +1,72 @@
+from db import db
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+def parse_tags(value):
+    """
+    Normalize a list or comma-separated string of tags into a de-duplicated
+    list of names, preserving order
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+
+    names = []
+    seen = set()
+    for name in value:
+        name = str(name).strip()
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+    return names
+
+class Tag(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False, unique=True)
+
+    @classmethod
+    def get_or_create_many(cls, names):
+        """
+        Return a {lowercased name: Tag} map for names, creating missing tags.
+        Names are matched case-insensitively so "life" reuses "Life".
+        """
+        wanted = {name.lower(): name for name in names}
+        if not wanted:
+            return {}
+
+        def load():
+            rows = cls.query.filter(func.lower(cls.name).in_(list(wanted))).all()
+            return {tag.name.lower(): tag for tag in rows}
+
+        tags = load()
+        missing = [name for key, name in wanted.items() if key not in tags]
+        if missing:
+            try:
+                with db.session.begin_nested():
+                    for name in missing:
+                        tag = cls(name=name)
+                        db.session.add(tag)
+                        tags[name.lower()] = tag
+            except IntegrityError:
+                # Another writer created some of these tags concurrently
+                tags = load()
+                for name in missing:
+                    if name.lower() not in tags:
+                        tag = cls(name=name)
+                        db.session.add(tag)
+                        tags[name.lower()] = tag
+        return tags
+
+class JobTag(db.Model):
+    __tablename__ = 'job_tag'
+    __table_args__ = (
+        # Tag filters look up jobs by tag; the primary key covers lookups by job
+        db.Index('ix_job_tag_tag_id_job_id', 'tag_id', 'job_id'),
+    )
+
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id', ondelete='CASCADE'), primary_key=True)
+    tag_id = db.Column(db.Integer, db.ForeignKey('tag.id', ondelete='CASCADE'), primary_key=True)
+    position = db.Column(db.Integer, nullable=False, default=0)  # Keeps tags in submitted order
+
+    tag = db.relationship('Tag', lazy='joined')
@@ -1,8 +1,22 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from models.job import Job
+from models.job_archive import JobArchive
+from models.tag import Tag, JobTag, parse_tags
+from models.table_version import bump_table_version
 from db import db
-from sqlalchemy import desc, asc
+from cache import response_cache, json_response
+from search import apply_search
+from ingest import classify_batch, job_values, natural_key, write_job_batch
+from export import EXPORT_FORMATS, export_query, export_select, iter_export
+from archive import with_archived_jobs
+from dedupe import Posting, find_near_duplicates, index_jobs, release_duplicates, unindex_jobs
+from facets import apply_facet_changes, grouped_facet_counts, job_facet_values, stored_facet_counts
+from serializers import dumps, load_tags, row_to_dict
+from sqlalchemy import desc, asc, and_, or_, exists, func, select
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime
+import base64
+import json
 import logging
 
 # Set up logging
@@ -11,6 +25,131 @@ logger = logging.getLogger(__name__)
 
 job_bp = Blueprint('job_routes', __name__)
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+SORT_OPTIONS = ('posting_date_desc', 'posting_date_asc', 'relevance')
+MAX_BULK_ITEMS = 10000
+BULK_BATCH_SIZE = 500
+
+def encode_cursor(key, job_id):
+    """
+    Build an opaque cursor from the sort key of the last job on a page:
+    its posting_date (which may be None), or its relevance score when
+    ordering search results
+    """
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    return base64.urlsafe_b64encode(json.dumps([key, job_id]).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor, sort):
+    """
+    Decode a cursor produced by encode_cursor for the given sort order,
+    raising ValueError if it is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        key, job_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if sort == 'relevance':
+            key = float(key)
+        elif key is not None:
+            key = datetime.fromisoformat(key)
+        return key, int(job_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def after_cursor(sort_key, id_key, cursor_key, cursor_id, descending):
+    """
+    Condition selecting the rows after (cursor_key, cursor_id) in the order
+    (sort_key, id_key), both descending or both ascending, with NULL sort
+    keys last in either direction
+    """
+    later = id_key < cursor_id if descending else id_key > cursor_id
+    if cursor_key is None:
+        return and_(sort_key.is_(None), later)
+    beyond = sort_key < cursor_key if descending else sort_key > cursor_key
+    return or_(beyond, and_(sort_key == cursor_key, later), sort_key.is_(None))
+
+def parse_fields(value):
+    """
+    Resolve the ?fields= projection for list responses. Defaults to the summary
+    shape; 'all' selects every field. id is always included.
+    """
+    if not value:
+        return Job.SUMMARY_FIELDS
+    if value == 'all':
+        return Job.FIELDS
+    requested = {field.strip() for field in value.split(',') if field.strip()}
+    unknown = requested - set(Job.FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+    requested.add('id')
+    return tuple(field for field in Job.FIELDS if field in requested)
+
+def filter_by_tags(query, tags, mode='all'):
+    """
+    Restrict query to jobs carrying all (or, with mode='any', at least one) of
+    the given tags. Names match case-insensitively against the job_tag index.
+    """
+    lowered = [tag.lower() for tag in tags]
+    if mode == 'any':
+        tag_ids = select(Tag.id).where(func.lower(Tag.name).in_(lowered))
+        return query.filter(exists().where(JobTag.job_id == Job.id, JobTag.tag_id.in_(tag_ids)))
+
+    for name in lowered:
+        tag_id = select(Tag.id).where(func.lower(Tag.name) == name).scalar_subquery()
+        query = query.filter(exists().where(JobTag.job_id == Job.id, JobTag.tag_id == tag_id))
+    return query
+
+def apply_filters(query, args):
+    """
+    Apply the job_type, location, tag/tag_mode and q filters shared by the
+    listing and export endpoints. Returns (query, score), score being the
+    search relevance expression or None without ?q=. Jobs flagged as
+    near-duplicates of another are always left out.
+    """
+    tag_mode = args.get('tag_mode', 'all')
+    if tag_mode not in ('all', 'any'):
+        raise ValueError("tag_mode must be 'all' or 'any'")
+
+    job_type = args.get('job_type')
+    location = args.get('location')
+    # ?tag=Life&tag=Pricing or ?tag=Life,Pricing
+    tags = parse_tags([name for value in args.getlist('tag') for name in value.split(',')])
+    q = args.get('q', '').strip()
+
+    query = query.filter(Job.duplicate_of.is_(None))
+    if job_type:
+        query = query.filter(Job.job_type == job_type)
+    if location:
+        query = query.filter(Job.location.ilike(f'%{location}%'))
+    if tags:
+        query = filter_by_tags(query, tags, tag_mode)
+
+    score = None
+    if q:
+        query, score = apply_search(query, q)
+    return query, score
+
+def parse_limit(value):
+    """
+    Parse the page size, clamped to MAX_PAGE_SIZE
+    """
+    if value is None:
+        return DEFAULT_PAGE_SIZE
+    limit = int(value)
+    if limit <= 0:
+        raise ValueError("limit must be a positive integer")
+    return min(limit, MAX_PAGE_SIZE)
+
+def job_response(job):
+    """
+    Job.to_dict(), plus duplicate_of for a job flagged as a near-duplicate
+    """
+    data = job.to_dict()
+    if job.duplicate_of:
+        data['duplicate_of'] = job.duplicate_of
+    return data
+
 def validate_job_data(data, required_fields):
     """
     Validate job data and return errors if any
@@ -40,6 +179,9 @@ def validate_job_data(data, required_fields):
     
     if data.get('url') and len(str(data['url']).strip()) > 500:
         errors['url'] = "URL must be 500 characters or less"
+
+    if data.get('tags') and any(len(tag) > 100 for tag in parse_tags(data['tags'])):
+        errors['tags'] = "Each tag must be 100 characters or less"
     
     # Validate posting_date format if provided
     if data.get('posting_date'):
@@ -53,37 +195,175 @@ def validate_job_data(data, required_fields):
 @job_bp.route('/jobs', methods=['GET'])
 def get_jobs():
     """
-    Get all jobs with optional filtering and sorting
+    Get a page of jobs with optional filtering and sorting.
+
+    Pages are keyset-paginated on (posting_date, id): pass the returned
+    next_cursor back as ?cursor= to fetch the following page; jobs without a
+    posting_date come last in either direction. Jobs use the
+    summary shape unless ?fields= asks for specific fields (or 'all').
+    Multiple tags are ANDed together, or ORed with ?tag_mode=any.
+    ?q= runs a full-text search over title, company and description, ranked
+    by relevance unless another ?sort= is given. Archived jobs are only
+    listed with ?include_archived=1, marked with archived: true.
     """
     try:
-        query = Job.query
-
-        # Filtering
-        job_type = request.args.get('job_type')
-        location = request.args.get('location')
-        tag = request.args.get('tag')
-
-        if job_type:
-            query = query.filter_by(job_type=job_type)
-        if location:
-            query = query.filter(Job.location.ilike(f'%{location}%'))
-        if tag:
-            query = query.filter(Job.tags.ilike(f'%{tag}%'))
-
-        # Sorting
-        sort = request.args.get('sort', 'posting_date_desc')
-        if sort == 'posting_date_asc':
-            query = query.order_by(asc(Job.posting_date))
+        cache_key = response_cache.key('jobs', 'job', request.args.items(multi=True))
+        cached = response_cache.get(cache_key)
+        if cached:
+            return json_response(*cached, cache_key=cache_key)
+
+        try:
+            limit = parse_limit(request.args.get('limit'))
+        except ValueError:
+            return jsonify({'error': 'limit must be a positive integer'}), 400
+
+        # Search results default to relevance order; everything else to newest first
+        q = request.args.get('q', '').strip()
+        sort = request.args.get('sort') or ('relevance' if q else 'posting_date_desc')
+        if sort == 'relevance' and not q:
+            return jsonify({'error': 'sort=relevance requires a search query (q)'}), 400
+        if sort not in SORT_OPTIONS:
+            sort = 'posting_date_desc'
+
+        cursor = request.args.get('cursor')
+        if cursor:
+            try:
+                cursor_key, cursor_id = decode_cursor(cursor, sort)
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+
+        try:
+            fields = parse_fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        # Read-only listing: select plain rows instead of hydrating ORM objects, and
+        # only the projected columns (id and posting_date are needed for the cursor)
+        columns = ['id', 'posting_date'] + [field for field in fields if field not in ('id', 'posting_date', 'tags')]
+        query = select(*[getattr(Job, field) for field in columns])
+
+        try:
+            query, score = apply_filters(query, request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        include_archived = request.args.get('include_archived', '').lower() in ('1', 'true', 'yes')
+        if include_archived:
+            jobs = with_archived_jobs(query, columns, request.args, score if sort == 'relevance' else None)
+            query, id_key = select(jobs), jobs.c.id
+            score = jobs.c.get('score')
+            posting_key = jobs.c.posting_date
+        else:
+            id_key, posting_key = Job.id, Job.posting_date
+
+        # Sorting, with id as a tie-breaker so the order is total
+        if sort == 'relevance':
+            sort_key, descending = score, True
+            if not include_archived:
+                query = query.add_columns(score.label('score'))
         else:
-            query = query.order_by(desc(Job.posting_date))
+            sort_key, descending = posting_key, sort == 'posting_date_desc'
 
-        jobs = query.all()
-        return jsonify([job.to_dict() for job in jobs]), 200
+        if cursor:
+            query = query.filter(after_cursor(sort_key, id_key, cursor_key, cursor_id, descending))
+        # Undated jobs sort last either way; dialects disagree on the default
+        order = desc if descending else asc
+        query = query.order_by(order(sort_key).nulls_last(), order(id_key))
+
+        # Fetch one extra row to know whether another page exists
+        rows = db.session.execute(query.limit(limit + 1)).mappings().all()
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = encode_cursor(last['score'] if sort == 'relevance' else last['posting_date'], last['id'])
+
+        tags_by_job = {}
+        if 'tags' in fields:
+            tags_by_job = load_tags([row['id'] for row in page if not row.get('archived')])
+            tags_by_job.update((row['id'], parse_tags(row['archived_tags'])) for row in page if row.get('archived'))
+        jobs = [row_to_dict(row, fields, tags_by_job) for row in page]
+        if include_archived:
+            for job, row in zip(jobs, page):
+                job['archived'] = bool(row['archived'])
+        body = dumps({'jobs': jobs, 'next_cursor': next_cursor})
+        return json_response(*response_cache.set(cache_key, body), cache_key=cache_key)
         
     except Exception as e:
         logger.error(f"Error fetching jobs: {str(e)}")
         return jsonify({'error': 'Internal server error occurred while fetching jobs'}), 500
 
+@job_bp.route('/jobs/export', methods=['GET'])
+def export_jobs():
+    """
+    Stream every job matching the GET /jobs filters as NDJSON (default) or
+    CSV (?format=csv). Rows are read from a server-side cursor and sent as
+    they arrive, so exports run in constant memory; records are serialized
+    like the GET /jobs listing's.
+    """
+    try:
+        export_format = request.args.get('format', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({'error': "format must be 'ndjson' or 'csv'"}), 400
+
+        try:
+            query, _ = apply_filters(export_select(), request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        query = export_query(query, request.args.get('sort', 'posting_date_desc'))
+
+        def generate():
+            try:
+                yield from iter_export(query, export_format)
+            except Exception as e:
+                # Headers are already sent, so the client sees a truncated body
+                logger.error(f"Error streaming job export: {str(e)}")
+
+        return Response(
+            stream_with_context(generate()),
+            mimetype=EXPORT_FORMATS[export_format],
+            headers={'Content-Disposition': f'attachment; filename=jobs.{export_format}'}
+        )
+
+    except Exception as e:
+        logger.error(f"Error exporting jobs: {str(e)}")
+        return jsonify({'error': 'Internal server error occurred while exporting jobs'}), 500
+
+@job_bp.route('/jobs/facets', methods=['GET'])
+def get_job_facets():
+    """
+    Get job counts per job_type, location and tag, most common first, at most
+    ?limit= values per facet. Without filters the counts come from the
+    job_facet summary table; with GET /jobs filters they are grouped over the
+    matching jobs.
+    """
+    try:
+        cache_key = response_cache.key('facets', 'job', request.args.items(multi=True))
+        cached = response_cache.get(cache_key)
+        if cached:
+            return json_response(*cached, cache_key=cache_key)
+
+        try:
+            limit = parse_limit(request.args.get('limit'))
+        except ValueError:
+            return jsonify({'error': 'limit must be a positive integer'}), 400
+
+        if any(request.args.get(name) for name in ('job_type', 'location', 'tag', 'q')):
+            try:
+                job_ids, _ = apply_filters(select(Job.id), request.args)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            facets = grouped_facet_counts(job_ids, limit)
+        else:
+            facets = stored_facet_counts(limit)
+
+        return json_response(*response_cache.set(cache_key, dumps(facets)), cache_key=cache_key)
+
+    except Exception as e:
+        logger.error(f"Error fetching job facets: {str(e)}")
+        return jsonify({'error': 'Internal server error occurred while fetching facets'}), 500
+
 @job_bp.route('/jobs/<int:job_id>', methods=['GET'])
 def get_job(job_id):
     """
@@ -92,12 +372,21 @@ def get_job(job_id):
     try:
         if job_id <= 0:
             return jsonify({'error': 'Invalid job ID'}), 400
+
+        cache_key = response_cache.key(f'job-{job_id}', 'job')
+        cached = response_cache.get(cache_key)
+        if cached:
+            return json_response(*cached, cache_key=cache_key)
             
         job = Job.query.get(job_id)
-        if not job:
+        if job:
+            return json_response(*response_cache.set(cache_key, dumps(job_response(job))), cache_key=cache_key)
+
+        # Old postings are still reachable by id once archived
+        archived = db.session.get(JobArchive, job_id)
+        if not archived:
             return jsonify({'error': 'Job not found'}), 404
-            
-        return jsonify(job.to_dict()), 200
+        return json_response(*response_cache.set(cache_key, dumps(archived.to_dict(Job.FIELDS))), cache_key=cache_key)
         
     except Exception as e:
         logger.error(f"Error fetching job {job_id}: {str(e)}")
@@ -125,23 +414,27 @@ def create_job():
 
         # Create job with proper error handling
         try:
-            job = Job(
-                title=data['title'].strip(),
-                company=data['company'].strip(),
-                location=data['location'].strip(),
-                posting_date=datetime.strptime(data.get('posting_date'), '%Y-%m-%d') if data.get('posting_date') else datetime.utcnow(),
-                job_type=data.get('job_type', '').strip() if data.get('job_type') else None,
-                tags=','.join(data.get('tags', [])) if isinstance(data.get('tags'), list) else data.get('tags', ''),
-                description=data.get('description', '').strip() if data.get('description') else None,
-                salary=data.get('salary', '').strip() if data.get('salary') else None,
-                url=data.get('url', '').strip() if data.get('url') else None
-            )
+            values = job_values(data)
+            if values['posting_date'] is None:
+                values['posting_date'] = datetime.utcnow()
+            posting = Posting.from_values(values)
+            # A near-duplicate of a listed job is stored but flagged, and not listed
+            match = find_near_duplicates([posting])[0]
+            job = Job(**values, tags=data.get('tags'), duplicate_of=match[1] if match else None)
 
             db.session.add(job)
+            db.session.flush()
+            if not job.duplicate_of:
+                index_jobs({job.id: posting})
+            apply_facet_changes([([], job_facet_values(job))])
+            bump_table_version('job')
             db.session.commit()
             
-            return jsonify(job.to_dict()), 201
+            return jsonify(job_response(job)), 201
             
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({'errors': {'url': 'A job with this URL already exists'}}), 409
         except Exception as e:
             db.session.rollback()
             logger.error(f"Database error while creating job: {str(e)}")
@@ -151,6 +444,98 @@ def create_job():
         logger.error(f"Error creating job: {str(e)}")
         return jsonify({'error': 'Internal server error occurred while creating job'}), 500
 
+def iter_ndjson(stream):
+    """
+    Yield (item, error) pairs from an NDJSON request stream, one per non-blank line
+    """
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line), None
+        except ValueError:
+            yield None, {'item': 'Invalid JSON'}
+
+@job_bp.route('/jobs/bulk', methods=['POST'])
+def bulk_create_jobs():
+    """
+    Create many jobs in one transaction from a JSON array or an NDJSON stream
+    (Content-Type: application/x-ndjson). Items whose URL matches an existing
+    job are rejected, or with ?mode=upsert update that job instead.
+
+    Invalid items are reported per item and skipped; valid items are written
+    in batched multi-row statements. With ?classify=1, missing job types and
+    inferred seniority/keyword tags are filled in from each job's text.
+    """
+    try:
+        mode = request.args.get('mode', 'insert')
+        if mode not in ('insert', 'upsert'):
+            return jsonify({'error': "mode must be 'insert' or 'upsert'"}), 400
+        upsert = mode == 'upsert'
+        classify = request.args.get('classify', '').lower() in ('1', 'true', 'yes')
+
+        if request.mimetype == 'application/x-ndjson':
+            items = iter_ndjson(request.stream)
+        elif request.is_json:
+            data = request.get_json(silent=True)
+            if not isinstance(data, list):
+                return jsonify({'error': 'Request body must be a JSON array of jobs'}), 400
+            items = ((item, None) for item in data)
+        else:
+            return jsonify({'error': 'Content-Type must be application/json or application/x-ndjson'}), 400
+
+        results = []
+        batch, batch_indexes = [], []
+
+        def flush():
+            if classify:
+                batch[:] = classify_batch(batch)
+            for index, (job_id, status) in zip(batch_indexes, write_job_batch(batch, upsert)):
+                if status == 'duplicate':
+                    results.append({'index': index, 'status': 'error', 'id': job_id,
+                                    'errors': {'url': 'A job with this URL already exists'}})
+                else:
+                    results.append({'index': index, 'status': status, 'id': job_id})
+            batch.clear()
+            batch_indexes.clear()
+
+        try:
+            for index, (item, errors) in enumerate(items):
+                if index >= MAX_BULK_ITEMS:
+                    db.session.rollback()
+                    return jsonify({'error': f'At most {MAX_BULK_ITEMS} jobs can be sent per request'}), 413
+
+                if errors is None and not isinstance(item, dict):
+                    errors = {'item': 'Each job must be a JSON object'}
+                if errors is None:
+                    errors = validate_job_data(item, ['title', 'company', 'location'])
+                if errors:
+                    results.append({'index': index, 'status': 'error', 'errors': errors})
+                    continue
+
+                batch.append((job_values(item), item.get('tags')))
+                batch_indexes.append(index)
+                if len(batch) >= BULK_BATCH_SIZE:
+                    flush()
+            flush()
+            if any(result['status'] in ('created', 'updated') for result in results):
+                bump_table_version('job')
+            db.session.commit()
+
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Database error during bulk job write: {str(e)}")
+            return jsonify({'error': 'Failed to save jobs due to database error'}), 500
+
+        results.sort(key=lambda result: result['index'])
+        counts = {status: sum(1 for result in results if result['status'] == status)
+                  for status in ('created', 'updated', 'unchanged', 'error')}
+        return jsonify({'results': results, **counts}), 207 if counts['error'] else 201
+
+    except Exception as e:
+        logger.error(f"Error during bulk job write: {str(e)}")
+        return jsonify({'error': 'Internal server error occurred while saving jobs'}), 500
+
 @job_bp.route('/jobs/<int:job_id>', methods=['PUT', 'PATCH'])
 def update_job(job_id):
     """
@@ -186,6 +571,8 @@ def update_job(job_id):
                 return jsonify({'errors': errors}), 400
 
         try:
+            facets_before = job_facet_values(job)
+
             # Update fields
             if 'title' in data:
                 job.title = data['title'].strip()
@@ -201,14 +588,22 @@ def update_job(job_id):
                 job.salary = data['salary'].strip() if data['salary'] else None
             if 'url' in data:
                 job.url = data['url'].strip() if data['url'] else None
+                job.natural_key = natural_key(job.url)
             if 'posting_date' in data:
                 job.posting_date = datetime.strptime(data['posting_date'], '%Y-%m-%d')
             if 'tags' in data:
-                job.tags = ','.join(data['tags']) if isinstance(data['tags'], list) else data['tags']
+                job.tags = data['tags']
 
+            if not job.duplicate_of and any(field in data for field in ('title', 'company', 'location', 'description')):
+                index_jobs({job.id: Posting(job.title, job.company, job.location, job.description)})
+            apply_facet_changes([(facets_before, job_facet_values(job))])
+            bump_table_version('job')
             db.session.commit()
-            return jsonify(job.to_dict()), 200
+            return jsonify(job_response(job)), 200
             
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({'errors': {'url': 'A job with this URL already exists'}}), 409
         except Exception as e:
             db.session.rollback()
             logger.error(f"Database error while updating job {job_id}: {str(e)}")
@@ -232,7 +627,12 @@ def delete_job(job_id):
             return jsonify({'error': 'Job not found'}), 404
 
         try:
+            apply_facet_changes([(job_facet_values(job), [])])
+            # The oldest job flagged as a near-duplicate of this one is listed in its place
+            release_duplicates([job_id])
+            unindex_jobs([job_id])
             db.session.delete(job)
+            bump_table_version('job')
             db.session.commit()
             return '', 204
             
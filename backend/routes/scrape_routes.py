@@ -0,0 +1,102 @@
+from flask import Blueprint, request, jsonify
+from models.scrape_run import ScrapeRun
+from scrape_runs import SOURCES, ScrapeRunActive, scrape_runner
+import logging
+
+logger = logging.getLogger(__name__)
+
+scrape_bp = Blueprint('scrape_routes', __name__)
+
+DEFAULT_MAX_PAGES = 50
+MAX_RUNS_LISTED = 100
+
+def parse_run_options(data):
+    """
+    Validate the body of POST /scrape-runs, returning (options, errors)
+    """
+    errors = {}
+    source = data.get('source', 'actuarylist')
+    if source not in SOURCES:
+        errors['source'] = f"Unknown source; expected one of {', '.join(sorted(SOURCES))}"
+
+    options = {'source': source, 'full': data.get('full', False)}
+    # Only a JSON boolean: a string such as "false" must not start a full re-crawl
+    if not isinstance(options['full'], bool):
+        errors['full'] = 'full must be true or false'
+    for field, default in (('max_pages', DEFAULT_MAX_PAGES), ('max_jobs', None)):
+        value = data.get(field, default)
+        if value is None:
+            options[field] = None
+            continue
+        if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+            errors[field] = f'{field} must be a non-negative integer'
+            continue
+        # 0 means no limit, as with run_scraper.py --max-jobs
+        options[field] = value or None
+    if not errors and options['max_pages'] is None:
+        errors['max_pages'] = 'max_pages must be a positive integer'
+    return options, errors
+
+@scrape_bp.route('/scrape-runs', methods=['POST'])
+def create_scrape_run():
+    """
+    Queue a background scrape. Returns 202 with the run, whose progress is
+    read from GET /scrape-runs/<id>, or 409 if the source is already being
+    scraped.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        options, errors = parse_run_options(data)
+        if errors:
+            return jsonify({'errors': errors}), 400
+
+        try:
+            run = scrape_runner.start(**options)
+        except ScrapeRunActive as e:
+            return jsonify({'error': str(e), 'run': e.run.to_dict() if e.run else None}), 409
+
+        response = jsonify(run.to_dict())
+        response.headers['Location'] = f'/scrape-runs/{run.id}'
+        return response, 202
+
+    except Exception as e:
+        logger.error(f"Error starting scrape run: {str(e)}")
+        return jsonify({'error': 'Internal server error occurred while starting scrape'}), 500
+
+@scrape_bp.route('/scrape-runs', methods=['GET'])
+def get_scrape_runs():
+    """
+    List the most recent scrape runs, newest first, optionally ?status= filtered
+    """
+    try:
+        try:
+            limit = min(int(request.args.get('limit', 20)), MAX_RUNS_LISTED)
+            if limit <= 0:
+                raise ValueError
+        except ValueError:
+            return jsonify({'error': 'limit must be a positive integer'}), 400
+
+        query = ScrapeRun.query
+        if request.args.get('status'):
+            query = query.filter(ScrapeRun.status == request.args['status'])
+        runs = query.order_by(ScrapeRun.id.desc()).limit(limit).all()
+        return jsonify({'runs': [run.to_dict() for run in runs]})
+
+    except Exception as e:
+        logger.error(f"Error fetching scrape runs: {str(e)}")
+        return jsonify({'error': 'Internal server error occurred while fetching scrape runs'}), 500
+
+@scrape_bp.route('/scrape-runs/<int:run_id>', methods=['GET'])
+def get_scrape_run(run_id):
+    """
+    Get a scrape run with its progress, throughput and result counts
+    """
+    try:
+        run = ScrapeRun.query.get(run_id)
+        if not run:
+            return jsonify({'error': 'Scrape run not found'}), 404
+        return jsonify(run.to_dict())
+
+    except Exception as e:
+        logger.error(f"Error fetching scrape run {run_id}: {str(e)}")
+        return jsonify({'error': 'Internal server error occurred while fetching scrape run'}), 500
@@ -0,0 +1,216 @@
+# backend/scrape_runs.py
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from config import Config
+from db import create_db_app, db
+from models.scrape_run import ScrapeRun
+
+SCRAPER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Scraper')
+
+# Sources a run can be started for, with the listing URL crawled for each
+SOURCES = {'actuarylist': 'https://www.actuarylist.com'}
+
+# Progress is written at most this often, plus once per committed batch
+PROGRESS_INTERVAL = 2.0
+
+class ScrapeRunActive(Exception):
+    """
+    Raised when a source already has a queued or running scrape
+    """
+    def __init__(self, run):
+        super().__init__(f"A scrape of {run.source} is already {run.status}" if run else "A scrape is already active")
+        self.run = run
+
+class ScrapeRunner:
+    """
+    Runs scrapes in a local process pool, so Selenium and the crawl never
+    block a web worker and no external broker is needed. Each web worker
+    starts its pool on the first run it queues; the unique active_source
+    column keeps runs to one per source however many pools there are.
+    """
+    def __init__(self):
+        self.processes = 1
+        self.stale_after = 900
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.processes = app.config.get('SCRAPE_PROCESSES', 1)
+        self.stale_after = app.config.get('SCRAPE_RUN_STALE_SECONDS', 900)
+
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn, not fork: a web worker has threads and open database connections
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes, mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+    def start(self, source, max_pages, max_jobs=None, full=False):
+        """
+        Queue a scrape of source and return its ScrapeRun. Raises
+        ScrapeRunActive if the source already has an active run.
+        """
+        expire_stale_runs(self.stale_after)
+        run = ScrapeRun(
+            source=source, active_source=source, status='queued',
+            max_pages=max_pages, max_jobs=max_jobs, full=full
+        )
+        db.session.add(run)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            raise ScrapeRunActive(ScrapeRun.query.filter_by(active_source=source).first())
+
+        app = current_app._get_current_object()
+        try:
+            future = self.executor().submit(run_scrape, run.id, app.config['DATABASE_URL'], SOURCES[source])
+        except Exception as e:
+            finish_run(run.id, 'failed', f"Could not start the scrape: {e}")
+            self.reset(e)
+            raise
+        future.add_done_callback(lambda done: self._on_done(app, run.id, done))
+        return run
+
+    def _on_done(self, app, run_id, future):
+        """
+        run_scrape records its own outcome; this only catches runs whose
+        process died before it could
+        """
+        error = future.exception()
+        if error is not None:
+            with app.app_context():
+                finish_run(run_id, 'failed', f"Scrape process failed: {error}")
+            self.reset(error)
+
+    def reset(self, error):
+        """
+        Drop a pool that can no longer take work, so the next run starts a new one
+        """
+        if isinstance(error, BrokenProcessPool):
+            with self._lock:
+                self._executor = None
+
+scrape_runner = ScrapeRunner()
+
+def finish_run(run_id, status, error=None, values=None):
+    """
+    Mark a run finished and release its source. Runs that already finished
+    are left as they were.
+    """
+    now = datetime.utcnow()
+    with db.engine.begin() as connection:
+        connection.execute(
+            update(ScrapeRun)
+            .where(ScrapeRun.id == run_id, ScrapeRun.active_source.isnot(None))
+            .values(status=status, error=error, active_source=None, finished_at=now, heartbeat_at=now, **(values or {}))
+        )
+
+def expire_stale_runs(stale_after):
+    """
+    Fail active runs that haven't reported progress for stale_after seconds,
+    e.g. because the web worker that queued them was restarted, so their
+    source can be scraped again
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=stale_after)
+    stale = db.session.execute(
+        select(ScrapeRun.id).where(
+            ScrapeRun.active_source.isnot(None),
+            or_(ScrapeRun.heartbeat_at < cutoff,
+                and_(ScrapeRun.heartbeat_at.is_(None), ScrapeRun.created_at < cutoff))
+        )
+    ).scalars().all()
+    for run_id in stale:
+        finish_run(run_id, 'failed', f"No progress for {stale_after} seconds")
+    return len(stale)
+
+def progress_values(scraper):
+    """
+    Column values of a run's progress, read from the scraper's counters
+    """
+    return {
+        'pages_fetched': sum(scraper.fetch_stats[path] for path in ('http', 'http_not_modified', 'browser')),
+        'pages_failed': scraper.fetch_stats['failed'],
+        'cards_seen': sum(scraper.card_stats.values()),
+        'jobs_created': scraper.save_counts['created'],
+        'jobs_updated': scraper.save_counts['updated'],
+        'jobs_unchanged': scraper.save_counts['unchanged'],
+    }
+
+class ProgressRecorder:
+    """
+    on_progress callback for the scraper: writes the counts to the run's row
+    on its own connection, at most every PROGRESS_INTERVAL seconds unless a
+    batch was just committed
+    """
+    def __init__(self, run_id):
+        self.run_id = run_id
+        self.last_written = 0.0
+        self.last_saved = 0
+
+    def __call__(self, scraper):
+        saved = sum(scraper.save_counts.values())
+        if saved == self.last_saved and time.monotonic() - self.last_written < PROGRESS_INTERVAL:
+            return
+        self.last_written = time.monotonic()
+        self.last_saved = saved
+        with db.engine.begin() as connection:
+            connection.execute(
+                update(ScrapeRun).where(ScrapeRun.id == self.run_id)
+                .values(heartbeat_at=datetime.utcnow(), **progress_values(scraper))
+            )
+
+def run_scrape(run_id, database_url, base_url):
+    """
+    Entry point in the pool process: run one queued scrape, recording its
+    progress and outcome on the scrape_run row
+    """
+    if SCRAPER_DIR not in sys.path:
+        sys.path.append(SCRAPER_DIR)
+    from actuary_scraper_v2 import ActuaryListScraper
+    from crawl_state import DEFAULT_STATE_PATH
+
+    app = create_db_app(type('ScrapeConfig', (Config,), {'DATABASE_URL': database_url}))
+    with app.app_context():
+        run = db.session.get(ScrapeRun, run_id)
+        if run is None or run.active_source is None:
+            return
+        now = datetime.utcnow()
+        db.session.execute(
+            update(ScrapeRun).where(ScrapeRun.id == run_id)
+            .values(status='running', started_at=now, heartbeat_at=now)
+        )
+        db.session.commit()
+
+        scraper = ActuaryListScraper(
+            headless=True, max_jobs=run.max_jobs, base_url=base_url,
+            max_pages=run.max_pages, state_path=app.config.get('SCRAPE_STATE_PATH') or DEFAULT_STATE_PATH,
+            incremental=not run.full
+        )
+        scraper.app = app
+        scraper.on_progress = ProgressRecorder(run_id)
+        try:
+            scraper.run(batch_size=app.config['SCRAPE_BATCH_SIZE'], archive_after_days=app.config['ARCHIVE_AFTER_DAYS'])
+        except Exception as e:
+            finish_run(run_id, 'failed', str(e), progress_values(scraper))
+            return
+        finally:
+            if scraper.crawl_state is not None:
+                scraper.crawl_state.close()
+            db.session.remove()
+
+        if scraper.save_error:
+            finish_run(run_id, 'failed', scraper.save_error, progress_values(scraper))
+        else:
+            finish_run(run_id, 'succeeded', None, progress_values(scraper))
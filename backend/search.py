@@ -0,0 +1,126 @@
+# backend/search.py
+import re
+from sqlalchemy import Double, cast, func, literal_column, select, table, text
+from db import db
+from models.job import Job
+
+# Text search configuration used to build and query the Postgres tsvector
+SEARCH_CONFIG = 'english'
+
+# A last search term that is a plain word also matches as a prefix, so results
+# keep up while a keyword is typed ("act" finds "Actuary")
+_PREFIX_TERM = re.compile(r'[^\W_]+')
+
+_POSTGRES_DDL = [
+    # A generated column is recomputed by Postgres on every INSERT/UPDATE, so
+    # the API, bulk loads and the scraper all keep it in sync without extra code
+    f"""
+    ALTER TABLE job ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(company, '')), 'B') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_job_search_vector ON job USING GIN (search_vector)",
+]
+
+_SQLITE_DDL = [
+    # External-content FTS5 index over job, maintained by triggers
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS job_fts USING fts5(
+        title, company, description, content='job', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS job_fts_ai AFTER INSERT ON job BEGIN
+        INSERT INTO job_fts(rowid, title, company, description)
+        VALUES (new.id, new.title, new.company, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS job_fts_ad AFTER DELETE ON job BEGIN
+        INSERT INTO job_fts(job_fts, rowid, title, company, description)
+        VALUES ('delete', old.id, old.title, old.company, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS job_fts_au AFTER UPDATE OF title, company, description ON job BEGIN
+        INSERT INTO job_fts(job_fts, rowid, title, company, description)
+        VALUES ('delete', old.id, old.title, old.company, old.description);
+        INSERT INTO job_fts(rowid, title, company, description)
+        VALUES (new.id, new.title, new.company, new.description);
+    END
+    """,
+]
+
+def install_search(engine):
+    """
+    Create the full-text index for the engine's dialect. Idempotent.
+    """
+    with engine.begin() as conn:
+        if engine.dialect.name == 'postgresql':
+            for statement in _POSTGRES_DDL:
+                conn.execute(text(statement))
+        elif engine.dialect.name == 'sqlite':
+            exists = conn.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'job_fts'"
+            )).first()
+            for statement in _SQLITE_DDL:
+                conn.execute(text(statement))
+            if not exists:
+                # Index rows written before the FTS table existed
+                conn.execute(text("INSERT INTO job_fts(job_fts) VALUES ('rebuild')"))
+
+def split_prefix(q):
+    """
+    Split a search into its leading terms and the last term when it should
+    match as a prefix, or (q, None)
+    """
+    terms = q.split()
+    if terms and _PREFIX_TERM.fullmatch(terms[-1]):
+        return ' '.join(terms[:-1]), terms[-1]
+    return q, None
+
+def to_fts5_query(q):
+    """
+    Quote each search term so user input can't trigger FTS5 query syntax
+    errors; a plain-word last term becomes a prefix query
+    """
+    terms, prefix = split_prefix(q)
+    quoted = ['"{}"'.format(term.replace('"', '""')) for term in terms.split()]
+    if prefix:
+        quoted.append(f'"{prefix}"*')
+    return ' '.join(quoted)
+
+def apply_search(query, q):
+    """
+    Restrict a Job query to rows matching q.
+
+    Returns (query, score) where score is a column expression to rank by,
+    higher meaning more relevant.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        terms, prefix = split_prefix(q)
+        if prefix:
+            # The prefix goes through the same stemming as the indexed text
+            ts_query = func.to_tsquery(SEARCH_CONFIG, f'{prefix}:*')
+            if terms:
+                ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, terms).op('&&')(ts_query)
+        else:
+            ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        vector = literal_column('job.search_vector')
+        # ts_rank is a float4; as a double it survives the round trip through
+        # a cursor, so the cursor's tie-break can compare equal scores
+        score = cast(func.ts_rank(vector, ts_query), Double)
+        return query.filter(vector.op('@@')(ts_query)), score
+
+    # SQLite: join against the FTS5 matches; bm25() is lower-is-better, so negate it
+    fts = table('job_fts')
+    matches = select(
+        literal_column('job_fts.rowid').label('job_id'),
+        (-func.bm25(literal_column('job_fts'))).label('score')
+    ).select_from(fts).where(
+        text('job_fts MATCH :fts_query').bindparams(fts_query=to_fts5_query(q))
+    ).subquery()
+    return query.join(matches, matches.c.job_id == Job.id), matches.c.score
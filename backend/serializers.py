@@ -0,0 +1,50 @@
+# backend/serializers.py
+import json
+from datetime import datetime
+from sqlalchemy import select
+from db import db
+from models.tag import Tag, JobTag
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder produces the same bytes
+    orjson = None
+
+def dumps(obj):
+    """
+    Encode obj as compact JSON bytes with sorted keys. Uses orjson when it is
+    installed; the stdlib fallback is configured to emit identical output.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode()
+
+def serialize_value(value):
+    """
+    Convert a column value to its JSON representation, as Job.to_dict does
+    """
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def load_tags(job_ids):
+    """
+    Fetch tag names for many jobs in one query, as {job_id: [name, ...]}
+    """
+    tags = {job_id: [] for job_id in job_ids}
+    if job_ids:
+        rows = db.session.execute(
+            select(JobTag.job_id, Tag.name).join(Tag, Tag.id == JobTag.tag_id)
+            .where(JobTag.job_id.in_(job_ids)).order_by(JobTag.job_id, JobTag.position)
+        )
+        for job_id, name in rows:
+            tags[job_id].append(name)
+    return tags
+
+def row_to_dict(row, fields, tags_by_job):
+    """
+    Build the same dict as Job.to_dict(fields) from a Core row mapping,
+    without hydrating an ORM instance
+    """
+    return {
+        field: tags_by_job[row['id']] if field == 'tags' else serialize_value(row[field])
+        for field in fields
+    }
@@ -0,0 +1,64 @@
+# backend/tests/test_archive.py
+from datetime import datetime, timedelta
+from db import db
+from archive import archive_stale_jobs
+from conftest import job_data, list_all
+from facets import stored_facet_counts
+from models.job import Job
+from models.job_archive import JobArchive
+
+def days_ago(days):
+    return (datetime.utcnow() - timedelta(days=days)).strftime('%Y-%m-%d')
+
+def post_jobs(client):
+    old = client.post('/jobs', json=job_data(posting_date=days_ago(200), tags=['Life'])).json['id']
+    new = client.post('/jobs', json=job_data(title='Reserving Analyst', description='IBNR for long tail lines.',
+                                             url='https://jobs.example.com/2', posting_date=days_ago(1))).json['id']
+    return old, new
+
+def test_archive_moves_stale_jobs(client):
+    old, new = post_jobs(client)
+    assert archive_stale_jobs(90, batch_size=1) == 1
+
+    assert db.session.get(Job, old) is None
+    archived = db.session.get(JobArchive, old)
+    assert archived.tags == 'Life'
+    assert [job['id'] for job in list_all(client)] == [new]
+    assert stored_facet_counts(10)['tag'] == [{'value': 'Pricing', 'count': 1}]
+
+    # Archived jobs are still found by id
+    response = client.get(f'/jobs/{old}')
+    assert response.status_code == 200
+    assert response.json['archived'] is True
+    assert archive_stale_jobs(90) == 0
+
+def test_include_archived(client):
+    old, new = post_jobs(client)
+    client.post('/jobs', json=job_data(title='Life Actuary', description='Valuation of annuities.',
+                                       url='https://jobs.example.com/3', posting_date=days_ago(100)))
+    archive_stale_jobs(90)
+
+    jobs = list_all(client, include_archived=1, limit=1)
+    assert [job['archived'] for job in jobs] == [False, True, True]
+    assert jobs[0]['id'] == new
+    assert jobs[1]['title'] == 'Life Actuary'
+    assert jobs[2]['id'] == old
+
+    tagged = list_all(client, include_archived=1, tag='life')
+    assert [job['id'] for job in tagged] == [old]
+    assert tagged[0]['tags'] == ['Life']
+
+def test_reposted_job_hides_archived_copy(client):
+    old, _ = post_jobs(client)
+    archive_stale_jobs(90)
+
+    # The same URL posted again is listed once, as the active job
+    again = client.post('/jobs', json=job_data(posting_date=days_ago(1))).json['id']
+    ids = [job['id'] for job in list_all(client, include_archived=1)]
+    assert again in ids and old not in ids
+
+    # Archiving it again replaces the earlier archived copy
+    db.session.execute(db.update(Job).where(Job.id == again).values(posting_date=datetime.utcnow() - timedelta(days=200)))
+    db.session.commit()
+    archive_stale_jobs(90)
+    assert db.session.query(JobArchive).filter_by(url='https://jobs.example.com/1').count() == 1
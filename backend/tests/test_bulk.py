@@ -0,0 +1,36 @@
+# backend/tests/test_bulk.py
+from datetime import datetime
+from db import db
+from models.job import Job
+
+def test_bulk_endpoint(client):
+    body = [
+        {'title': 'Pricing Actuary', 'company': 'Acme', 'location': 'Chicago, IL', 'url': 'https://x/1'},
+        {'title': '', 'company': 'Acme', 'location': 'Chicago, IL'},
+    ]
+    response = client.post('/jobs/bulk', json=body)
+    assert response.status_code == 207
+    assert [result['status'] for result in response.json['results']] == ['created', 'error']
+
+    response = client.post('/jobs/bulk?mode=upsert', json=[{**body[0], 'salary': '$100k'}])
+    assert response.status_code == 201
+    assert response.json['updated'] == 1
+
+def test_undated_jobs_are_dated_when_created(client):
+    response = client.post('/jobs/bulk', json=[
+        {'title': 'Pricing Actuary', 'company': 'Acme', 'location': 'Chicago, IL', 'url': 'https://x/1'},
+        {'title': 'Reserving Actuary', 'company': 'Acme', 'location': 'Chicago, IL'},
+    ])
+    assert [result['status'] for result in response.json['results']] == ['created', 'created']
+    for result in response.json['results']:
+        assert db.session.get(Job, result['id']).posting_date.date() == datetime.utcnow().date()
+
+def test_resent_undated_job_is_unchanged(client):
+    job = {'title': 'Pricing Actuary', 'company': 'Acme', 'location': 'Chicago, IL', 'url': 'https://x/1'}
+    response = client.post('/jobs/bulk?mode=upsert', json=[{**job, 'posting_date': '2026-01-01'}])
+    job_id = response.json['results'][0]['id']
+
+    # Leaving the date out keeps the stored one rather than redating the job
+    response = client.post('/jobs/bulk?mode=upsert', json=[job])
+    assert response.json['results'] == [{'index': 0, 'id': job_id, 'status': 'unchanged'}]
+    assert db.session.get(Job, job_id).posting_date == datetime(2026, 1, 1)
@@ -0,0 +1,55 @@
+# backend/tests/test_cache.py
+from cache import LRUCacheBackend
+from conftest import job_data
+
+def test_etag_revalidation(client, add_job):
+    job_id = add_job()
+    response = client.get(f'/jobs/{job_id}')
+    etag = response.headers['ETag']
+    assert response.headers['Cache-Control'] == 'no-cache'
+
+    response = client.get(f'/jobs/{job_id}', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+
+    response = client.get(f'/jobs/{job_id}', headers={'If-None-Match': '"stale"'})
+    assert response.status_code == 200
+    assert response.headers['ETag'] == etag
+
+def test_update_invalidates_cached_responses(client, add_job):
+    job_id = add_job()
+    etag = client.get(f'/jobs/{job_id}').headers['ETag']
+    listing = client.get('/jobs')
+    assert listing.json['jobs'][0]['title'] == 'Pricing Actuary'
+
+    assert client.put(f'/jobs/{job_id}', json={'title': 'Senior Pricing Actuary'}).status_code == 200
+    response = client.get(f'/jobs/{job_id}', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert response.json['title'] == 'Senior Pricing Actuary'
+    assert client.get('/jobs').json['jobs'][0]['title'] == 'Senior Pricing Actuary'
+    assert client.get('/jobs', headers={'If-None-Match': listing.headers['ETag']}).status_code == 200
+
+def test_create_and_delete_invalidate_cached_responses(client, add_job):
+    job_id = add_job()
+    assert len(client.get('/jobs').json['jobs']) == 1
+    assert client.get('/jobs/facets').json
+
+    assert client.post('/jobs', json=job_data(url='https://jobs.example.com/2', company='Globex')).status_code == 201
+    assert len(client.get('/jobs').json['jobs']) == 2
+
+    assert client.get(f'/jobs/{job_id}').status_code == 200
+    assert client.delete(f'/jobs/{job_id}').status_code == 204
+    assert client.get(f'/jobs/{job_id}').status_code == 404
+    assert [job['company'] for job in client.get('/jobs').json['jobs']] == ['Globex']
+
+def test_lru_backend_evicts_least_recently_used():
+    backend = LRUCacheBackend(max_entries=2)
+    backend.set('a', b'1')
+    backend.set('b', b'2')
+    assert backend.get('a') == b'1'
+    backend.set('c', b'3')
+    assert backend.get('b') is None
+    assert backend.get('a') == b'1'
+    assert backend.get('c') == b'3'
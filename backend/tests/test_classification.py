@@ -0,0 +1,56 @@
+# backend/tests/test_classification.py
+from datetime import datetime
+import pytest
+from classification import KeywordMatcher, classify_job, parse_posting_date
+
+NOW = datetime(2026, 3, 15, 12, 0)
+
+@pytest.mark.parametrize('text, expected', [
+    ('Posted 3 days ago', datetime(2026, 3, 12, 12, 0)),
+    ('2h ago', datetime(2026, 3, 15, 10, 0)),
+    ('a week ago', datetime(2026, 3, 8, 12, 0)),
+    ('30+ days ago', datetime(2026, 2, 13, 12, 0)),
+    ('Today', NOW),
+    ('yesterday', datetime(2026, 3, 14, 12, 0)),
+])
+def test_relative_dates(text, expected):
+    assert parse_posting_date(text, NOW) == expected
+
+@pytest.mark.parametrize('text, expected', [
+    ('2025-05-01', datetime(2025, 5, 1)),
+    ('05/01/2025', datetime(2025, 5, 1)),
+    ('Posted May 1, 2025', datetime(2025, 5, 1)),
+    ('1st Feb', datetime(2026, 2, 1)),
+    # Without a year, the most recent past occurrence
+    ('Dec 20', datetime(2025, 12, 20)),
+])
+def test_absolute_dates(text, expected):
+    assert parse_posting_date(text, NOW) == expected
+
+@pytest.mark.parametrize('text', ['', None, 'Pricing Actuary', '02/30/2025', 'Head ago', 'Lead ago'])
+def test_invalid_dates(text):
+    assert parse_posting_date(text, NOW) is None
+
+def test_keywords_match_whole_words():
+    matcher = KeywordMatcher({'sql': 'SQL', 'intern': 'Intern'})
+    assert [label for _, _, label in matcher.matches('NoSQL and SQL, internal, Intern')] == ['SQL', 'Intern']
+
+def test_most_senior_title_match_wins():
+    assert classify_job('Senior Manager, Pricing').seniority == 'Manager'
+    assert classify_job('VP and Chief Actuary').seniority == 'Executive'
+    assert classify_job('Pricing Actuary', 'Report to the senior director.').seniority is None
+
+def test_lead_and_partner_only_count_at_the_start_of_a_title():
+    assert classify_job('Lead Pricing Actuary').seniority == 'Senior'
+    assert classify_job('Partner, Actuarial Consulting').seniority == 'Executive'
+    assert classify_job('Pricing Actuary, Team Lead').seniority is None
+    assert classify_job('Actuary, Partner Solutions').seniority is None
+
+def test_description_boilerplate_adds_no_tags():
+    description = ('We offer health insurance, a retirement plan and an FSA. '
+                   'This is not a remote role; a hybrid schedule may be discussed.')
+    assert classify_job('Pricing Actuary', description).tags == ['Pricing']
+
+def test_tags_from_title_tags_and_description_phrases():
+    result = classify_job('Health Actuary', 'Fully remote. Build pricing models in Python.', ['Reserving'])
+    assert result.tags == ['Health', 'Remote', 'Python', 'Reserving']
@@ -0,0 +1,63 @@
+# backend/tests/test_compression.py
+import gzip
+import json
+import pytest
+from werkzeug.http import parse_accept_header
+from compression import ENCODINGS, compress, negotiate
+
+def accept(value):
+    return parse_accept_header(value)
+
+@pytest.fixture
+def listing(add_job):
+    """A GET /jobs query whose body is well above COMPRESSION_MIN_SIZE"""
+    for number in range(20):
+        add_job(title=f'Pricing Actuary {number}', description='Build rating plans. ' * 10)
+    return '/jobs?fields=all'
+
+def test_negotiate():
+    assert negotiate(accept('gzip')) == 'gzip'
+    assert negotiate(accept('gzip;q=0, identity')) is None
+    assert negotiate(accept('')) is None
+    assert negotiate(accept('compress')) is None
+    # '*' accepts everything, so the most preferred encoding wins
+    assert negotiate(accept('*')) == ENCODINGS[0]
+    assert negotiate(accept('*;q=0.5, gzip;q=1')) == 'gzip'
+
+def test_gzip_output_is_deterministic():
+    body = b'{"jobs": []}' * 100
+    assert compress(body, 'gzip') == compress(body, 'gzip')
+    assert gzip.decompress(compress(body, 'gzip')) == body
+    with pytest.raises(ValueError):
+        compress(body, 'deflate')
+
+def test_compressed_response(client, listing):
+    plain = client.get(listing)
+    assert 'Content-Encoding' not in plain.headers
+    assert len(plain.data) >= 1024
+
+    response = client.get(listing, headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert json.loads(gzip.decompress(response.data)) == plain.json
+    # Repeated requests get identical bytes, which the ETag promises
+    assert client.get(listing, headers={'Accept-Encoding': 'gzip'}).data == response.data
+
+def test_each_encoding_has_its_own_etag(client, listing):
+    plain_etag = client.get(listing).headers['ETag']
+    gzip_etag = client.get(listing, headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+    assert gzip_etag == plain_etag[:-1] + '-gzip"'
+
+    response = client.get(listing, headers={'Accept-Encoding': 'gzip', 'If-None-Match': gzip_etag})
+    assert response.status_code == 304
+    # The gzip ETag doesn't validate the uncompressed body, nor the other way round
+    assert client.get(listing, headers={'If-None-Match': gzip_etag}).status_code == 200
+    response = client.get(listing, headers={'Accept-Encoding': 'gzip', 'If-None-Match': plain_etag})
+    assert response.status_code == 200
+
+def test_small_responses_are_not_compressed(client, add_job):
+    job_id = add_job()
+    response = client.get(f'/jobs/{job_id}', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    assert not response.headers['ETag'].endswith('-gzip"')
+    assert 'Accept-Encoding' in response.headers['Vary']
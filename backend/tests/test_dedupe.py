@@ -0,0 +1,104 @@
+# backend/tests/test_dedupe.py
+from datetime import datetime, timedelta
+from db import db
+from archive import archive_stale_jobs
+from conftest import job_data, job_item, list_all
+from dedupe import Posting
+from facets import stored_facet_counts
+from ingest import write_job_batch
+from models.job import Job
+from models.job_lsh_band import JobLshBand
+
+DESCRIPTION = (
+    "We are looking for an experienced pricing actuary to join our property and casualty team. "
+    "You will build GLMs for personal auto and homeowners, lead rate filings with state regulators, "
+    "and mentor analysts on the team. Requirements include FCAS or near-FCAS credentials, strong "
+    "Python or R skills, and eight or more years of ratemaking experience."
+)
+
+def posting(**values):
+    values = {'title': 'Senior Pricing Actuary', 'company': 'Acme Insurance Inc', 'location': 'Chicago, IL',
+              'description': DESCRIPTION, **values}
+    return Posting.from_values(values)
+
+def test_posting_matches():
+    original = posting()
+    assert original.matches(posting(title='Senior Pricing Actuary II', company='Acme Insurance'))
+    assert set(original.buckets) & set(posting(company='ACME Insurance, LLC').buckets)
+    assert not original.matches(posting(location='Boston, MA'))
+    assert not original.matches(posting(title='Reserving Manager'))
+    assert not original.matches(posting(description='Lead the reserving team for long tail commercial lines.'))
+
+def test_created_duplicate_is_flagged_and_released(client):
+    original = client.post('/jobs', json=job_data(title='Senior Pricing Actuary', description=DESCRIPTION)).json['id']
+    response = client.post('/jobs', json=job_data(title='Senior Pricing Actuary II', description=DESCRIPTION,
+                                                  url='https://other.example.com/9'))
+    assert response.status_code == 201
+    duplicate = response.json['id']
+    assert response.json['duplicate_of'] == original
+
+    assert [job['id'] for job in list_all(client)] == [original]
+    assert client.get(f'/jobs/{duplicate}').json['duplicate_of'] == original
+    assert stored_facet_counts(10)['tag'] == [{'value': 'Pricing', 'count': 1}]
+
+    # Deleting the original lists the duplicate in its place
+    client.delete(f'/jobs/{original}')
+    assert [job['id'] for job in list_all(client)] == [duplicate]
+    assert 'duplicate_of' not in client.get(f'/jobs/{duplicate}').json
+    assert stored_facet_counts(10)['tag'] == [{'value': 'Pricing', 'count': 1}]
+    assert db.session.query(JobLshBand).filter_by(job_id=original).count() == 0
+    assert db.session.query(JobLshBand).filter_by(job_id=duplicate).count() > 0
+
+def test_deleting_original_promotes_one_copy(client):
+    first, second, third = [
+        client.post('/jobs', json=job_data(description=DESCRIPTION, url=f'https://x/{number}')).json['id']
+        for number in range(1, 4)
+    ]
+    assert [job['id'] for job in list_all(client)] == [first]
+
+    # The oldest copy takes the original's place; the others become its duplicates
+    client.delete(f'/jobs/{first}')
+    assert [job['id'] for job in list_all(client)] == [second]
+    assert client.get(f'/jobs/{third}').json['duplicate_of'] == second
+    assert stored_facet_counts(10)['location'] == [{'value': 'Chicago, IL', 'count': 1}]
+    assert db.session.query(JobLshBand).filter_by(job_id=third).count() == 0
+
+    client.delete(f'/jobs/{second}')
+    assert [job['id'] for job in list_all(client)] == [third]
+    assert stored_facet_counts(10)['location'] == [{'value': 'Chicago, IL', 'count': 1}]
+
+def test_archiving_original_releases_duplicate(client):
+    old = (datetime.utcnow() - timedelta(days=200)).strftime('%Y-%m-%d')
+    original = client.post('/jobs', json=job_data(description=DESCRIPTION, posting_date=old)).json['id']
+    stale_copy = client.post('/jobs', json=job_data(description=DESCRIPTION, url='https://x/2', posting_date=old)).json
+    today = datetime.utcnow().strftime('%Y-%m-%d')
+    fresh_copy = client.post('/jobs', json=job_data(description=DESCRIPTION, url='https://x/3', posting_date=today)).json
+    assert stale_copy['duplicate_of'] == fresh_copy['duplicate_of'] == original
+
+    assert archive_stale_jobs(90) == 1
+    # The stale duplicate is dropped rather than archived
+    assert db.session.get(Job, stale_copy['id']) is None
+    assert [job['id'] for job in list_all(client, include_archived=1)] == [fresh_copy['id'], original]
+    assert stored_facet_counts(10)['tag'] == [{'value': 'Pricing', 'count': 1}]
+
+def test_updated_job_is_reindexed(client):
+    first = client.post('/jobs', json=job_data(description=DESCRIPTION)).json['id']
+    client.put(f'/jobs/{first}', json={'title': 'Reserving Manager', 'description': 'IBNR for long tail lines.'})
+    response = client.post('/jobs', json=job_data(description=DESCRIPTION, url='https://x/2'))
+    assert 'duplicate_of' not in response.json
+
+def test_batch_merges_near_duplicates(app):
+    (original, _), = write_job_batch([job_item('https://x/1', title='Senior Pricing Actuary', description=DESCRIPTION)])
+    db.session.commit()
+
+    results = write_job_batch([
+        job_item('https://x/2', title='Pricing Actuary Senior', description=DESCRIPTION),
+        job_item('https://x/3', title='Life Actuary', location='Boston, MA', description=DESCRIPTION),
+        job_item('https://x/4', title='Life Actuary', location='Boston, MA', description=DESCRIPTION),
+    ], upsert=True, merge_near_duplicates=True)
+    db.session.commit()
+
+    assert results[0] == (original, 'merged')
+    assert results[1][1] == 'created'
+    assert results[2] == (results[1][0], 'merged')
+    assert db.session.query(Job).count() == 2
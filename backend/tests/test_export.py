@@ -0,0 +1,40 @@
+# backend/tests/test_export.py
+import csv
+import io
+import json
+import export
+from conftest import job_data, list_all
+
+def post_jobs(client, count):
+    for n in range(count):
+        client.post('/jobs', json=job_data(title=f'Job {n}', description=f'Role number {n}.',
+                                           url=f'https://jobs.example.com/{n}', tags=['Pricing', f'T{n}']))
+
+def test_ndjson_matches_listing(client, monkeypatch):
+    monkeypatch.setattr(export, 'EXPORT_BATCH_SIZE', 2)
+    post_jobs(client, 5)
+
+    response = client.get('/jobs/export')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    records = [json.loads(line) for line in response.data.decode().splitlines()]
+    assert records == list_all(client, fields='all')
+
+def test_csv(client, monkeypatch):
+    monkeypatch.setattr(export, 'EXPORT_BATCH_SIZE', 2)
+    post_jobs(client, 3)
+
+    response = client.get('/jobs/export', query_string={'format': 'csv', 'sort': 'posting_date_asc'})
+    rows = list(csv.DictReader(io.StringIO(response.data.decode())))
+    assert [row['title'] for row in rows] == ['Job 0', 'Job 1', 'Job 2']
+    assert rows[0]['tags'] == 'Pricing,T0'
+
+def test_filters_and_empty_export(client):
+    post_jobs(client, 3)
+    response = client.get('/jobs/export', query_string={'tag': 'T1'})
+    assert [json.loads(line)['title'] for line in response.data.decode().splitlines()] == ['Job 1']
+
+    assert client.get('/jobs/export', query_string={'tag': 'Nope'}).data == b''
+    header = client.get('/jobs/export', query_string={'format': 'csv', 'tag': 'Nope'}).data.decode()
+    assert header.strip() == 'id,title,company,location,posting_date,job_type,tags,description,salary,url,created_at,updated_at'
+    assert client.get('/jobs/export', query_string={'format': 'xml'}).status_code == 400
@@ -0,0 +1,70 @@
+# backend/tests/test_facets.py
+from db import db
+from conftest import job_data, job_item
+from facets import rebuild_facets, stored_facet_counts
+from ingest import write_job_batch
+
+def counts():
+    return {
+        facet: {entry['value']: entry['count'] for entry in entries}
+        for facet, entries in stored_facet_counts(100).items()
+    }
+
+def assert_matches_rebuild():
+    """
+    The incrementally maintained counts equal a recount from scratch
+    """
+    incremental = counts()
+    rebuild_facets()
+    db.session.commit()
+    assert counts() == incremental
+    return incremental
+
+def test_api_writes_keep_counts(client):
+    first = client.post('/jobs', json=job_data(tags=['Pricing', 'Life'])).json['id']
+    client.post('/jobs', json=job_data(title='Reserving Analyst', description='IBNR for long tail lines.',
+                                       url='https://jobs.example.com/2', job_type='Contract'))
+    assert assert_matches_rebuild() == {
+        'job_type': {'Full-time': 1, 'Contract': 1},
+        'location': {'Chicago, IL': 2},
+        'tag': {'Pricing': 2, 'Life': 1},
+    }
+
+    client.put(f'/jobs/{first}', json={'location': 'Boston, MA', 'tags': ['Life']})
+    assert assert_matches_rebuild()['tag'] == {'Pricing': 1, 'Life': 1}
+
+    client.delete(f'/jobs/{first}')
+    assert assert_matches_rebuild() == {
+        'job_type': {'Contract': 1},
+        'location': {'Chicago, IL': 1},
+        'tag': {'Pricing': 1},
+    }
+
+def test_batch_writes_keep_counts(app):
+    write_job_batch([job_item('https://x/1'), job_item('https://x/2', title='Life Actuary', tags=['Life'])], upsert=True)
+    db.session.commit()
+    write_job_batch([job_item('https://x/1', job_type='Contract', tags=['Life']), job_item('https://x/3', title='Analyst')],
+                    upsert=True)
+    db.session.commit()
+    # Duplicates and unchanged jobs leave the counts alone
+    write_job_batch([job_item('https://x/2', title='Life Actuary', tags=['Life'])])
+    write_job_batch([job_item('https://x/3', title='Analyst')], upsert=True)
+    db.session.commit()
+    assert assert_matches_rebuild() == {
+        'job_type': {'Full-time': 2, 'Contract': 1},
+        'location': {'Chicago, IL': 3},
+        'tag': {'Pricing': 1, 'Life': 2},
+    }
+
+def test_facets_endpoint(client):
+    client.post('/jobs', json=job_data())
+    client.post('/jobs', json=job_data(title='Reserving Analyst', description='IBNR for long tail lines.',
+                                       url='https://jobs.example.com/2', job_type='Contract', tags=[]))
+    response = client.get('/jobs/facets')
+    assert response.status_code == 200
+    assert response.json['job_type'] == [{'value': 'Contract', 'count': 1}, {'value': 'Full-time', 'count': 1}]
+
+    # With filters the counts are grouped over the matching jobs
+    filtered = client.get('/jobs/facets', query_string={'job_type': 'Contract'}).json
+    assert filtered['job_type'] == [{'value': 'Contract', 'count': 1}]
+    assert filtered['tag'] == []
@@ -0,0 +1,27 @@
+# backend/tests/test_fields.py
+from models.job import Job
+
+def test_listing_uses_summary_shape(client, add_job):
+    add_job(description='Long text', tags=['Pricing'])
+    job, = client.get('/jobs').json['jobs']
+    assert set(job) == set(Job.SUMMARY_FIELDS)
+    assert job['tags'] == ['Pricing']
+
+def test_fields_projection(client, add_job):
+    add_job(description='Long text')
+    job, = client.get('/jobs', query_string={'fields': 'title, description'}).json['jobs']
+    assert job == {'id': job['id'], 'title': 'Pricing Actuary', 'description': 'Long text'}
+
+    job, = client.get('/jobs', query_string={'fields': 'all'}).json['jobs']
+    assert set(job) == set(Job.FIELDS)
+
+def test_unknown_fields_are_rejected(client, add_job):
+    add_job()
+    response = client.get('/jobs', query_string={'fields': 'title,password,natural_key'})
+    assert response.status_code == 400
+    assert response.json['error'] == 'Unknown field(s): natural_key, password'
+
+def test_get_job_returns_full_record(client, add_job):
+    job_id = add_job(description='Long text')
+    assert set(client.get(f'/jobs/{job_id}').json) == set(Job.FIELDS)
+    assert client.get('/jobs/999').status_code == 404
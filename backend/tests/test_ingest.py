@@ -0,0 +1,90 @@
+# backend/tests/test_ingest.py
+from datetime import datetime
+from conftest import job_item
+from db import db
+import ingest
+from ingest import natural_key, write_job_batch
+from models.job import Job
+from serializers import load_tags
+
+def test_natural_key_ignores_tracking_and_formatting():
+    assert natural_key('HTTPS://Jobs.Example.com:443/a/?utm_source=x&b=2&a=1#top') == \
+        natural_key('https://jobs.example.com/a?a=1&b=2&gclid=abc')
+    assert natural_key(None, ' Pricing Actuary ', 'Acme') == 'pricing actuary|acme'
+    assert natural_key(None) is None
+
+def test_insert_reports_duplicates(app):
+    results = write_job_batch([job_item('https://x/1'), job_item('https://x/1?utm_medium=email'), job_item('https://x/2')])
+    db.session.commit()
+    assert [status for _, status in results] == ['created', 'duplicate', 'created']
+    assert results[1][0] == results[0][0]
+
+    again = write_job_batch([job_item('https://x/2')])
+    assert again == [(results[2][0], 'duplicate')]
+    assert db.session.query(Job).count() == 2
+
+def test_upsert_statuses(app):
+    (job_id, status), = write_job_batch([job_item('https://x/1')], upsert=True)
+    db.session.commit()
+    assert status == 'created'
+
+    assert write_job_batch([job_item('https://x/1')], upsert=True) == [(job_id, 'unchanged')]
+    # ignore_fields are not compared, and not a reason to write the row
+    assert write_job_batch([job_item('https://x/1', posting_date=datetime(2026, 2, 1))], upsert=True,
+                           ignore_fields=('posting_date',)) == [(job_id, 'unchanged')]
+
+    assert write_job_batch([job_item('https://x/1', salary='$100k')], upsert=True) == [(job_id, 'updated')]
+    assert write_job_batch([job_item('https://x/1', salary='$100k', tags=['Life'])], upsert=True) == [(job_id, 'updated')]
+    db.session.commit()
+
+    job = db.session.get(Job, job_id)
+    assert job.salary == '$100k'
+    assert job.tags == ['Life']
+
+def test_upsert_keeps_optional_fields_left_out(app):
+    (job_id, _), = write_job_batch([job_item('https://x/1', salary='$100k')], upsert=True)
+    db.session.commit()
+    # A re-scraped page without the salary or description doesn't clear them
+    assert write_job_batch([job_item('https://x/1', salary=None, description=None)], upsert=True) == \
+        [(job_id, 'unchanged')]
+    assert write_job_batch([job_item('https://x/1', title='Senior Pricing Actuary', salary=None, description=None)],
+                           upsert=True) == [(job_id, 'updated')]
+    db.session.commit()
+    job = db.session.get(Job, job_id)
+    assert job.title == 'Senior Pricing Actuary'
+    assert job.salary == '$100k'
+    assert job.description == 'Pricing Actuary at Acme, working on https://x/1.'
+
+def test_upsert_none_tags_keep_existing(app):
+    (job_id, _), = write_job_batch([job_item('https://x/1', tags=['Pricing', 'Life'])], upsert=True)
+    db.session.commit()
+    assert write_job_batch([job_item('https://x/1', tags=None)], upsert=True) == [(job_id, 'unchanged')]
+    assert write_job_batch([job_item('https://x/1', title='Senior Pricing Actuary', tags=None)], upsert=True) == \
+        [(job_id, 'updated')]
+    db.session.commit()
+    assert load_tags([job_id])[job_id] == ['Pricing', 'Life']
+
+def test_upsert_repeated_key_last_item_wins(app):
+    results = write_job_batch([job_item('https://x/1', title='First'), job_item('https://x/1', title='Second')], upsert=True)
+    db.session.commit()
+    assert results[0] == results[1]
+    assert results[1][1] == 'created'
+    assert db.session.get(Job, results[1][0]).title == 'Second'
+
+def test_jobs_without_key_are_always_created(app):
+    results = write_job_batch([job_item(None, title='A', company=''), job_item(None, title='A', company='')])
+    db.session.commit()
+    assert [status for _, status in results] == ['created', 'created']
+    assert results[0][0] != results[1][0]
+
+def test_insert_reports_concurrent_insert_as_duplicate(app, monkeypatch):
+    (job_id, _), = write_job_batch([job_item('https://x/1')])
+    db.session.commit()
+    # As if another writer inserted the job after this batch looked for it
+    monkeypatch.setattr(ingest, '_load_existing', lambda keys: {})
+    results = write_job_batch([job_item('https://x/1', title='Senior Pricing Actuary'), job_item('https://x/2')])
+    db.session.commit()
+    assert results[0] == (job_id, 'duplicate')
+    assert results[1][1] == 'created'
+    assert db.session.get(Job, job_id).title == 'Pricing Actuary'
+    assert db.session.query(Job).count() == 2
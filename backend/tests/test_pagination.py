@@ -0,0 +1,43 @@
+# backend/tests/test_pagination.py
+from datetime import datetime
+from db import db
+from conftest import list_all
+from routes.job_routes import decode_cursor, encode_cursor
+
+def test_cursor_round_trip():
+    date = datetime(2026, 3, 1, 12, 30)
+    assert decode_cursor(encode_cursor(date, 7), 'posting_date_desc') == (date, 7)
+    assert decode_cursor(encode_cursor(None, 7), 'posting_date_asc') == (None, 7)
+    assert decode_cursor(encode_cursor(1.5, 7), 'relevance') == (1.5, 7)
+
+def test_pages_cover_every_job_once(client, add_job):
+    # Several jobs per posting_date, so pages split inside runs of equal keys
+    ids = [add_job(title=f'Job {n}', posting_date=datetime(2026, 1, 1 + n // 3)) for n in range(10)]
+
+    newest_first = list_all(client, limit=4)
+    assert [job['id'] for job in newest_first] == sorted(ids, key=lambda i: (ids.index(i) // 3, i), reverse=True)
+
+    oldest_first = list_all(client, limit=4, sort='posting_date_asc')
+    assert [job['id'] for job in oldest_first] == sorted(ids, key=lambda i: (ids.index(i) // 3, i))
+
+def test_undated_jobs_come_last(client, add_job):
+    dated = [add_job(title=f'Dated {n}', posting_date=datetime(2026, 1, 1 + n)) for n in range(3)]
+    undated = [add_job(title=f'Undated {n}') for n in range(3)]
+    db.session.execute(db.text("UPDATE job SET posting_date = NULL WHERE title LIKE 'Undated%'"))
+    db.session.commit()
+
+    for limit in (1, 2, 4):
+        assert [job['id'] for job in list_all(client, limit=limit)] == dated[::-1] + undated[::-1]
+        assert [job['id'] for job in list_all(client, limit=limit, sort='posting_date_asc')] == dated + undated
+
+def test_filters_apply_to_every_page(client, add_job):
+    for n in range(6):
+        add_job(title=f'Job {n}', job_type='Full-time' if n % 2 else 'Contract')
+    jobs = list_all(client, limit=2, job_type='Contract')
+    assert len(jobs) == 3
+    assert all(job['job_type'] == 'Contract' for job in jobs)
+
+def test_invalid_cursor(client, add_job):
+    add_job()
+    assert client.get('/jobs', query_string={'cursor': 'not-a-cursor'}).status_code == 400
+    assert client.get('/jobs', query_string={'limit': 0}).status_code == 400
@@ -0,0 +1,35 @@
+# backend/tests/test_scrape_runs.py
+import pytest
+from routes.scrape_routes import parse_run_options
+
+def test_run_options_defaults():
+    options, errors = parse_run_options({})
+    assert errors == {}
+    assert options == {'source': 'actuarylist', 'full': False, 'max_pages': 50, 'max_jobs': None}
+
+def test_run_options_limits():
+    options, errors = parse_run_options({'max_pages': 5, 'max_jobs': 0, 'full': True})
+    assert errors == {}
+    assert options['max_pages'] == 5
+    assert options['max_jobs'] is None  # 0 means no limit
+    assert options['full'] is True
+
+@pytest.mark.parametrize('body, field', [
+    ({'full': 'false'}, 'full'),
+    ({'full': 0}, 'full'),
+    ({'full': None}, 'full'),
+    ({'source': 'elsewhere'}, 'source'),
+    ({'max_pages': 0}, 'max_pages'),
+    ({'max_pages': '5'}, 'max_pages'),
+    ({'max_jobs': -1}, 'max_jobs'),
+    ({'max_jobs': True}, 'max_jobs'),
+])
+def test_run_options_errors(body, field):
+    _, errors = parse_run_options(body)
+    assert list(errors) == [field]
+
+def test_invalid_run_is_rejected(client):
+    response = client.post('/scrape-runs', json={'full': 'false'})
+    assert response.status_code == 400
+    assert 'full' in response.json['errors']
+    assert client.get('/scrape-runs').json['runs'] == []
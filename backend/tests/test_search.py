@@ -0,0 +1,37 @@
+# backend/tests/test_search.py
+from conftest import list_all
+
+def test_search_matches_title_company_and_description(client, add_job):
+    title = add_job(title='Pricing Actuary')
+    company = add_job(title='Analyst', company='Pricing Partners')
+    description = add_job(title='Analyst', description='Supports the pricing team.')
+    add_job(title='Reserving Actuary')
+
+    jobs = list_all(client, q='pricing')
+    assert {job['id'] for job in jobs} == {title, company, description}
+    assert list_all(client, q='pricing reserving') == []
+
+def test_last_term_matches_as_prefix(client, add_job):
+    actuary = add_job(title='Pricing Actuary')
+    analyst = add_job(title='Pricing Analyst')
+
+    assert [job['id'] for job in list_all(client, q='act')] == [actuary]
+    assert {job['id'] for job in list_all(client, q='pricing a')} == {actuary, analyst}
+    # Only the last term is a prefix
+    assert list_all(client, q='pric actuary') == []
+    # Terms that aren't plain words are matched as typed, without errors
+    assert list_all(client, q='actuary c++') == []
+
+def test_relevance_pages_across_equal_scores(client, add_job):
+    # Identical text scores identically, so pages split inside a run of equal
+    # ranks and rely on the cursor's (score, id) tie-break
+    tied = [add_job(title='Pricing Actuary', description='Pricing for auto.') for _ in range(7)]
+    other = add_job(title='Analyst', description='Pricing support for the reserving team.')
+
+    for limit in (1, 2, 3):
+        ids = [job['id'] for job in list_all(client, q='pricing', limit=limit)]
+        assert ids == sorted(tied, reverse=True) + [other]
+
+def test_relevance_requires_query(client, add_job):
+    add_job()
+    assert client.get('/jobs', query_string={'sort': 'relevance'}).status_code == 400
@@ -0,0 +1,38 @@
+# backend/tests/test_tags.py
+from conftest import list_all
+from models.tag import parse_tags
+
+def tagged(client, **params):
+    return sorted(job['title'] for job in list_all(client, **params))
+
+def add_tagged_jobs(add_job):
+    add_job(title='SQL only', tags=['SQL'])
+    add_job(title='NoSQL only', tags=['NoSQL'])
+    add_job(title='SQL and Python', tags=['Python', 'SQL'])
+    add_job(title='Untagged')
+
+def test_parse_tags():
+    assert parse_tags('Life, Health,,life , Pricing') == ['Life', 'Health', 'Pricing']
+    assert parse_tags(['SQL', ' sql', 'Python']) == ['SQL', 'Python']
+    assert parse_tags(None) == []
+
+def test_tags_keep_their_order(client):
+    job_id = client.post('/jobs', json={'title': 'Actuary', 'company': 'Acme', 'location': 'Remote',
+                                        'tags': 'Python,SQL,Life'}).json['id']
+    assert client.get(f'/jobs/{job_id}').json['tags'] == ['Python', 'SQL', 'Life']
+    client.put(f'/jobs/{job_id}', json={'tags': ['Life', 'Python']})
+    assert client.get(f'/jobs/{job_id}').json['tags'] == ['Life', 'Python']
+
+def test_tags_match_whole_names(client, add_job):
+    add_tagged_jobs(add_job)
+    # "SQL" must not match "NoSQL"
+    assert tagged(client, tag='SQL') == ['SQL and Python', 'SQL only']
+    assert tagged(client, tag='sql') == ['SQL and Python', 'SQL only']
+    assert tagged(client, tag='QL') == []
+
+def test_tags_and_or(client, add_job):
+    add_tagged_jobs(add_job)
+    assert tagged(client, tag='SQL,Python') == ['SQL and Python']
+    assert tagged(client, tag=['SQL', 'Python']) == ['SQL and Python']
+    assert tagged(client, tag='NoSQL,Python', tag_mode='any') == ['NoSQL only', 'SQL and Python']
+    assert client.get('/jobs', query_string={'tag': 'SQL', 'tag_mode': 'some'}).status_code == 400
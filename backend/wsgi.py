@@ -0,0 +1,10 @@
+# backend/wsgi.py
+"""
+Production entry point for a pre-forking WSGI server:
+
+    cd backend
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+from app import create_app
+
+app = create_app()
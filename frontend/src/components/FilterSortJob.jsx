@@ -1,6 +1,12 @@
 import React from 'react';
 
-export default function FilterSortJob({ filters, onChange, locations, jobTypes, tags, onReset }) {
+export default function FilterSortJob({ filters, onChange, locations, jobTypes, tags, counts = {}, onReset }) {
+  // Append the number of matching jobs when the API reported one
+  const withCount = (facet, value) => {
+    const count = counts[facet]?.[value];
+    return count === undefined ? value : `${value} (${count})`;
+  };
+
   return (
     <div className="bg-white p-4 md:p-6 rounded-lg shadow space-y-4 md:space-y-6">
       <div>
@@ -25,7 +31,7 @@ export default function FilterSortJob({ filters, onChange, locations, jobTypes,
         >
           <option value="">All Locations</option>
           {locations.map(loc => (
-            <option key={loc} value={loc}>{loc}</option>
+            <option key={loc} value={loc}>{withCount('location', loc)}</option>
           ))}
         </select>
       </div>
@@ -40,7 +46,7 @@ export default function FilterSortJob({ filters, onChange, locations, jobTypes,
         >
           <option value="">All Types</option>
           {jobTypes.map(type => (
-            <option key={type} value={type}>{type}</option>
+            <option key={type} value={type}>{withCount('job_type', type)}</option>
           ))}
         </select>
       </div>
@@ -59,7 +65,7 @@ export default function FilterSortJob({ filters, onChange, locations, jobTypes,
                   onChange={onChange}
                   className="w-4 h-4 text-green-600 focus:ring-green-500 border-gray-300 rounded"
                 />
-                <span className="text-sm text-gray-700">{tag}</span>
+                <span className="text-sm text-gray-700">{withCount('tag', tag)}</span>
               </label>
             ))}
           </div>
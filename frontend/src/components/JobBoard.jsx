@@ -1,5 +1,5 @@
 import React, { useEffect, useState, useMemo } from 'react';
-import { getJobs } from '../api';
+import { getJobs, getJobFacets } from '../api';
 import FilterSortJob from './FilterSortJob';
 import DeleteJob from './DeleteJob';
 import { Link, useNavigate } from 'react-router-dom';
@@ -14,7 +14,9 @@ const locationsList = [
 
 export default function JobBoard() {
   const [jobs, setJobs] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [filters, setFilters] = useState({
     keyword: '',
     location: '',
@@ -22,43 +24,68 @@ export default function JobBoard() {
     tags: [],
     sort: 'posting_date_desc',
   });
+  // { job_type: { 'Full-Time': 12, ... }, location: {...}, tag: {...} } for the current filters
+  const [facetCounts, setFacetCounts] = useState({});
   const [refresh, setRefresh] = useState(false);
   const [isMobileFilterOpen, setIsMobileFilterOpen] = useState(false);
   const navigate = useNavigate();
 
+  const filterParams = () => ({
+    q: filters.keyword || undefined, // full-text; the last word also matches as a prefix while typing
+    job_type: filters.job_type,
+    location: filters.location,
+    tag: filters.tags.join(',') || undefined, // jobs must have every selected tag
+  });
+
+  const fetchPage = (cursor) => getJobs({
+    ...filterParams(),
+    sort: filters.sort,
+    cursor: cursor || undefined,
+  });
+
+  const fetchFacets = async () => {
+    try {
+      const res = await getJobFacets({ ...filterParams(), limit: 200 });
+      const counts = {};
+      Object.entries(res.data).forEach(([facet, values]) => {
+        counts[facet] = Object.fromEntries(values.map(({ value, count }) => [value, count]));
+      });
+      setFacetCounts(counts);
+    } catch (e) {
+      setFacetCounts({});
+    }
+  };
+
   const fetchJobs = async () => {
     setLoading(true);
     try {
-      const params = {
-        job_type: filters.job_type,
-        location: filters.location,
-        tag: filters.tags[0], // backend only supports one tag
-        sort: filters.sort,
-      };
-      const res = await getJobs(params);
-      let data = res.data;
-      // Keyword filter (title/company) and multi-tag filter client-side
-      if (filters.keyword) {
-        data = data.filter(job =>
-          job.title.toLowerCase().includes(filters.keyword.toLowerCase()) ||
-          job.company.toLowerCase().includes(filters.keyword.toLowerCase())
-        );
-      }
-      if (filters.tags.length > 1) {
-        data = data.filter(job =>
-          filters.tags.every(tag => job.tags.includes(tag))
-        );
-      }
-      setJobs(data);
+      const res = await fetchPage(null);
+      setJobs(res.data.jobs);
+      setNextCursor(res.data.next_cursor);
     } catch (e) {
       setJobs([]);
+      setNextCursor(null);
     } finally {
       setLoading(false);
     }
   };
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const res = await fetchPage(nextCursor);
+      setJobs(prev => [...prev, ...res.data.jobs]);
+      setNextCursor(res.data.next_cursor);
+    } catch (e) {
+      setNextCursor(null);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     fetchJobs();
+    fetchFacets();
     // eslint-disable-next-line
   }, [filters, refresh]);
 
@@ -113,6 +140,7 @@ export default function JobBoard() {
             locations={locationsList}
             jobTypes={jobTypes}
             tags={tagsList}
+            counts={facetCounts}
             onReset={handleReset}
           />
         </div>
@@ -126,6 +154,7 @@ export default function JobBoard() {
               locations={locationsList}
               jobTypes={jobTypes}
               tags={tagsList}
+              counts={facetCounts}
               onReset={handleReset}
             />
           </aside>
@@ -186,6 +215,18 @@ export default function JobBoard() {
                 ))}
               </div>
             )}
+
+            {!loading && nextCursor && (
+              <div className="flex justify-center">
+                <button
+                  className="bg-white hover:bg-gray-50 text-gray-700 px-4 py-2 rounded font-semibold shadow disabled:opacity-50"
+                  onClick={loadMore}
+                  disabled={loadingMore}
+                >
+                  {loadingMore ? 'Loading...' : 'Load more'}
+                </button>
+              </div>
+            )}
           </section>
         </div>
       </main>